@@ -0,0 +1,43 @@
+"""
+Micro-benchmark comparing per-rule checks with the `CompiledRuleset`.
+
+    python benchmarks/bench_rulesets.py --rules 50 --fields 60
+"""
+
+import argparse
+import timeit
+
+from frontmatter_check.rule_validations import RulesetValidator, ValidationRule
+
+
+def per_rule_check(rules, metadata):
+    for rule in rules:
+        rule.check(metadata)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=50)
+    parser.add_argument("--fields", type=int, default=60)
+    parser.add_argument("--number", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rules = [
+        ValidationRule(field_name=f"Field_{i}", type="str") for i in range(args.rules)
+    ]
+    metadata = {f"field_{i}": "value" for i in range(args.fields)}
+    validator = RulesetValidator(rules)
+
+    per_rule = timeit.timeit(
+        lambda: per_rule_check(rules, metadata), number=args.number
+    )
+    compiled = timeit.timeit(lambda: validator.validates(metadata), number=args.number)
+
+    print(f"{args.rules} rules, {args.fields} fields, {args.number} files")
+    print(f"per-rule checks: {per_rule / args.number * 1e6:10.1f} us/file")
+    print(f"compiled:        {compiled / args.number * 1e6:10.1f} us/file")
+    print(f"speedup:         {per_rule / compiled:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,495 @@
+"""
+Benchmark suite that checks synthetic content trees of different shapes.
+
+    python benchmarks/suite.py run --output results.json
+    python benchmarks/suite.py run --scenario "1k-*" --output results.json
+    python benchmarks/suite.py run --parser flat --output flat.json
+    python benchmarks/suite.py run --reader bytes --output bytes.json
+    python benchmarks/suite.py compare baseline.json results.json --threshold 0.1
+
+Each scenario generates a tree of markdown files and a config for it. `run`
+measures the end-to-end `frontmatter-check` throughput and peak memory in a
+child process and the per-file latency of each stage (walk, match, read,
+validate) in this one, along with the read calls and peak allocation of
+reading a file, then writes the results as json. `compare` exits with 1
+when any result is worse than the baseline by more than the threshold.
+"""
+
+import argparse
+import dataclasses
+import fnmatch
+import json
+import os
+import pathlib
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import yaml
+
+from frontmatter_check.parsers import DEFAULT_PARSER, PARSERS
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+from frontmatter_check.reader import DEFAULT_READER, READERS
+from frontmatter_check.walker import iter_files
+
+RESULTS_VERSION = 1
+SECTIONS = 20
+FILE_PATTERN = "**/*.md"
+# Roughly one in ten files is missing a required field
+MISSING_RATE = 0.1
+
+# Extra fields in each frontmatter profile
+FRONTMATTER_FIELDS = {"small": 5, "large": 50, "huge": 500, "flat": 5}
+# Number of patterns and rules per pattern in each ruleset profile
+RULESET_SIZES = {"few": (2, 3), "many": (40, 20)}
+
+# Whether a bigger value of each metric is better
+METRICS = {
+    "throughput": True,
+    "peak_memory": False,
+    "walk": False,
+    "match": False,
+    "read": False,
+    "validate": False,
+    "read_calls": False,
+    "read_peak_bytes": False,
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class Scenario:
+    files: int
+    frontmatter: str
+    rulesets: str
+
+    @property
+    def name(self) -> str:
+        size = f"{self.files // 1000}k" if self.files >= 1000 else str(self.files)
+        return f"{size}-{self.frontmatter}-{self.rulesets}"
+
+
+SCENARIOS = [
+    # Scaling with the number of files
+    Scenario(1_000, "small", "few"),
+    Scenario(10_000, "small", "few"),
+    Scenario(100_000, "small", "few"),
+    # Scaling with the size of the frontmatter
+    Scenario(10_000, "large", "few"),
+    Scenario(1_000, "huge", "few"),
+    Scenario(10_000, "flat", "few"),
+    # Scaling with the number of patterns and rules
+    Scenario(10_000, "small", "many"),
+    Scenario(1_000, "huge", "many"),
+]
+
+
+def _rule_fields(rules_per_pattern: int) -> list[str]:
+    return ["title", "date", "author"] + [
+        f"field_{i}" for i in range(rules_per_pattern - 3)
+    ]
+
+
+def build_config(
+    scenario: Scenario, parser: str = DEFAULT_PARSER, reader: str = DEFAULT_READER
+) -> dict:
+    pattern_count, rules_per_pattern = RULESET_SIZES[scenario.rulesets]
+    patterns = [
+        {
+            "name": "Everything",
+            "pattern": "content/**/*.md",
+            "rules": [{"field_name": "title"}, {"field_name": "date"}],
+        }
+    ]
+
+    for i in range(pattern_count - 1):
+        section = i % SECTIONS
+        patterns.append(
+            {
+                "name": f"Section {i}",
+                "pattern": f"content/section_{section}/**/*.md",
+                "rules": [
+                    {"field_name": field, "type": "str"}
+                    for field in _rule_fields(rules_per_pattern)
+                    if field != "date"
+                ],
+            }
+        )
+
+    return {"settings": {"parser": parser, "reader": reader}, "patterns": patterns}
+
+
+def _frontmatter(rng: random.Random, index: int, extra_fields: int, flat: bool) -> str:
+    lines = [
+        f"title: Post {index}",
+        f"date: 2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "author: Benchmark",
+    ]
+
+    # Only `key: value` lines, which the flat parser reads without YAML
+    if not flat:
+        lines.append("tags: [one, two, three]")
+
+    lines.extend(
+        f"field_{i}: {rng.choice(['short', 'a somewhat longer value'])}"
+        for i in range(extra_fields)
+    )
+
+    if rng.random() < MISSING_RATE:
+        lines.pop(0)
+
+    return "---\n" + "\n".join(lines) + "\n---\n"
+
+
+def write_config(
+    scenario: Scenario,
+    root: pathlib.Path,
+    parser: str = DEFAULT_PARSER,
+    reader: str = DEFAULT_READER,
+):
+    (root / "config.yaml").write_text(
+        yaml.safe_dump(build_config(scenario, parser, reader))
+    )
+
+
+def build_corpus(scenario: Scenario, root: pathlib.Path):
+    """Writes the files and config of `scenario` to `root`"""
+    rng = random.Random(scenario.name)
+    extra_fields = FRONTMATTER_FIELDS[scenario.frontmatter]
+    body = "Lorem ipsum dolor sit amet.\n" * 20
+
+    for i in range(scenario.files):
+        directory = root / "content" / f"section_{i % SECTIONS}" / str(i % 7)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"post_{i}.md").write_text(
+            _frontmatter(rng, i, extra_fields, scenario.frontmatter == "flat") + body
+        )
+
+    write_config(scenario, root)
+
+
+def _corpus(scenario: Scenario, corpus_dir: pathlib.Path) -> pathlib.Path:
+    """The corpus of `scenario`, generated unless a complete one exists"""
+    root = corpus_dir / scenario.name
+    marker = root / ".complete"
+
+    if not marker.exists():
+        shutil.rmtree(root, ignore_errors=True)
+        root.mkdir(parents=True)
+        build_corpus(scenario, root)
+        marker.touch()
+
+    return root
+
+
+def _peak_rss(rusage) -> int:
+    # ru_maxrss is in kilobytes everywhere but macOS
+    if sys.platform == "darwin":
+        return rusage.ru_maxrss
+    return rusage.ru_maxrss * 1024
+
+
+def measure_end_to_end(root: pathlib.Path, jobs: int) -> tuple[float, int]:
+    """Seconds and peak memory in bytes of `frontmatter-check` over `root`"""
+    args = [
+        sys.executable,
+        "-c",
+        "from frontmatter_check.cli import app; app()",
+        "content",
+        "--config-file",
+        "config.yaml",
+        "--file-pattern",
+        FILE_PATTERN,
+        "--no-cache",
+        "--jobs",
+        str(jobs),
+    ]
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        args, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    _, status, rusage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    # Popen would otherwise try to wait for the process again
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # 1 means some files failed, which the corpus is built to have
+    if process.returncode not in (0, 1):
+        raise RuntimeError(f"frontmatter-check exited with {process.returncode}")
+
+    return elapsed, _peak_rss(rusage)
+
+
+def _read_calls() -> int | None:
+    """The read system calls this process has made, where Linux reports them"""
+    try:
+        with open("/proc/self/io") as io:
+            for line in io:
+                if line.startswith("syscr:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    return None
+
+
+def _mean_peak_allocation(read, files: list[pathlib.Path]) -> float:
+    """The mean of the most memory allocated at once while reading each file"""
+    peaks = []
+    tracemalloc.start()
+
+    try:
+        for path in files:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            read(path)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return sum(peaks) / len(peaks)
+
+
+def measure_stages(root: pathlib.Path, sample: int) -> dict[str, float]:
+    """Mean microseconds per file of each stage of a check"""
+    cwd = os.getcwd()
+    os.chdir(root)
+
+    try:
+        pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(
+            pathlib.Path("config.yaml")
+        )
+
+        start = time.perf_counter()
+        files = list(
+            iter_files(
+                [pathlib.Path("content")],
+                [FILE_PATTERN],
+                could_match_below=pattern_check.pattern_index.could_match_below,
+            )
+        )
+        walk = (time.perf_counter() - start) / len(files)
+        files = files[:sample]
+
+        start = time.perf_counter()
+        matched = [pattern_check.pattern_index.match(path) for path in files]
+        match = time.perf_counter() - start
+
+        read_calls = _read_calls()
+        start = time.perf_counter()
+        metadata = [pattern_check._read(path) for path in files]
+        read = time.perf_counter() - start
+
+        if read_calls is not None:
+            read_calls = _read_calls() - read_calls
+
+        read_peak_bytes = _mean_peak_allocation(pattern_check._read, files[:1000])
+
+        start = time.perf_counter()
+        for path, pattern_sets, md in zip(files, matched, metadata):
+            pattern_check._evaluate_metadata(path, pattern_sets, md)
+        validate = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+
+    stages = {
+        "walk": walk * 1e6,
+        "match": match / len(files) * 1e6,
+        "read": read / len(files) * 1e6,
+        "validate": validate / len(files) * 1e6,
+        "read_peak_bytes": read_peak_bytes,
+    }
+
+    if read_calls is not None:
+        stages["read_calls"] = read_calls / len(files)
+
+    return stages
+
+
+def run_scenario(
+    scenario: Scenario,
+    corpus_dir: pathlib.Path,
+    repeat: int,
+    jobs: int,
+    sample: int,
+    parser: str = DEFAULT_PARSER,
+    reader: str = DEFAULT_READER,
+) -> dict:
+    root = _corpus(scenario, corpus_dir)
+    write_config(scenario, root, parser, reader)
+    end_to_end = [measure_end_to_end(root, jobs) for _ in range(repeat)]
+    stages = [measure_stages(root, sample) for _ in range(repeat)]
+    # The fastest run is the one with the least noise from the rest of the machine
+    seconds = min(elapsed for elapsed, _ in end_to_end)
+
+    return {
+        "files": scenario.files,
+        "frontmatter": scenario.frontmatter,
+        "rulesets": scenario.rulesets,
+        "seconds": seconds,
+        "throughput": scenario.files / seconds,
+        "peak_memory": max(peak for _, peak in end_to_end),
+        **{stage: min(run[stage] for run in stages) for stage in stages[0]},
+    }
+
+
+def run(args) -> int:
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if any(fnmatch.fnmatch(scenario.name, pattern) for pattern in args.scenario)
+    ]
+
+    if not scenarios:
+        print("No scenario matches", " ".join(args.scenario), file=sys.stderr)
+        return 2
+
+    results = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "jobs": args.jobs,
+        "parser": args.parser,
+        "reader": args.reader,
+        "scenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus_dir = args.corpus_dir or pathlib.Path(temp_dir)
+
+        for scenario in scenarios:
+            result = run_scenario(
+                scenario,
+                corpus_dir,
+                args.repeat,
+                args.jobs,
+                args.sample,
+                args.parser,
+                args.reader,
+            )
+            results["scenarios"][scenario.name] = result
+            print(
+                f"{scenario.name:<18} {result['throughput']:10.0f} files/s"
+                f" {result['peak_memory'] / 2**20:8.1f} MiB"
+                f" walk {result['walk']:7.1f} us  match {result['match']:7.1f} us"
+                f"  read {result['read']:7.1f} us  validate {result['validate']:7.1f} us"
+                f"  read peak {result['read_peak_bytes'] / 1024:6.1f} KiB"
+            )
+
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+def find_regressions(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Describes each metric that is worse than `baseline` by more than `threshold`"""
+    regressions = []
+
+    for name, result in current["scenarios"].items():
+        if (base := baseline["scenarios"].get(name)) is None:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            if not base.get(metric) or metric not in result:
+                continue
+
+            change = (result[metric] - base[metric]) / base[metric]
+
+            if higher_is_better:
+                change = -change
+
+            if change > threshold:
+                regressions.append(
+                    f"{name} {metric}: {base[metric]:.4g} -> {result[metric]:.4g}"
+                    f" ({change:+.1%} worse)"
+                )
+
+    return regressions
+
+
+def compare(args) -> int:
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+
+    for results in (baseline, current):
+        if results.get("version") != RESULTS_VERSION:
+            print("Unsupported results version", file=sys.stderr)
+            return 2
+
+    regressions = find_regressions(baseline, current, args.threshold)
+
+    for regression in regressions:
+        print(regression)
+
+    if regressions:
+        return 1
+
+    print(f"No regressions above {args.threshold:.0%}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument(
+        "--scenario",
+        action="append",
+        help="glob of scenario names to run, like 1k-*; defaults to all of them",
+    )
+    run_parser.add_argument(
+        "--output", type=pathlib.Path, default=pathlib.Path("bench_results.json")
+    )
+    run_parser.add_argument(
+        "--corpus-dir",
+        type=pathlib.Path,
+        help="keep the generated trees here and reuse them across runs",
+    )
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--jobs", type=int, default=1)
+    run_parser.add_argument(
+        "--sample", type=int, default=5_000, help="files to time each stage with"
+    )
+    run_parser.add_argument(
+        "--parser",
+        choices=PARSERS,
+        default=DEFAULT_PARSER,
+        help="the frontmatter parser to check the files with",
+    )
+    run_parser.add_argument(
+        "--reader",
+        choices=READERS,
+        default=DEFAULT_READER,
+        help="how the frontmatter is read from the files",
+    )
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser(
+        "compare", help="fail when results regressed from a baseline"
+    )
+    compare_parser.add_argument("baseline", type=pathlib.Path)
+    compare_parser.add_argument("current", type=pathlib.Path)
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="largest allowed slowdown as a fraction, 0.1 is 10%%",
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run" and not args.scenario:
+        args.scenario = ["*"]
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,34 @@
-from .rule_validations import ValidationRule, RulesetValidator
-from .pattern_check import PatternRuleset, FrontmatterPatternMatchCheck
+import importlib
 
 __all__ = [
     "ValidationRule",
     "RulesetValidator",
     "PatternRuleset",
     "FrontmatterPatternMatchCheck",
+    "ValidationResult",
+    "ColumnarReport",
 ]
+
+# The classes are imported when they are first used so the CLI (and anything
+# else importing a single submodule) doesn't pay for modules it never uses
+_SUBMODULES = {
+    "ValidationRule": ".rule_validations",
+    "RulesetValidator": ".rule_validations",
+    "PatternRuleset": ".pattern_check",
+    "FrontmatterPatternMatchCheck": ".pattern_check",
+    "ValidationResult": ".pattern_check",
+    "ColumnarReport": ".bulk",
+}
+
+
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_SUBMODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(globals().keys() | set(__all__))
@@ -0,0 +1,174 @@
+"""
+Checks many documents that are already in memory, without touching the disk.
+
+`FrontmatterPatternMatchCheck.evaluate_documents` takes `(path, metadata)` or
+`(path, text)` pairs. The path is only used to find the patterns that apply.
+Each ruleset is checked one rule at a time over all the documents it applies
+to, and the failures are kept as bitsets in a `ColumnarReport`, where bit `i`
+stands for the `i`th document.
+"""
+
+import dataclasses
+import logging
+import pathlib
+import typing
+
+from .pattern_check import ValidationResult
+from .reader import parse_metadata
+from .rule_validations import FAILURE_KINDS, RuleFailure, _casefold_keys
+
+if typing.TYPE_CHECKING:
+    from .pattern_check import FrontmatterPatternMatchCheck
+
+Document = tuple[pathlib.Path | str, dict | str]
+
+
+def _bitset(indexes: typing.Iterable[int], size: int) -> int:
+    """An int with the bits at `indexes` set"""
+    bits = bytearray((size + 7) // 8)
+
+    for i in indexes:
+        bits[i >> 3] |= 1 << (i & 7)
+
+    return int.from_bytes(bits, "little")
+
+
+def bit_indexes(bits: int) -> typing.Iterator[int]:
+    """The indexes of the set bits of `bits`, lowest first"""
+    # Scanning the binary text is linear, unlike clearing the lowest bit each time
+    text = bin(bits)[:1:-1]
+    i = text.find("1")
+
+    while i != -1:
+        yield i
+        i = text.find("1", i + 1)
+
+
+@dataclasses.dataclass
+class ColumnarReport:
+    """The failures of many documents, as a bitset per rule and kind of failure"""
+
+    paths: list[pathlib.Path]
+    # The possible (missing, null, invalid_type, invalid_value) failures of
+    # each rule, the same as `FrontmatterPatternMatchCheck.rule_failures`
+    rules: list[tuple[RuleFailure, ...]]
+    # The bitsets of each failure of each rule in `rules`
+    failures: list[tuple[int, ...]]
+    no_frontmatter: int = 0
+    # Documents that no pattern matches
+    skipped: int = 0
+
+    @property
+    def failed(self) -> int:
+        """The documents with an ERROR failure"""
+        failed = 0
+
+        for rule_failures, bitsets in zip(self.rules, self.failures):
+            for failure, bits in zip(rule_failures, bitsets):
+                if failure.level == logging.ERROR:
+                    failed |= bits
+
+        return failed
+
+    def failed_paths(self) -> list[pathlib.Path]:
+        return [self.paths[i] for i in bit_indexes(self.failed)]
+
+    def results(self) -> list[ValidationResult]:
+        """A `ValidationResult` for each document, the same as checking its file"""
+        failures = [[] for _ in self.paths]
+
+        # A document fails a rule at most one way, so going rule by rule keeps
+        # each document's failures in the order `evaluate` reports them
+        for rule_failures, bitsets in zip(self.rules, self.failures):
+            for failure, bits in zip(rule_failures, bitsets):
+                for i in bit_indexes(bits):
+                    failures[i].append(failure)
+
+        return [
+            ValidationResult(
+                path=path,
+                failures=failures[i],
+                has_frontmatter=not (self.no_frontmatter >> i) & 1,
+                skipped=bool((self.skipped >> i) & 1),
+            )
+            for i, path in enumerate(self.paths)
+        ]
+
+
+def evaluate_documents(
+    pattern_check: "FrontmatterPatternMatchCheck",
+    documents: typing.Iterable[Document],
+) -> ColumnarReport:
+    paths = []
+    metadata = []
+    skipped = []
+    no_frontmatter = []
+    ruleset_index = {
+        id(pattern): n for n, pattern in enumerate(pattern_check.pattern_sets)
+    }
+    # The documents each ruleset applies to
+    members = [[] for _ in pattern_check.pattern_sets]
+
+    for i, (path, document) in enumerate(documents):
+        if not isinstance(path, pathlib.PurePath):
+            path = pathlib.Path(path)
+
+        paths.append(path)
+
+        if not (pattern_sets := pattern_check.pattern_index.match(path)):
+            # Like files no pattern matches, the text isn't parsed
+            skipped.append(i)
+            metadata.append(None)
+            continue
+
+        if isinstance(document, str):
+            document = parse_metadata(
+                document, pattern_check.max_header_size, pattern_check.handlers
+            )
+
+        metadata.append(document)
+
+        if not document:
+            no_frontmatter.append(i)
+        else:
+            for pattern in pattern_sets:
+                members[ruleset_index[id(pattern)]].append(i)
+
+    size = len(paths)
+    rules = []
+    failures = []
+    # The keys of each document are casefolded once, for every ruleset
+    casefolded = {}
+
+    for pattern, indexes in zip(pattern_check.pattern_sets, members):
+        compiled = pattern.rules.compile(pattern.name)
+
+        if not indexes:
+            columns = [([],) * len(FAILURE_KINDS)] * len(compiled.rules)
+        elif compiled._casefold:
+            for i in indexes:
+                if i not in casefolded:
+                    casefolded[i] = _casefold_keys(metadata[i])
+
+            columns = compiled.evaluate_columns(
+                [metadata[i] for i in indexes], [casefolded[i] for i in indexes]
+            )
+        else:
+            columns = compiled.evaluate_columns([metadata[i] for i in indexes])
+
+        rules.extend(compiled.failures)
+
+        for column in columns:
+            failures.append(
+                tuple(
+                    _bitset((indexes[j] for j in failing), size) for failing in column
+                )
+            )
+
+    return ColumnarReport(
+        paths=paths,
+        rules=rules,
+        failures=failures,
+        no_frontmatter=_bitset(no_frontmatter, size),
+        skipped=_bitset(skipped, size),
+    )
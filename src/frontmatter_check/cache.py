@@ -0,0 +1,323 @@
+"""
+An on-disk cache of file results so unchanged files are skipped across runs.
+
+Entries are keyed by the path of the file and a fingerprint of the config file
+and the installed version of frontmatter-check. A cached result is used when
+the file's size and mtime are unchanged, or when its content hash still matches.
+
+Each entry is its own json file that is written atomically, so several runs can
+share the cache directory at once. The cache is kept in a directory of the user
+rather than in the checked tree, where anyone who can commit a file could plant
+an entry that makes a failing file pass.
+
+`load_config` keeps the loaded config in the same directory: the patterns and
+rules with the pattern index built, pickled once per config file and rebuilt
+whenever the config's content, the tool or Python changes. Unpickling can run
+code, so each entry is signed with an HMAC under a random key kept in the
+user's cache directory, and an entry is only unpickled once its signature
+checks out. An entry that anyone else wrote is rebuilt from the config.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import pathlib
+import pickle
+import sys
+import tempfile
+import typing
+
+from .pattern_check import FrontmatterPatternMatchCheck, ValidationResult
+from .rule_validations import RuleFailure
+
+
+def user_cache_dir() -> pathlib.Path:
+    """The cache directory of the current user, outside of any checked tree"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or pathlib.Path.home() / "AppData/Local"
+    elif sys.platform == "darwin":
+        base = pathlib.Path.home() / "Library/Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+
+    return pathlib.Path(base) / "frontmatter-check"
+
+
+CACHE_DIR = user_cache_dir()
+DEFAULT_MAX_SIZE = 32 * 1024 * 1024
+_CACHE_VERSION = 4
+# Bumped when the pickled config of `load_config` changes shape
+_CONFIG_VERSION = 2
+_KEY_SIZE = 32
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+def _tool_version() -> str:
+    import importlib.metadata
+
+    try:
+        return importlib.metadata.version("frontmatter-check")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _hash_file(file_path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+
+    with open(file_path, mode="rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def config_fingerprint(config_file: pathlib.Path) -> str:
+    """A hash of the config file's content and the version of the tool"""
+    digest = hashlib.sha256(f"{_CACHE_VERSION}:{_tool_version()}:".encode())
+    digest.update(pathlib.Path(config_file).read_bytes())
+    return digest.hexdigest()
+
+
+def _write_atomically(directory: pathlib.Path, entry_path: pathlib.Path, write):
+    """Calls `write` with a temporary file that then replaces `entry_path`"""
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        gitignore = directory / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("# Created by frontmatter-check\n*\n")
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, mode="wb") as temp_file:
+            write(temp_file)
+        os.replace(temp_path, entry_path)
+    except OSError as e:
+        logging.debug("Could not write cache entry %s: %s" % (entry_path, e))
+
+
+def _signing_key() -> bytes | None:
+    """
+    The current user's key for signing cached configs, made on first use.
+    None when it can't be read or written, which leaves the config uncached.
+    """
+    path = user_cache_dir() / "config.key"
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        try:
+            key = path.read_bytes()
+        except OSError:
+            return None
+        # Another run may still be writing it
+        return key if len(key) == _KEY_SIZE else None
+    except OSError:
+        return None
+
+    key = os.urandom(_KEY_SIZE)
+
+    with os.fdopen(fd, mode="wb") as key_file:
+        key_file.write(key)
+
+    return key
+
+
+def _signature(signing_key: bytes, signed: bytes) -> bytes:
+    return hmac.new(signing_key, signed, hashlib.sha256).digest()
+
+
+def load_config(
+    config_file: pathlib.Path, directory: pathlib.Path = CACHE_DIR
+) -> FrontmatterPatternMatchCheck:
+    """
+    `FrontmatterPatternMatchCheck.from_yaml_config`, reusing the compiled
+    config of an earlier run while the config file is unchanged.
+    """
+    config_file = pathlib.Path(config_file)
+    directory = pathlib.Path(directory)
+    content = config_file.read_bytes()
+
+    if (signing_key := _signing_key()) is None:
+        return FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+
+    key = hashlib.sha256(
+        f"{_CONFIG_VERSION}:{_tool_version()}:{sys.version}:".encode() + content
+    ).hexdigest()
+    # One entry per config file, replaced when the file changes
+    name = hashlib.sha256(str(config_file.resolve()).encode()).hexdigest()
+    entry_path = directory / f"config-{name}.pickle"
+
+    try:
+        # The signature, then the key and the pickled config it signs
+        entry = entry_path.read_bytes()
+        signature, signed = entry[:_SIGNATURE_SIZE], entry[_SIGNATURE_SIZE:]
+
+        # Nothing is unpickled unless this user's key signed it
+        if hmac.compare_digest(
+            signature, _signature(signing_key, signed)
+        ) and signed.startswith(key.encode()):
+            pattern_check = pickle.loads(signed[len(key) :])
+
+            if isinstance(pattern_check, FrontmatterPatternMatchCheck):
+                if pattern_check.level:
+                    pattern_check.apply_level()
+                return pattern_check
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Anything that can't be unpickled is rebuilt from the config
+        logging.debug("Could not load %s: %r" % (entry_path, e))
+
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+    # Rules are left to compile when a file first needs them, which takes less
+    # time than unpickling them and skips the rulesets no file matches
+    pattern_check.pattern_index.prepare()
+
+    # A config that changed while it was loaded is left for the next run
+    if config_file.read_bytes() == content:
+        signed = key.encode() + pickle.dumps(
+            pattern_check, protocol=pickle.HIGHEST_PROTOCOL
+        )
+        _write_atomically(
+            directory,
+            entry_path,
+            lambda entry: entry.write(_signature(signing_key, signed) + signed),
+        )
+
+    return pattern_check
+
+
+class ResultCache:
+    """Stores a `ValidationResult` for each checked file"""
+
+    def __init__(
+        self,
+        fingerprint: str,
+        directory: pathlib.Path = CACHE_DIR,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        self.fingerprint = fingerprint
+        self.directory = pathlib.Path(directory)
+        self.max_size = max_size
+
+    @classmethod
+    def for_config(cls, config_file: pathlib.Path, **kwargs):
+        return cls(fingerprint=config_fingerprint(config_file), **kwargs)
+
+    def _entry_path(
+        self, target_file: pathlib.Path, rulesets: typing.Sequence[int]
+    ) -> pathlib.Path:
+        # Keyed by the absolute path, since every project shares the directory,
+        # and by the rulesets the path matched, which depend on how it was given
+        key = hashlib.sha256(
+            f"{self.fingerprint}:{list(rulesets)}:{os.path.abspath(target_file)}".encode()
+        )
+        return self.directory / f"{key.hexdigest()}.json"
+
+    def get(
+        self, target_file: pathlib.Path, rulesets: typing.Sequence[int] = ()
+    ) -> ValidationResult | None:
+        """
+        Returns the cached result for `target_file` if the file is unchanged.
+        `rulesets` are the positions of the rulesets matching the path.
+        """
+        entry_path = self._entry_path(target_file, rulesets)
+
+        try:
+            entry = json.loads(entry_path.read_text())
+            stat = os.stat(target_file)
+        except (OSError, ValueError):
+            return None
+
+        if (stat.st_mtime_ns, stat.st_size) != (entry["mtime_ns"], entry["size"]):
+            try:
+                if _hash_file(target_file) != entry["sha256"]:
+                    return None
+            except OSError:
+                return None
+
+            # Same content with a new mtime. Save it so the next run can skip hashing
+            entry["mtime_ns"], entry["size"] = stat.st_mtime_ns, stat.st_size
+            self._write(entry_path, entry)
+        else:
+            # Mark the entry as recently used for eviction
+            try:
+                os.utime(entry_path)
+            except OSError:
+                pass
+
+        return ValidationResult(
+            path=target_file,
+            failures=[RuleFailure(*failure) for failure in entry["failures"]],
+            has_frontmatter=entry["has_frontmatter"],
+            error=entry["error"],
+        )
+
+    def put(
+        self,
+        result: ValidationResult,
+        stat: os.stat_result,
+        rulesets: typing.Sequence[int] = (),
+    ):
+        """
+        Saves `result`. `stat` should be taken before the file was checked so
+        results for files that changed while being checked are not stored.
+        """
+        try:
+            sha256 = _hash_file(result.path)
+            if os.stat(result.path).st_mtime_ns != stat.st_mtime_ns:
+                return
+        except OSError:
+            return
+
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256,
+            "failures": result.failures,
+            "has_frontmatter": result.has_frontmatter,
+            "error": result.error,
+        }
+        self._write(self._entry_path(result.path, rulesets), entry)
+
+    def _write(self, entry_path: pathlib.Path, entry: dict):
+        _write_atomically(
+            self.directory,
+            entry_path,
+            lambda temp_file: temp_file.write(json.dumps(entry).encode()),
+        )
+
+    def prune(self):
+        """Removes the least recently used entries once the cache is over `max_size`"""
+        entries = []
+
+        try:
+            with os.scandir(self.directory) as scanned:
+                for entry in scanned:
+                    if entry.name.endswith(".json"):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        total_size = sum(size for _, size, _ in entries)
+
+        if total_size <= self.max_size:
+            return
+
+        # Leave some room so a full cache isn't pruned on every run
+        target_size = self.max_size * 0.8
+
+        for _, size, path in sorted(entries):
+            if total_size <= target_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_size -= size
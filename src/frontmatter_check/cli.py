@@ -1,28 +1,43 @@
-import pathlib
 import logging
-import itertools
+import os
+import pathlib
+import sys
 
-from rich.console import Console
-from typer import Typer, Option, Exit, echo
+from typer import Argument, Typer, Option, Exit, echo
 import typing
-from typing_extensions import Annotated
+from typing import Annotated
 
+from . import timings
+from .cache import CACHE_DIR, ResultCache, load_config
+from .client import check_with_server, socket_path
+from .parallel import check_paths
 from .pattern_check import FrontmatterPatternMatchCheck
+from .reports import ResultReport, parse_report_option
+from .shards import parse_shard, select_shard
+from .walker import select_files
 
 app = Typer(no_args_is_help=True)
-err_console = Console(stderr=True)
 
 
-def _check_pattern(pattern_check: FrontmatterPatternMatchCheck, target_file):
-    echo(f"Checking File: {target_file}")
-    return pattern_check.validates(frontmatter_file=target_file)
+def _echo_result(result):
+    echo(f"Checking File: {result.path}")
+    result.log()
+
+    if result.error is not None:
+        logging.error(result.error)
 
 
 @app.command(
     name="check",
 )
 def check_files(
-    target_files: typing.List[pathlib.Path],
+    target_files: Annotated[
+        typing.Optional[typing.List[pathlib.Path]],
+        Argument(
+            help="files and directories to check",
+            show_default=False,
+        ),
+    ] = None,
     config_file: Annotated[
         pathlib.Path,
         Option(
@@ -31,41 +46,394 @@ def check_files(
         ),
     ] = pathlib.Path(".frontmatter_check.yaml"),
     file_pattern: typing.List[str] = ["*.md", "*.txt"],
+    jobs: Annotated[
+        int,
+        Option(
+            "--jobs",
+            "-j",
+            min=0,
+            help="number of worker processes. 0 picks a number based on the file count",
+        ),
+    ] = 0,
+    cache: Annotated[
+        bool,
+        Option(help="reuse results for files that haven't changed since the last run"),
+    ] = True,
+    cache_dir: Annotated[
+        pathlib.Path,
+        Option(
+            help="directory the results cache is stored in",
+            envvar="FRONTMATTER_CHECK_CACHE_DIR",
+        ),
+    ] = CACHE_DIR,
+    gitignore: Annotated[
+        bool,
+        Option(help="skip files and directories ignored by .gitignore files"),
+    ] = True,
+    changed_since: Annotated[
+        typing.Optional[str],
+        Option(
+            help="only check files changed since this git revision, like main or main...HEAD",
+            show_default=False,
+        ),
+    ] = None,
+    staged: Annotated[
+        bool,
+        Option("--staged", help="only check files staged in git"),
+    ] = False,
+    show_timings: Annotated[
+        bool,
+        Option("--timings", help="print how long each stage of the check took"),
+    ] = False,
+    timings_json: Annotated[
+        typing.Optional[pathlib.Path],
+        Option(help="write the timings of each stage to this json file"),
+    ] = None,
+    profile: Annotated[
+        typing.Optional[pathlib.Path],
+        Option(help="write a cProfile stats file for the run, checking in one process"),
+    ] = None,
+    server: Annotated[
+        bool,
+        Option(help="send the check to a running `frontmatter-check serve`"),
+    ] = True,
+    fail_fast: Annotated[
+        bool,
+        Option(
+            "--fail-fast",
+            help="stop at the first file that fails, skipping the rest of its rules",
+        ),
+    ] = False,
+    report_options: Annotated[
+        typing.Optional[typing.List[str]],
+        Option(
+            "--report",
+            help="write a json, jsonl, sarif or junit report as FORMAT=PATH, like sarif=results.sarif",
+            show_default=False,
+        ),
+    ] = None,
+    quiet: Annotated[
+        bool,
+        Option("--quiet", "-q", help="only print the files that have failures"),
+    ] = False,
+    shard_option: Annotated[
+        typing.Optional[str],
+        Option(
+            "--shard",
+            help="only check one slice of the files as INDEX/COUNT, like 2/4, to split a run between CI runners",
+            show_default=False,
+        ),
+    ] = None,
+    shard_by_size: Annotated[
+        bool,
+        Option(
+            "--shard-by-size",
+            help="balance the --shard slices by file size instead of by path",
+        ),
+    ] = False,
 ) -> None:
     """Check files for the layout attribute."""
 
     ret_code = 0
+    skipped = 0
 
-    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(
-        config_file=config_file
-    )
+    if not (target_files or changed_since or staged):
+        echo("Pass files to check, --changed-since or --staged", err=True)
+        raise Exit(code=2)
 
-    for target_file in target_files:
-        if target_file.is_dir():
-            files_to_check = itertools.chain.from_iterable(
-                target_file.glob(pattern) for pattern in file_pattern
-            )
-            for _target_file in files_to_check:
-                try:
-                    check_result = _check_pattern(
-                        pattern_check=pattern_check, target_file=_target_file
-                    )
-                    ret_code = int(not check_result)
-                except ValueError as e:
-                    logging.error(e)
-                    continue
+    try:
+        reports = [parse_report_option(option) for option in report_options or ()]
+        shard = parse_shard(shard_option) if shard_option else None
+    except ValueError as e:
+        echo(e, err=True)
+        raise Exit(code=2)
+
+    result_report = ResultReport() if reports else None
+    results = None
+    result_cache = None
+    report = None
+    profiler = None
+
+    # Timing and profiling are about this process, so they never use the server
+    if server and not (show_timings or timings_json or profile):
+        results = check_with_server(
+            socket_path(cache_dir),
+            {
+                "cwd": os.getcwd(),
+                "config_file": str(config_file.resolve()),
+                "targets": [str(target) for target in target_files or ()],
+                "file_pattern": file_pattern,
+                "gitignore": gitignore,
+                "changed_since": changed_since,
+                "staged": staged,
+                "cache": cache,
+                "fail_fast": fail_fast,
+                "shard": shard,
+                "shard_by_size": shard_by_size,
+            },
+        )
+
+    if results is None:
+        if cache:
+            pattern_check = load_config(config_file, directory=cache_dir)
         else:
-            try:
-                check_result = _check_pattern(
-                    pattern_check=pattern_check, target_file=target_file
-                )
-                ret_code = int(not check_result)
-            except ValueError as e:
-                logging.error(e)
+            pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(
+                config_file=config_file
+            )
+
+        pattern_check.stop_at_error = fail_fast
+
+        try:
+            files_to_check = select_files(
+                target_files or [],
+                file_pattern,
+                exclude=pattern_check.exclude,
+                could_match_below=pattern_check.pattern_index.could_match_below,
+                use_gitignore=gitignore,
+                changed_since=changed_since,
+                staged=staged,
+            )
+        except ValueError as e:
+            echo(e, err=True)
+            raise Exit(code=2)
+
+        if shard is not None:
+            files_to_check = select_shard(files_to_check, shard, by_size=shard_by_size)
+
+        if cache:
+            result_cache = ResultCache.for_config(config_file, directory=cache_dir)
+
+        if show_timings or timings_json:
+            timings.enable()
+            report = timings.Report()
+            files_to_check = report.timed_walk(files_to_check)
+
+        if profile:
+            import cProfile
+
+            # Worker processes aren't profiled
+            jobs = 1
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        results = check_paths(
+            pattern_check=pattern_check,
+            config_file=config_file,
+            target_files=files_to_check,
+            jobs=jobs,
+            cache=result_cache,
+        )
+
+    try:
+        for result in results:
+            if result_report is not None:
+                result_report.add(result)
+
+            if result.skipped:
+                skipped += 1
                 continue
 
+            if report is not None:
+                report.add(result.timings, result.path)
+
+            has_problems = (
+                bool(result.failures)
+                or not result.has_frontmatter
+                or result.error is not None
+            )
+
+            if has_problems or not quiet:
+                _echo_result(result)
+
+            if result.error is not None or not result.validates:
+                ret_code = 1
+
+                if fail_fast:
+                    break
+    except ValueError as e:
+        # The server went away part way through
+        echo(e, err=True)
+        raise Exit(code=2)
+    finally:
+        # Stops the workers or the server when the loop ended early
+        results.close()
+        timings.enable(False)
+
+        if profiler is not None:
+            profiler.disable()
+
+    if profiler is not None:
+        profiler.dump_stats(profile)
+
+    if report is not None:
+        if show_timings:
+            echo(report.format_table(), err=True)
+        if timings_json:
+            timings_json.write_text(report.to_json())
+
+    for report_format, path in reports:
+        result_report.write(report_format, path)
+
+    if skipped and not quiet:
+        echo(f"Skipped {skipped} file(s) that no pattern matches")
+
+    if result_cache is not None:
+        result_cache.prune()
+
     raise Exit(code=ret_code)
 
 
+serve_app = Typer()
+
+
+@serve_app.command(name="serve")
+def serve_checks(
+    config_file: Annotated[
+        pathlib.Path,
+        Option(
+            help="configuration file to process rules",
+            envvar="FRONTMATTER_CHECK_CONFIG_FILE",
+        ),
+    ] = pathlib.Path(".frontmatter_check.yaml"),
+    cache_dir: Annotated[
+        pathlib.Path,
+        Option(
+            help="directory the server's socket is created in",
+            envvar="FRONTMATTER_CHECK_CACHE_DIR",
+        ),
+    ] = CACHE_DIR,
+) -> None:
+    """Keep the config loaded and check files for `frontmatter-check` runs in this directory."""
+
+    from .server import serve
+
+    path = socket_path(cache_dir)
+
+    try:
+        echo(f"Listening on {path}")
+        serve(config_file, path)
+    except (OSError, ValueError) as e:
+        echo(e, err=True)
+        raise Exit(code=2)
+
+
+watch_app = Typer()
+
+
+@watch_app.command(name="watch")
+def watch_files(
+    target_files: Annotated[
+        typing.List[pathlib.Path],
+        Argument(help="files and directories to watch", show_default=False),
+    ],
+    config_file: Annotated[
+        pathlib.Path,
+        Option(
+            help="configuration file to process rules",
+            envvar="FRONTMATTER_CHECK_CONFIG_FILE",
+        ),
+    ] = pathlib.Path(".frontmatter_check.yaml"),
+    file_pattern: typing.List[str] = ["*.md", "*.txt"],
+    gitignore: Annotated[
+        bool,
+        Option(help="skip files and directories ignored by .gitignore files"),
+    ] = True,
+    poll: Annotated[
+        bool,
+        Option("--poll", help="look for changes by polling instead of with inotify"),
+    ] = False,
+    interval: Annotated[float, Option(min=0.1, help="seconds between polls")] = 1.0,
+    debounce: Annotated[
+        float,
+        Option(min=0, help="seconds to wait for more changes before checking"),
+    ] = 0.2,
+) -> None:
+    """Check files and check them again whenever they change."""
+
+    from .watch import Watcher
+
+    watcher = Watcher(config_file, target_files, file_pattern, use_gitignore=gitignore)
+
+    def report(result):
+        if not result.skipped:
+            _echo_result(result)
+
+    try:
+        watcher.run(report, poll=poll, interval=interval, debounce=debounce)
+    except KeyboardInterrupt:
+        pass
+
+
+merge_app = Typer()
+
+
+@merge_app.command(name="merge")
+def merge_reports(
+    report_files: Annotated[
+        typing.List[pathlib.Path],
+        Argument(
+            help="json reports to merge, like one from each --shard", show_default=False
+        ),
+    ],
+    report_options: Annotated[
+        typing.Optional[typing.List[str]],
+        Option(
+            "--report",
+            help="write the merged json, jsonl, sarif or junit report as FORMAT=PATH",
+            show_default=False,
+        ),
+    ] = None,
+    quiet: Annotated[
+        bool,
+        Option("--quiet", "-q", help="don't print the summary"),
+    ] = False,
+) -> None:
+    """Combine the json reports of a sharded run into one report and exit code."""
+
+    result_report = ResultReport()
+
+    try:
+        reports = [parse_report_option(option) for option in report_options or ()]
+
+        for report_file in report_files:
+            try:
+                result_report.add_json(report_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                raise ValueError(f"Could not merge {report_file}: {e}")
+    except ValueError as e:
+        echo(e, err=True)
+        raise Exit(code=2)
+
+    for result in result_report.results:
+        if result.failures or not result.has_frontmatter or result.error is not None:
+            _echo_result(result)
+
+    for report_format, path in reports:
+        result_report.write(report_format, path)
+
+    summary = result_report.summary()
+
+    if not quiet:
+        echo(
+            f"Checked {summary['checked']} file(s) in {len(report_files)} report(s):"
+            f" {summary['failed']} failed, {summary['errors']} could not be checked"
+            f" and {summary['skipped']} were skipped"
+        )
+
+    raise Exit(code=1 if summary["failed"] or summary["errors"] else 0)
+
+
+_COMMANDS = {"serve": serve_app, "watch": watch_app, "merge": merge_app}
+
+
+def main():
+    # `check` takes its files without a command name, so the other commands
+    # are dispatched here instead of being subcommands of `app`
+    if command := _COMMANDS.get(sys.argv[1] if len(sys.argv) > 1 else None):
+        command(args=sys.argv[2:], prog_name=f"frontmatter-check {sys.argv[1]}")
+    else:
+        app()
+
+
 if __name__ == "__main__":
-    app()
+    main()
@@ -0,0 +1,95 @@
+"""
+Sends a check to a running `frontmatter-check serve`.
+
+The `check` command tries this before loading the config itself, so this module
+only imports what it needs to talk to the server.
+
+Requests and responses are json, one object per line. The server answers with
+`{"ok": true}` followed by a line per result and `{"done": true}`, or with
+`{"ok": false, "reason": ...}` when the client should check the files itself.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import socket
+import typing
+
+from .logger import logger
+
+if typing.TYPE_CHECKING:
+    from .pattern_check import ValidationResult
+
+# Servers refuse requests of other versions, so a client's options are never ignored
+PROTOCOL_VERSION = 2
+
+
+def socket_path(cache_dir: pathlib.Path) -> pathlib.Path:
+    """The socket of the server for the current directory"""
+    # Every project shares the cache directory, so each gets its own socket
+    name = hashlib.sha256(os.getcwd().encode()).hexdigest()[:16]
+    return pathlib.Path(cache_dir) / f"server-{name}.sock"
+
+
+def _decode_result(data: dict) -> "ValidationResult":
+    from .pattern_check import ValidationResult
+    from .rule_validations import RuleFailure
+
+    return ValidationResult(
+        path=pathlib.Path(data["path"]),
+        failures=[RuleFailure(*failure) for failure in data["failures"]],
+        has_frontmatter=data["has_frontmatter"],
+        skipped=data["skipped"],
+        error=data["error"],
+    )
+
+
+def check_with_server(
+    path: pathlib.Path, request: dict
+) -> "typing.Iterator[ValidationResult] | None":
+    """
+    Sends `request` to the server listening at `path`.
+
+    Returns None when no server is running or it can't do the check, so the
+    caller should check the files itself. Otherwise returns the results as
+    they arrive.
+    """
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+
+    client = socket.socket(socket.AF_UNIX)
+
+    try:
+        client.connect(str(path))
+        stream = client.makefile("rwb")
+        stream.write(
+            json.dumps({"version": PROTOCOL_VERSION, **request}).encode() + b"\n"
+        )
+        stream.flush()
+        status = json.loads(stream.readline())
+    except (OSError, ValueError):
+        client.close()
+        return None
+
+    if not status.get("ok"):
+        logger.debug("Checking without the server: %s", status.get("reason"))
+        client.close()
+        return None
+
+    return _read_results(client, stream)
+
+
+def _read_results(
+    client: socket.socket, stream: typing.BinaryIO
+) -> "typing.Iterator[ValidationResult]":
+    with client, stream:
+        for line in stream:
+            message = json.loads(line)
+
+            if message.get("done"):
+                return
+
+            yield _decode_result(message)
+
+    raise ValueError("Lost the connection to the frontmatter-check server")
@@ -0,0 +1,39 @@
+"""
+Ask the local git repository which files changed, so only those are checked.
+
+Only the local repository is used, so this works offline.
+"""
+
+import pathlib
+import subprocess
+
+
+def changed_files(
+    since: str | None = None,
+    staged: bool = False,
+    cwd: pathlib.Path | None = None,
+) -> list[pathlib.Path]:
+    """
+    Returns the files added, copied, modified or renamed since `since`.
+
+    `since` can be anything `git diff` accepts, like `main` or `main...HEAD`.
+    With `staged`, only staged changes are returned. Paths are relative to
+    `cwd` and files outside of it are left out.
+    """
+    args = ["git", "diff", "--name-only", "-z", "--diff-filter=ACMR", "--relative"]
+
+    if staged:
+        args.append("--cached")
+    if since:
+        args.extend([since, "--"])
+
+    try:
+        completed = subprocess.run(
+            args, cwd=cwd, capture_output=True, check=True, text=True
+        )
+    except FileNotFoundError:
+        raise ValueError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"git diff failed: {e.stderr.strip()}")
+
+    return [pathlib.Path(name) for name in completed.stdout.split("\0") if name]
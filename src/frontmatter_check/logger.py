@@ -1,14 +1,13 @@
 """
 The logging manager for the output of Frontmatter Check.
 
-The errors are checked against the `memory_handler`.
+Checks return their failures as results, and results are logged here.
 Warnings are sent to `stdout` with `stdout_handler`
 Errors are sent to `stderr` with `stderr_handler`
 """
 
 import sys
 import logging
-from logging.handlers import MemoryHandler
 
 logger = logging.getLogger("FrontmatterCheck")
 logger.propagate = False
@@ -19,9 +18,6 @@ class WarningOnlyFilter(logging.Filter):
         return record.levelno == logging.WARNING
 
 
-memory_handler = MemoryHandler(capacity=1000)
-memory_handler.setLevel(logging.ERROR)
-
 formatter = logging.Formatter("%(levelname)s - %(message)s")
 
 stdout_handler = logging.StreamHandler(sys.stdout)
@@ -35,4 +31,3 @@ stderr_handler.setFormatter(formatter)
 
 logger.addHandler(stdout_handler)
 logger.addHandler(stderr_handler)
-logger.addHandler(memory_handler)
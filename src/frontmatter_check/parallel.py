@@ -0,0 +1,193 @@
+"""
+Run `FrontmatterPatternMatchCheck.evaluate` over many files, optionally in a process pool.
+
+Results are yielded in the same order that the files were given, so their
+output doesn't depend on how the files were spread across workers.
+"""
+
+import collections
+import dataclasses
+import itertools
+import os
+import pathlib
+import typing
+
+from . import parsers, timings
+from .pattern_check import FrontmatterPatternMatchCheck, ValidationResult
+
+if typing.TYPE_CHECKING:
+    from .cache import ResultCache
+
+# Below this many files per worker the cost of starting the pool outweighs the gain.
+_MIN_FILES_PER_WORKER = 50
+_MAX_CHUNKSIZE = 64
+
+_worker_pattern_check: FrontmatterPatternMatchCheck | None = None
+_worker_cache: "ResultCache | None" = None
+
+
+def check_file(
+    pattern_check: FrontmatterPatternMatchCheck,
+    target_file: pathlib.Path,
+    cache: "ResultCache | None" = None,
+) -> ValidationResult:
+    """
+    Check a single file without logging anything.
+
+    Files that no pattern matches are skipped without being opened. When a
+    `cache` is given, an unchanged file's stored result is returned without
+    reading it. When timing is enabled, the result has the file's timings.
+    """
+
+    if not timings.is_enabled():
+        return _check_file_cached(pattern_check, target_file, cache)
+
+    with timings.timing_file() as file_timings:
+        result = _check_file_cached(pattern_check, target_file, cache)
+
+    # The result may be shared with the cache, so the timings go on a copy
+    return dataclasses.replace(result, timings=file_timings)
+
+
+def _check_file_cached(
+    pattern_check: FrontmatterPatternMatchCheck,
+    target_file: pathlib.Path,
+    cache: "ResultCache | None",
+) -> ValidationResult:
+    if cache is None:
+        if not pattern_check.matches(target_file):
+            return ValidationResult(path=target_file, skipped=True)
+        return _check_file(pattern_check, target_file)
+
+    # Which rulesets apply depends on the path as given, not just the file
+    if not (rulesets := pattern_check.pattern_index.match_positions(target_file)):
+        return ValidationResult(path=target_file, skipped=True)
+
+    if (result := cache.get(target_file, rulesets)) is not None:
+        return result
+
+    try:
+        stat = os.stat(target_file)
+    except OSError:
+        return _check_file(pattern_check, target_file)
+
+    result = _check_file(pattern_check, target_file)
+
+    # A file that stopped at its first error may be missing failures
+    if result.validates or not pattern_check.stop_at_error:
+        cache.put(result, stat, rulesets)
+
+    return result
+
+
+def _check_file(
+    pattern_check: FrontmatterPatternMatchCheck, target_file: pathlib.Path
+) -> ValidationResult:
+    try:
+        return pattern_check.evaluate(target_file)
+    except parsers.read_errors() as e:
+        # Reported on the file, so the rest of the run still counts
+        return ValidationResult(path=target_file, error=str(e))
+
+
+def resolve_jobs(jobs: int, file_count: int) -> int:
+    """Turn the `--jobs` value into a worker count. `0` picks one automatically."""
+
+    if jobs > 0:
+        return jobs
+
+    cpu_count = os.cpu_count() or 1
+    return max(1, min(cpu_count, file_count // _MIN_FILES_PER_WORKER))
+
+
+def _init_worker(
+    config_file: pathlib.Path,
+    cache: "ResultCache | None",
+    timed: bool,
+    stop_at_error: bool,
+):
+    global _worker_pattern_check, _worker_cache
+    timings.enable(timed)
+
+    if cache is not None:
+        from .cache import load_config
+
+        # The check loaded the config just before, so this is usually a cache hit
+        _worker_pattern_check = load_config(config_file, cache.directory)
+    else:
+        _worker_pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(
+            config_file=config_file
+        )
+
+    _worker_pattern_check.stop_at_error = stop_at_error
+    _worker_cache = cache
+
+
+def _check_in_worker(target_files: list[pathlib.Path]) -> list[ValidationResult]:
+    return [
+        check_file(_worker_pattern_check, target_file, cache=_worker_cache)
+        for target_file in target_files
+    ]
+
+
+def check_paths(
+    pattern_check: FrontmatterPatternMatchCheck,
+    config_file: pathlib.Path,
+    target_files: typing.Iterable[pathlib.Path],
+    jobs: int = 0,
+    cache: "ResultCache | None" = None,
+) -> typing.Iterator[ValidationResult]:
+    """
+    Yield a `ValidationResult` for every file in `target_files`, in order.
+
+    With more than one job the files are spread across a process pool. Each
+    worker builds its own `FrontmatterPatternMatchCheck` from `config_file`.
+    `target_files` is consumed lazily, with a bounded number of files in flight.
+    Closing the iterator early cancels the files that haven't started.
+    """
+
+    target_files = iter(target_files)
+    cpu_count = os.cpu_count() or 1
+
+    # Look at enough files to decide how many workers are worth starting
+    head = list(itertools.islice(target_files, cpu_count * _MIN_FILES_PER_WORKER))
+    jobs = resolve_jobs(jobs, len(head))
+    target_files = itertools.chain(head, target_files)
+
+    if jobs == 1:
+        for target_file in target_files:
+            yield check_file(pattern_check, target_file, cache=cache)
+        return
+
+    import concurrent.futures
+
+    chunksize = max(1, min(_MAX_CHUNKSIZE, len(head) // (jobs * 4)))
+    chunks = iter(lambda: list(itertools.islice(target_files, chunksize)), [])
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(
+            config_file,
+            cache,
+            timings.is_enabled(),
+            pattern_check.stop_at_error,
+        ),
+    ) as executor:
+        in_flight = collections.deque(
+            executor.submit(_check_in_worker, chunk)
+            for chunk in itertools.islice(chunks, jobs * 4)
+        )
+
+        try:
+            while in_flight:
+                results = in_flight.popleft().result()
+
+                if (chunk := next(chunks, None)) is not None:
+                    in_flight.append(executor.submit(_check_in_worker, chunk))
+
+                yield from results
+        finally:
+            # Only the chunks already running are waited for on the way out
+            for future in in_flight:
+                future.cancel()
@@ -0,0 +1,179 @@
+"""
+The parsers that turn a frontmatter header into metadata.
+
+`default` uses python-frontmatter's handlers (YAML, TOML and JSON), which read
+YAML with libyaml's `CSafeLoader` when PyYAML was built with it.
+
+`flat` reads YAML headers made of `key: value` lines itself and gives anything
+else (lists, nested mappings, quoting it can't read exactly, multi-line values,
+anchors...) to the YAML loader. Values it reads get the type `yaml.safe_load`
+would give them, so rules with a `type` pass and fail the same way with either
+parser.
+"""
+
+import datetime
+import functools
+import re
+import typing
+
+DEFAULT_PARSER = "default"
+PARSERS = ("default", "flat")
+
+_LINE = re.compile(r"([A-Za-z_][A-Za-z0-9_.-]*):(?: +(.*?))? *")
+_DECIMAL = re.compile(r"[-+]?(?:0|[1-9][0-9]*)")
+_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+_SINGLE_QUOTED = re.compile(r"'([^']*)'")
+_DOUBLE_QUOTED = re.compile(r'"([^"\\]*)"')
+# Characters that start something other than a plain scalar
+_INDICATORS = frozenset("[]{}#&*!|>%@`-?:,")
+
+_STR = "tag:yaml.org,2002:str"
+_NULL = "tag:yaml.org,2002:null"
+_BOOL = "tag:yaml.org,2002:bool"
+_INT = "tag:yaml.org,2002:int"
+_TIMESTAMP = "tag:yaml.org,2002:timestamp"
+_TRUE = frozenset(("yes", "true", "on"))
+
+
+class NotFlat(ValueError):
+    """Raised by `parse_flat` for headers it can't read exactly"""
+
+
+@functools.cache
+def yaml_loader() -> type:
+    """libyaml's `CSafeLoader` when PyYAML was built with it, `SafeLoader` otherwise"""
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.cache
+def read_errors() -> tuple[type[Exception], ...]:
+    """
+    The errors of a file that can't be read, decoded or parsed, which are
+    reported on that file rather than ending a run. PyYAML's errors aren't
+    ValueErrors, and as an `except` clause this only imports it on an error.
+    """
+    import yaml
+
+    return (OSError, ValueError, yaml.YAMLError)
+
+
+@functools.cache
+def _implicit_resolvers() -> dict:
+    import yaml
+
+    return yaml.resolver.Resolver.yaml_implicit_resolvers
+
+
+def _tag(scalar: str) -> str:
+    """The tag YAML resolves an unquoted scalar to"""
+    resolvers = _implicit_resolvers()
+
+    for tag, regexp in (*resolvers.get(scalar[:1], ()), *resolvers.get(None, ())):
+        if regexp.match(scalar):
+            return tag
+
+    return _STR
+
+
+def _scalar(text: str) -> typing.Any:
+    if not text:
+        return None
+
+    if text[0] == "'":
+        if match := _SINGLE_QUOTED.fullmatch(text):
+            return match[1]
+        raise NotFlat(text)
+
+    if text[0] == '"':
+        if match := _DOUBLE_QUOTED.fullmatch(text):
+            return match[1]
+        raise NotFlat(text)
+
+    if (
+        text[0] in _INDICATORS
+        or text[-1] == ":"
+        or ": " in text
+        or " #" in text
+        or "\t" in text
+    ):
+        raise NotFlat(text)
+
+    tag = _tag(text)
+
+    if tag == _STR:
+        return text
+    if tag == _NULL:
+        return None
+    if tag == _BOOL:
+        return text.lower() in _TRUE
+    if tag == _INT and _DECIMAL.fullmatch(text):
+        return int(text)
+    if tag == _TIMESTAMP and _DATE.fullmatch(text):
+        return datetime.date.fromisoformat(text)
+
+    # Floats, octal and sexagesimal ints, times and the rest are left to YAML
+    raise NotFlat(text)
+
+
+def parse_flat(text: str) -> dict:
+    """
+    Reads a YAML header of `key: value` lines.
+
+    Raises `NotFlat` when the header uses anything else.
+    """
+    metadata = {}
+
+    for line in text.splitlines():
+        if not line.strip() or line[0] == "#":
+            continue
+
+        if not (match := _LINE.fullmatch(line)):
+            raise NotFlat(line)
+
+        key = match[1]
+
+        if _tag(key) != _STR:
+            raise NotFlat(line)
+
+        metadata[key] = _scalar(match[2] or "")
+
+    return metadata
+
+
+class FlatYAMLHandler:
+    """Wraps python-frontmatter's YAML handler, reading flat headers with `parse_flat`"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.FM_BOUNDARY = handler.FM_BOUNDARY
+
+    def detect(self, text: str) -> bool:
+        return self.handler.detect(text)
+
+    def split(self, text: str) -> tuple[str, str]:
+        return self.handler.split(text)
+
+    def load(self, fm: str) -> typing.Any:
+        try:
+            return parse_flat(fm)
+        except NotFlat:
+            return self.handler.load(fm)
+
+
+def handlers(parser: str = DEFAULT_PARSER) -> list:
+    """The python-frontmatter handlers `read_metadata` uses for `parser`"""
+    import frontmatter
+
+    if parser == "default":
+        return frontmatter.handlers
+    if parser == "flat":
+        return [
+            FlatYAMLHandler(handler)
+            if isinstance(handler, frontmatter.YAMLHandler)
+            else handler
+            for handler in frontmatter.handlers
+        ]
+
+    raise ValueError(f"Unknown parser {parser!r}, expected one of {', '.join(PARSERS)}")
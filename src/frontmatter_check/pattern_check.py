@@ -2,15 +2,27 @@
 Pattern check is used to check against multiple patterns.
 """
 
+import contextlib
 import dataclasses
 import logging
+import operator
 import pathlib
-import fnmatch
-
-import frontmatter
-import yaml
-
+import time
+import typing
+
+from . import parsers, timings
+from .logger import logger
+from .pattern_index import PatternIndex, pattern_matches
+from .reader import (
+    DEFAULT_MAX_HEADER_SIZE,
+    DEFAULT_READER,
+    READERS,
+    read_metadata,
+    read_metadata_bytes,
+)
 from .rule_validations import (
+    Diagnostic,
+    RuleFailure,
     RulesetValidator,
     ValidationRule,
 )
@@ -21,8 +33,16 @@ _VALID_LOGGING_STRINGS = {
     "error": logging.ERROR,
 }
 
+if typing.TYPE_CHECKING:
+    import asyncio
+
+    from . import bulk
+
 FRONTMATTER_CHECK_LOGGING_LEVEL = logging.ERROR
 
+# The number of files `validate_many` reads at once
+DEFAULT_MAX_CONCURRENCY = 32
+
 
 def convert_error_strings(
     error_string: str | int,
@@ -46,6 +66,9 @@ def _to_validation_rule(rule: dict) -> ValidationRule:
     invalid_type_logging_level = convert_error_strings(
         rule.get("is_invalid_type", rule.get("level", logging.ERROR))
     )
+    invalid_value_logging_level = convert_error_strings(
+        rule.get("is_invalid_value", rule.get("level", logging.ERROR))
+    )
 
     return ValidationRule(
         field_name=rule.get("field_name", None),
@@ -54,10 +77,17 @@ def _to_validation_rule(rule: dict) -> ValidationRule:
         missing_field_logging_level=missing_field_logging_level,
         null_value_logging_level=null_value_logging_level,
         invalid_type_logging_level=invalid_type_logging_level,
+        regex=rule.get("regex"),
+        enum=rule.get("enum"),
+        minimum=rule.get("minimum"),
+        maximum=rule.get("maximum"),
+        min_length=rule.get("min_length"),
+        max_length=rule.get("max_length"),
+        invalid_value_logging_level=invalid_value_logging_level,
     )
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class PatternRuleset:
     """
     Pattern for the yaml files
@@ -83,6 +113,10 @@ class PatternRuleset:
     pattern: str
     rules: RulesetValidator
 
+    def __reduce__(self):
+        # Unpickles through __init__, like `ValidationRule`
+        return (type(self), (self.name, self.pattern, self.rules))
+
     @classmethod
     def from_dict(cls, config_dict):
         rules = RulesetValidator(
@@ -96,11 +130,41 @@ class PatternRuleset:
         )
 
 
-def _check_pattern(pattern_ruleset: PatternRuleset, file_path: pathlib.Path):
-    if hasattr(file_path, "full_match"):
-        return file_path.full_match(pattern_ruleset.pattern)
+@dataclasses.dataclass(slots=True)
+class ValidationResult:
+    """The result of checking one file against the patterns that match it"""
+
+    path: pathlib.Path
+    failures: list[RuleFailure] = dataclasses.field(default_factory=list)
+    has_frontmatter: bool = True
+    # True when no pattern matches the file, so it was never opened
+    skipped: bool = False
+    # Set when the file couldn't be checked
+    error: str | None = None
+    # Set when timing is enabled
+    timings: "timings.FileTimings | None" = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
+
+    @property
+    def validates(self) -> bool:
+        return not any(failure.level == logging.ERROR for failure in self.failures)
+
+    def log(self):
+        """Sends the failures to the FrontmatterCheck logger"""
+        if not self.has_frontmatter:
+            logger.warning("No Frontmatter Found for %s" % self.path)
+
+        for failure in self.failures:
+            logger.log(failure.level, failure.message)
 
-    return fnmatch.fnmatch(str(file_path), pattern_ruleset.pattern)
+
+def _ends_with_error(failures: list[RuleFailure]) -> bool:
+    return bool(failures) and failures[-1].level == logging.ERROR
+
+
+def _check_pattern(pattern_ruleset: PatternRuleset, file_path: pathlib.Path):
+    return pattern_matches(pattern_ruleset.pattern, file_path)
 
 
 class FrontmatterPatternMatchCheck:
@@ -136,54 +200,336 @@ class FrontmatterPatternMatchCheck:
     """
 
     pattern_sets: list[PatternRuleset]
+    max_header_size: int = DEFAULT_MAX_HEADER_SIZE
+    # Stop checking a file at its first ERROR, when only whether it fails matters
+    stop_at_error: bool = False
+    # The `settings: level` of the config file it was loaded from
+    level: str | int | None = None
 
-    def __init__(self, *pattern_rulesets):
+    def __init__(
+        self,
+        *pattern_rulesets,
+        exclude: list[str] | None = None,
+        parser: str = parsers.DEFAULT_PARSER,
+        reader: str = DEFAULT_READER,
+    ):
+        if parser not in parsers.PARSERS:
+            raise ValueError(
+                f"Unknown parser {parser!r}, expected one of {', '.join(parsers.PARSERS)}"
+            )
+        if reader not in READERS:
+            raise ValueError(
+                f"Unknown reader {reader!r}, expected one of {', '.join(READERS)}"
+            )
+
+        self.exclude = list(exclude or [])
+        # One of `parsers.PARSERS`, the backend that reads the frontmatter
+        self.parser = parser
+        # One of `reader.READERS`, how the header is read from the file
+        self.reader = reader
+        self._handlers = None
+        self._failure_table = None
         self.pattern_sets = [
             PatternRuleset.from_dict(rule_set) for rule_set in pattern_rulesets
         ]
+        self.pattern_index = PatternIndex(self.pattern_sets)
         logging.debug(self.__dict__)
 
+    def __getstate__(self) -> dict:
+        # The handlers are loaded again on first use, so unpickling a check
+        # doesn't import python-frontmatter
+        return {**self.__dict__, "_handlers": None}
+
+    @property
+    def handlers(self) -> list:
+        """The python-frontmatter handlers of `parser`, loaded on first use"""
+        if self._handlers is None:
+            self._handlers = parsers.handlers(self.parser)
+
+        return self._handlers
+
+    def _read(self, frontmatter_file: pathlib.Path) -> dict:
+        read = read_metadata_bytes if self.reader == "bytes" else read_metadata
+        return read(
+            frontmatter_file.absolute(),
+            max_header_size=self.max_header_size,
+            handlers=self.handlers,
+        )
+
+    def _diagnostic_table(self) -> tuple:
+        compiled = [
+            pattern.rules.compile(pattern.name) for pattern in self.pattern_sets
+        ]
+        table = self._failure_table
+
+        if table is None or not all(map(operator.is_, compiled, table[0])):
+            rule_failures = [
+                failures for ruleset in compiled for failures in ruleset.failures
+            ]
+            codes = {
+                failure: (rule_index, kind)
+                for rule_index, failures in enumerate(rule_failures)
+                for kind, failure in enumerate(failures)
+            }
+            table = self._failure_table = (compiled, rule_failures, codes)
+
+        return table
+
+    @property
+    def rule_failures(self) -> list[tuple[RuleFailure, ...]]:
+        """
+        The (missing, null, invalid_type, invalid_value) failures of every
+        rule of every pattern, in the order of the config.
+        `Diagnostic.rule_index` is an index into this list.
+        """
+        return self._diagnostic_table()[1]
+
+    def diagnostics(
+        self, result: ValidationResult, file_id: int = 0
+    ) -> list[Diagnostic]:
+        """
+        `result`'s failures as `Diagnostic`s, to keep instead of the result.
+
+        Raises a ValueError for a failure that isn't one of `rule_failures`.
+        """
+        codes = self._diagnostic_table()[2]
+
+        try:
+            return [Diagnostic(file_id, *codes[failure]) for failure in result.failures]
+        except KeyError as e:
+            raise ValueError(f"Not a failure of these patterns: {e.args[0]}")
+
+    def failure(self, diagnostic: Diagnostic) -> RuleFailure:
+        """The `RuleFailure` a `Diagnostic` stands for"""
+        return self.rule_failures[diagnostic.rule_index][diagnostic.kind]
+
+    def matches(self, frontmatter_file: pathlib.Path) -> bool:
+        """Whether any pattern applies to `frontmatter_file`"""
+        return bool(self.pattern_index.match(frontmatter_file))
+
+    def _evaluate_metadata(
+        self,
+        frontmatter_file: pathlib.Path,
+        pattern_sets: list[PatternRuleset],
+        frontmatter_metadata: dict,
+    ) -> ValidationResult:
+        if not frontmatter_metadata:
+            return ValidationResult(path=frontmatter_file, has_frontmatter=False)
+
+        failures = []
+
+        for pattern in pattern_sets:
+            logging.debug("Checking %s against %s" % (frontmatter_file, pattern.name))
+            failures.extend(
+                pattern.rules.compile(pattern.name).evaluate(
+                    frontmatter_metadata, self.stop_at_error
+                )
+            )
+
+            if self.stop_at_error and _ends_with_error(failures):
+                break
+
+        return ValidationResult(path=frontmatter_file, failures=failures)
+
+    def evaluate(self, frontmatter_file: pathlib.Path) -> ValidationResult:
+        """
+        Checks a file against every matching pattern without logging anything.
+
+        Files that no pattern matches are not opened.
+        """
+        if (file_timings := timings.current) is not None:
+            return self._evaluate_timed(frontmatter_file, file_timings)
+
+        pattern_sets = self.pattern_index.match(frontmatter_file)
+
+        if not pattern_sets:
+            return ValidationResult(path=frontmatter_file, skipped=True)
+
+        frontmatter_metadata = self._read(frontmatter_file)
+        return self._evaluate_metadata(
+            frontmatter_file, pattern_sets, frontmatter_metadata
+        )
+
+    def _evaluate_timed(
+        self, frontmatter_file: pathlib.Path, file_timings: "timings.FileTimings"
+    ) -> ValidationResult:
+        """`evaluate`, recording how long each stage, pattern and rule took"""
+        start = time.perf_counter_ns()
+        pattern_sets = self.pattern_index.match(frontmatter_file)
+        matched = time.perf_counter_ns()
+        file_timings.add("match", matched - start)
+
+        if not pattern_sets:
+            return ValidationResult(path=frontmatter_file, skipped=True)
+
+        frontmatter_metadata = self._read(frontmatter_file)
+        read = time.perf_counter_ns()
+        # The reader records the time spent parsing the header itself
+        file_timings.add("read", read - matched - file_timings.stages.get("parse", 0))
+
+        if not frontmatter_metadata:
+            return ValidationResult(path=frontmatter_file, has_frontmatter=False)
+
+        failures = []
+
+        for pattern in pattern_sets:
+            pattern_start = time.perf_counter_ns()
+            rule_timings = {}
+            failures.extend(
+                pattern.rules.compile(pattern.name).evaluate_timed(
+                    frontmatter_metadata, rule_timings, self.stop_at_error
+                )
+            )
+            file_timings.patterns[pattern.name] = (
+                file_timings.patterns.get(pattern.name, 0)
+                + time.perf_counter_ns()
+                - pattern_start
+            )
+
+            for field_name, elapsed in rule_timings.items():
+                key = (pattern.name, field_name)
+                file_timings.rules[key] = file_timings.rules.get(key, 0) + elapsed
+
+            if self.stop_at_error and _ends_with_error(failures):
+                break
+
+        file_timings.add("validate", time.perf_counter_ns() - read)
+        return ValidationResult(path=frontmatter_file, failures=failures)
+
     def validates(
         self,
         frontmatter_file: pathlib.Path,
     ):
-        """Iterates through the ruleset"""
-        frontmatter_metadata = frontmatter.load(
-            str(frontmatter_file.absolute())
-        ).metadata
+        """
+        Iterates through the ruleset.
 
-        _validates = True
+        Files that no pattern matches are not opened.
+        """
+        result = self.evaluate(frontmatter_file)
 
-        if not frontmatter_metadata:
-            logging.warning("No Frontmatter Found for %s" % frontmatter_file)
-            return _validates
+        if result.skipped:
+            logging.debug("No pattern matches %s" % frontmatter_file)
+
+        result.log()
+        return result.validates
+
+    async def avalidates(
+        self,
+        frontmatter_file: pathlib.Path,
+        semaphore: "asyncio.Semaphore | None" = None,
+    ) -> ValidationResult:
+        """
+        Like `evaluate`, but reads and parses the file in a worker thread.
+
+        `semaphore` limits how many files are read at once.
+        """
+        import asyncio
+
+        pattern_sets = self.pattern_index.match(frontmatter_file)
+
+        if not pattern_sets:
+            return ValidationResult(path=frontmatter_file, skipped=True)
 
-        for pattern in self.pattern_sets:
-            if _check_pattern(pattern, frontmatter_file):
-                logging.debug(
-                    "Checking %s against %s" % (frontmatter_file, pattern.name)
+        async with semaphore or contextlib.nullcontext():
+            try:
+                frontmatter_metadata = await asyncio.to_thread(
+                    self._read, frontmatter_file
                 )
-                if not pattern.rules.validates(frontmatter_metadata):
-                    _validates = False
-                # TODO: Implement fail fast here.
+            except parsers.read_errors() as e:
+                # Like `check_file`, so one unreadable file doesn't end the batch
+                return ValidationResult(path=frontmatter_file, error=str(e))
 
-        return _validates
+        return self._evaluate_metadata(
+            frontmatter_file, pattern_sets, frontmatter_metadata
+        )
+
+    async def validate_many(
+        self,
+        frontmatter_files: typing.Iterable[pathlib.Path],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> typing.AsyncIterator[ValidationResult]:
+        """
+        Checks many files concurrently, yielding each result as it completes.
+
+        At most `max_concurrency` files are read at once and no more than twice
+        that many are waiting, so `frontmatter_files` can be a lazy iterable.
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        pending = set()
+
+        try:
+            for frontmatter_file in frontmatter_files:
+                pending.add(
+                    asyncio.ensure_future(
+                        self.avalidates(frontmatter_file, semaphore=semaphore)
+                    )
+                )
+
+                if len(pending) >= max_concurrency * 2:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def evaluate_documents(
+        self, documents: "typing.Iterable[bulk.Document]"
+    ) -> "bulk.ColumnarReport":
+        """
+        Checks documents that are already in memory, given as `(path, metadata)`
+        or `(path, text)` pairs, without reading any files.
+
+        Each ruleset is checked one rule at a time over every document it
+        applies to. See `bulk.ColumnarReport` for the results.
+        """
+        from .bulk import evaluate_documents
+
+        return evaluate_documents(self, documents)
 
     @classmethod
     def from_yaml_config(cls, config_file: pathlib.Path):
         """Create a FrontmatterPatternCheck object with rules from a yaml_file"""
+        import yaml
+
         with open(config_file, mode="rt") as yaml_file:
             config = {}
 
-            for config_section in yaml.safe_load_all(yaml_file):
+            for config_section in yaml.load_all(
+                yaml_file, Loader=parsers.yaml_loader()
+            ):
                 config.update(config_section)
 
             if not config:
                 raise ValueError("Invalid Config File: must convert to a dictionary")
 
-        if settings := config.get("settings", None):
-            if level := settings.get("level", None):
-                global FRONTMATTER_CHECK_LOGGING_LEVEL
-                FRONTMATTER_CHECK_LOGGING_LEVEL = level
+        settings = config.get("settings", None) or {}
+
+        pattern_check = FrontmatterPatternMatchCheck(
+            *config["patterns"],
+            exclude=config.get("exclude", None),
+            parser=settings.get("parser", parsers.DEFAULT_PARSER),
+            reader=settings.get("reader", DEFAULT_READER),
+        )
+
+        if level := settings.get("level", None):
+            pattern_check.level = level
+            pattern_check.apply_level()
+
+        return pattern_check
 
-        return FrontmatterPatternMatchCheck(*config["patterns"])
+    def apply_level(self):
+        """Makes the `settings: level` of the config the global logging level"""
+        global FRONTMATTER_CHECK_LOGGING_LEVEL
+        FRONTMATTER_CHECK_LOGGING_LEVEL = self.level
@@ -0,0 +1,184 @@
+"""
+An index for finding the patterns that match a path without checking every pattern.
+
+Patterns are stored in a tree keyed by their literal leading path segments
+(`docs/blog/*.md` is stored under `docs` -> `blog`) and then bucketed by the
+file extension they require. Matching a path walks the tree along its own
+segments, so only patterns that share its directories and extension are
+checked with `pattern_matches`.
+"""
+
+import fnmatch
+import os
+import pathlib
+import typing
+
+_WILDCARDS = "*?["
+
+# fnmatch and full_match ignore case on some platforms, so only index by exact text
+# when the platform is case sensitive.
+_CASE_SENSITIVE = os.path.normcase("A") == "A"
+
+
+def pattern_matches(pattern: str, file_path: pathlib.PurePath) -> bool:
+    """Match a path against a pattern the way the checks always have"""
+    if hasattr(file_path, "full_match"):
+        return file_path.full_match(pattern)
+
+    return fnmatch.fnmatch(str(file_path), pattern)
+
+
+def _uses_full_match(file_path) -> bool:
+    return hasattr(file_path, "full_match")
+
+
+def _extension(segment: str) -> str:
+    index = segment.rfind(".")
+    return segment[index:] if index >= 0 else ""
+
+
+def _has_wildcard(text: str) -> bool:
+    return any(wildcard in text for wildcard in _WILDCARDS)
+
+
+def _literal_prefix(pattern: str) -> str:
+    """The literal text before the first wildcard, which every matching path starts with"""
+    first_wildcard = min(
+        (index for char in _WILDCARDS if (index := pattern.find(char)) != -1),
+        default=len(pattern),
+    )
+    return pattern[:first_wildcard]
+
+
+def _literal_tail(pattern: str) -> str:
+    """The literal text after the last wildcard, which every matching path ends with"""
+    last_wildcard = max(pattern.rfind(char) for char in _WILDCARDS + "]")
+    # full_match lets `**/` match nothing at all, separator included
+    return pattern[last_wildcard + 1 :].lstrip("/")
+
+
+class _Node:
+    __slots__ = ("children", "any_extension", "by_extension")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.any_extension: list = []
+        self.by_extension: dict[str, list] = {}
+
+
+class PatternIndex:
+    """
+    Finds the items whose `pattern` matches a path.
+
+    `items` can be any objects with a `pattern` attribute, usually
+    `PatternRuleset`s. `match` returns them in their original order.
+    """
+
+    def __init__(self, items: typing.Iterable):
+        self.items = list(items)
+        self._trees: dict[bool, _Node] = {}
+        self._prefixes: set[str] | None = None
+
+    def _build(self, full_match: bool) -> _Node:
+        root = _Node()
+
+        for position, item in enumerate(self.items):
+            pattern = item.pattern
+
+            if full_match:
+                pattern = str(pathlib.PurePath(pattern))
+                parts = pathlib.PurePath(pattern).parts
+            else:
+                parts = pattern.split("/")
+
+            node = root
+            tail = ""
+
+            if _CASE_SENSITIVE:
+                tail = _literal_tail(pattern)
+
+                for part in parts[:-1]:
+                    if _has_wildcard(part):
+                        break
+                    node = node.children.setdefault(part, _Node())
+                else:
+                    # A pattern without wildcards is stored under all of its parts
+                    if parts and not _has_wildcard(parts[-1]):
+                        node = node.children.setdefault(parts[-1], _Node())
+
+            entry = (position, tail, item)
+            final_segment = tail.rpartition("/")[2]
+
+            if "." in final_segment:
+                node.by_extension.setdefault(_extension(final_segment), []).append(
+                    entry
+                )
+            else:
+                node.any_extension.append(entry)
+
+        return root
+
+    def prepare(self):
+        """Builds what `match` and `could_match_below` build on first use"""
+        full_match = _uses_full_match(pathlib.PurePath())
+
+        if full_match not in self._trees:
+            self._trees[full_match] = self._build(full_match)
+
+        self.could_match_below(pathlib.PurePath())
+
+    def match(self, file_path: pathlib.PurePath) -> list:
+        """Returns every item with a pattern matching `file_path`"""
+        return [item for _, item in self._match(file_path)]
+
+    def match_positions(self, file_path: pathlib.PurePath) -> list[int]:
+        """Returns the positions in `items` of the items `match` would return"""
+        return [position for position, _ in self._match(file_path)]
+
+    def _match(self, file_path: pathlib.PurePath) -> list[tuple[int, typing.Any]]:
+        full_match = _uses_full_match(file_path)
+
+        if (root := self._trees.get(full_match)) is None:
+            root = self._trees[full_match] = self._build(full_match)
+
+        path_string = str(file_path)
+        parts = file_path.parts if full_match else path_string.split("/")
+        extension = _extension(parts[-1]) if parts else ""
+
+        candidates = []
+        node = root
+
+        for part in (None, *parts):
+            if part is not None:
+                node = node.children.get(part)
+                if node is None:
+                    break
+
+            candidates.extend(node.any_extension)
+            candidates.extend(node.by_extension.get(extension, ()))
+
+        return [
+            (position, item)
+            for position, tail, item in sorted(candidates, key=lambda entry: entry[0])
+            if path_string.endswith(tail) and pattern_matches(item.pattern, file_path)
+        ]
+
+    def could_match_below(self, directory: pathlib.PurePath) -> bool:
+        """Whether any pattern could match a file inside `directory`"""
+        if not _CASE_SENSITIVE:
+            return True
+
+        if self._prefixes is None:
+            # full_match normalizes the pattern as a path first, so keep both forms
+            self._prefixes = {
+                _literal_prefix(pattern)
+                for item in self.items
+                for pattern in (item.pattern, str(pathlib.PurePath(item.pattern)))
+            }
+
+        directory_string = f"{directory}/"
+
+        return any(
+            prefix.startswith(directory_string) or directory_string.startswith(prefix)
+            for prefix in self._prefixes
+        )
@@ -0,0 +1,256 @@
+"""
+Reads only the frontmatter header of a file.
+
+`frontmatter.load` reads the whole file and splits out the body even though only
+the metadata is checked. `read_metadata` stops at the closing delimiter instead,
+using python-frontmatter's handlers (YAML, TOML and JSON) to detect and parse
+the header so the results are the same.
+
+`read_metadata_bytes` does the same on the file's raw bytes. It skips the
+buffered text layer, usually needs a single `read` call, and decodes nothing
+but the header.
+"""
+
+import codecs
+import functools
+import io
+import logging
+import mmap
+import os
+import pathlib
+import re
+import time
+import typing
+
+from . import timings
+
+# The number of characters to scan for a closing delimiter before giving up.
+DEFAULT_MAX_HEADER_SIZE = 1024 * 1024
+# The bytes `read_metadata_bytes` reads before mapping the rest of the file
+FIRST_READ_SIZE = 8 * 1024
+
+DEFAULT_READER = "text"
+READERS = ("text", "bytes")
+
+
+def read_metadata(
+    file_path: pathlib.Path | str,
+    encoding: str = "utf-8",
+    max_header_size: int = DEFAULT_MAX_HEADER_SIZE,
+    handlers: typing.Iterable | None = None,
+) -> dict:
+    """
+    Return the frontmatter metadata of `file_path` without reading its body.
+
+    Returns an empty dictionary when the file has no frontmatter, when the
+    header is never closed, or when the header is larger than `max_header_size`.
+    """
+    with open(file_path, mode="rt", encoding=encoding) as frontmatter_file:
+        return _metadata_from_lines(
+            frontmatter_file, file_path, max_header_size, handlers
+        )
+
+
+def parse_metadata(
+    text: str,
+    max_header_size: int = DEFAULT_MAX_HEADER_SIZE,
+    handlers: typing.Iterable | None = None,
+) -> dict:
+    """Like `read_metadata`, for the text of a file that is already in memory"""
+    # newline=None translates line endings the way reading the file would
+    lines = io.StringIO(text, newline=None)
+    return _metadata_from_lines(lines, "<text>", max_header_size, handlers)
+
+
+def _metadata_from_lines(
+    lines: typing.Iterable[str],
+    name: pathlib.Path | str,
+    max_header_size: int,
+    handlers: typing.Iterable | None,
+) -> dict:
+    # python-frontmatter is slow to import, so it waits until a file is read
+    import frontmatter
+
+    handlers = frontmatter.handlers if handlers is None else handlers
+    lines = iter(lines)
+    scanned = 0
+
+    # python-frontmatter strips the text before looking for a delimiter
+    for line in lines:
+        scanned += len(line)
+        if line.strip() or scanned > max_header_size:
+            break
+    else:
+        return {}
+
+    opening_line = line.strip()
+    handler = frontmatter.detect_format(opening_line, handlers)
+
+    if handler is None:
+        return {}
+
+    header = [opening_line, "\n"]
+
+    for line in lines:
+        scanned += len(line)
+
+        if scanned > max_header_size:
+            logging.debug(
+                "Stopped looking for frontmatter in %s after %d characters"
+                % (name, max_header_size)
+            )
+            return {}
+
+        header.append(line)
+
+        if handler.FM_BOUNDARY.match(line.rstrip("\n")):
+            break
+    else:
+        return {}
+
+    return _load_header(handler, "".join(header))
+
+
+def _load_header(handler, header: str) -> dict:
+    if (file_timings := timings.current) is not None:
+        start = time.perf_counter_ns()
+
+    fm, _ = handler.split(header)
+    metadata = handler.load(fm)
+
+    if file_timings is not None:
+        file_timings.add("parse", time.perf_counter_ns() - start)
+
+    if isinstance(metadata, dict):
+        return metadata
+
+    return {}
+
+
+@functools.cache
+def _bytes_boundary(boundary: re.Pattern) -> re.Pattern:
+    return re.compile(boundary.pattern.encode(), boundary.flags & ~re.UNICODE)
+
+
+class _NeedsText(Exception):
+    """The file has to be read by `read_metadata` to get the same result"""
+
+
+class _NeedsMore(Exception):
+    """The header goes on past the part of the file that was read"""
+
+
+def _find_header(
+    data: bytes | mmap.mmap,
+    max_header_size: int,
+    handlers: typing.Iterable,
+    encoding: str,
+    truncated: bool,
+) -> tuple[typing.Any, str] | None:
+    """
+    The handler and the text of the header in `data`, or None without one.
+
+    `truncated` is True when `data` is only the start of the file.
+    """
+    import frontmatter
+
+    limit = min(len(data), max_header_size)
+    more = truncated and len(data) <= max_header_size
+
+    # Text files read `\r` as a line ending too, which a header can't be found
+    # by here, even when the file has no `\n` at all
+    if data.find(b"\r", 0, limit) >= 0:
+        raise _NeedsText
+
+    # python-frontmatter strips the text before looking for a delimiter
+    start = 0
+
+    while True:
+        newline = data.find(b"\n", start, limit)
+
+        if newline < 0 and more:
+            raise _NeedsMore
+
+        end = limit if newline < 0 else newline + 1
+        opening_line = data[start:end].decode(encoding).strip()
+
+        if opening_line:
+            break
+        if newline < 0:
+            return None
+
+        start = end
+
+    handler = frontmatter.detect_format(opening_line, handlers)
+
+    if handler is None:
+        return None
+
+    boundary = _bytes_boundary(handler.FM_BOUNDARY)
+
+    if (closing := boundary.search(data, end, limit)) is None:
+        if more:
+            raise _NeedsMore
+        return None
+
+    newline = data.find(b"\n", closing.start())
+
+    if newline < 0 and truncated:
+        if more:
+            raise _NeedsMore
+        return None
+
+    closing_end = len(data) if newline < 0 else newline + 1
+
+    # Like `read_metadata`, the whole closing line has to be within the limit
+    if closing_end > limit:
+        return None
+
+    return handler, opening_line + "\n" + data[end:closing_end].decode(encoding)
+
+
+def read_metadata_bytes(
+    file_path: pathlib.Path | str,
+    encoding: str = "utf-8",
+    max_header_size: int = DEFAULT_MAX_HEADER_SIZE,
+    handlers: typing.Iterable | None = None,
+) -> dict:
+    """
+    Like `read_metadata`, but finds the header in the file's bytes.
+
+    The start of the file is read with a single `os.read`. Files with a header
+    longer than that are memory-mapped instead of read into memory.
+
+    `max_header_size` counts bytes rather than characters. Files in encodings
+    other than utf-8 and files with `\r` line endings are read by
+    `read_metadata`, so the results are always the same.
+    """
+    import frontmatter
+
+    handlers = frontmatter.handlers if handlers is None else handlers
+
+    if codecs.lookup(encoding).name != "utf-8":
+        return read_metadata(file_path, encoding, max_header_size, handlers)
+
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, min(size, FIRST_READ_SIZE))
+
+        try:
+            found = _find_header(
+                data, max_header_size, handlers, encoding, len(data) < size
+            )
+        except _NeedsMore:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                found = _find_header(mapped, max_header_size, handlers, encoding, False)
+    except _NeedsText:
+        return read_metadata(file_path, encoding, max_header_size, handlers)
+    finally:
+        os.close(fd)
+
+    if found is None:
+        return {}
+
+    return _load_header(*found)
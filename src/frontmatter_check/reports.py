@@ -0,0 +1,278 @@
+"""
+Machine-readable reports of a run, for CI dashboards and other tools.
+
+`--report FORMAT=PATH` collects every result and writes them once the run is
+over, so writing a report costs a single buffered write however many files
+were checked. The formats are:
+
+- `json`: a summary and every checked file with its failures
+- `jsonl`: one line per checked file, with the same fields as `json`
+- `sarif`: SARIF 2.1.0, one result per failure
+- `junit`: JUnit XML, one test case per checked file. ERROR failures fail it
+  and other failures are in its output
+
+`json` reports can be read back with `ResultReport.add_json`, which is how
+`frontmatter-check merge` combines the reports of a sharded run.
+"""
+
+import json
+import logging
+import pathlib
+import typing
+
+from .pattern_check import ValidationResult
+from .rule_validations import RuleFailure
+
+FORMATS = ("json", "jsonl", "sarif", "junit")
+REPORT_VERSION = 1
+
+_TOOL_NAME = "frontmatter-check"
+_TOOL_URI = "https://github.com/kjaymiller/frontmatter-check"
+# The SARIF rules, keyed by `RuleFailure.kind` and the other ways a file fails
+_SARIF_RULES = {
+    "missing": "A required field is missing",
+    "null": "A required field is null",
+    "invalid_type": "A field has the wrong type",
+    "invalid_value": "A field has a value its rule doesn't allow",
+    "no_frontmatter": "The file has no frontmatter",
+    "error": "The file could not be checked",
+}
+_SARIF_LEVELS = {logging.ERROR: "error", logging.WARNING: "warning"}
+
+
+def parse_report_option(value: str) -> tuple[str, pathlib.Path]:
+    """Splits a `FORMAT=PATH` value of `--report`"""
+    report_format, separator, path = value.partition("=")
+
+    if not separator or not path or report_format not in FORMATS:
+        raise ValueError(
+            f"Expected --report FORMAT=PATH with a format of {', '.join(FORMATS)},"
+            f" got {value!r}"
+        )
+
+    return report_format, pathlib.Path(path)
+
+
+def _level_name(level: int) -> str:
+    return logging.getLevelName(level).lower()
+
+
+def _file_entry(result: ValidationResult) -> dict:
+    return {
+        "path": result.path.as_posix(),
+        "validates": result.validates and result.error is None,
+        "has_frontmatter": result.has_frontmatter,
+        "error": result.error,
+        "failures": [
+            {
+                "field_name": failure.field_name,
+                "kind": failure.kind,
+                "level": _level_name(failure.level),
+                "message": failure.message,
+                "ruleset": failure.ruleset,
+            }
+            for failure in result.failures
+        ],
+    }
+
+
+def _result_from_entry(entry: dict) -> ValidationResult:
+    return ValidationResult(
+        path=pathlib.Path(entry["path"]),
+        failures=[
+            RuleFailure(
+                field_name=failure["field_name"],
+                kind=failure["kind"],
+                level=logging.getLevelName(failure["level"].upper()),
+                message=failure["message"],
+                ruleset=failure["ruleset"],
+            )
+            for failure in entry["failures"]
+        ],
+        has_frontmatter=entry["has_frontmatter"],
+        error=entry["error"],
+    )
+
+
+class ResultReport:
+    """The results of every file checked in a run"""
+
+    def __init__(self):
+        self.results: list[ValidationResult] = []
+        self.skipped = 0
+
+    def add(self, result: ValidationResult):
+        if result.skipped:
+            self.skipped += 1
+        else:
+            self.results.append(result)
+
+    def add_json(self, text: str):
+        """
+        Adds the results of a `json` report, like one written by each shard of
+        a run.
+
+        Raises a ValueError when `text` isn't a report of this version or it
+        has a file that is already in this report.
+        """
+        report = json.loads(text)
+
+        if not isinstance(report, dict) or report.get("version") != REPORT_VERSION:
+            raise ValueError(f"Expected a version {REPORT_VERSION} json report")
+
+        checked = {result.path for result in self.results}
+
+        try:
+            results = [_result_from_entry(entry) for entry in report["files"]]
+            skipped = report["summary"]["skipped"]
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Malformed json report: {e!r}")
+
+        for result in results:
+            if result.path in checked:
+                raise ValueError(f"{result.path} was checked in more than one report")
+            checked.add(result.path)
+
+        self.results.extend(results)
+        self.skipped += skipped
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "checked": len(self.results),
+            "failed": sum(not result.validates for result in self.results),
+            "errors": sum(result.error is not None for result in self.results),
+            "skipped": self.skipped,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": REPORT_VERSION,
+                "summary": self.summary(),
+                "files": [_file_entry(result) for result in self.results],
+            },
+            indent=2,
+        )
+
+    def to_jsonl(self) -> str:
+        return "".join(
+            json.dumps(_file_entry(result)) + "\n" for result in self.results
+        )
+
+    def to_sarif(self) -> str:
+        sarif_results = []
+
+        for result in self.results:
+            location = [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": {"uri": result.path.as_posix()}
+                    }
+                }
+            ]
+            problems = [
+                (failure.kind, failure.level, failure.message)
+                for failure in result.failures
+            ]
+
+            if not result.has_frontmatter:
+                problems.append(
+                    (
+                        "no_frontmatter",
+                        logging.WARNING,
+                        f"No Frontmatter Found for {result.path}",
+                    )
+                )
+            if result.error is not None:
+                problems.append(("error", logging.ERROR, result.error))
+
+            sarif_results.extend(
+                {
+                    "ruleId": kind,
+                    "level": _SARIF_LEVELS.get(level, "note"),
+                    "message": {"text": message},
+                    "locations": location,
+                }
+                for kind, level, message in problems
+            )
+
+        return json.dumps(
+            {
+                "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+                "version": "2.1.0",
+                "runs": [
+                    {
+                        "tool": {
+                            "driver": {
+                                "name": _TOOL_NAME,
+                                "informationUri": _TOOL_URI,
+                                "rules": [
+                                    {"id": rule_id, "shortDescription": {"text": text}}
+                                    for rule_id, text in _SARIF_RULES.items()
+                                ],
+                            }
+                        },
+                        "results": sarif_results,
+                    }
+                ],
+            },
+            indent=2,
+        )
+
+    def to_junit(self) -> str:
+        import xml.etree.ElementTree as ElementTree
+
+        summary = self.summary()
+        testsuites = ElementTree.Element("testsuites")
+        testsuite = ElementTree.SubElement(
+            testsuites,
+            "testsuite",
+            name=_TOOL_NAME,
+            tests=str(summary["checked"]),
+            failures=str(summary["failed"]),
+            errors=str(summary["errors"]),
+            skipped="0",
+        )
+
+        for result in self.results:
+            testcase = ElementTree.SubElement(
+                testsuite, "testcase", classname=_TOOL_NAME, name=result.path.as_posix()
+            )
+
+            if result.error is not None:
+                ElementTree.SubElement(testcase, "error", message=result.error)
+                continue
+
+            errors = [f for f in result.failures if f.level == logging.ERROR]
+            others = [f for f in result.failures if f.level != logging.ERROR]
+
+            if errors:
+                failure = ElementTree.SubElement(
+                    testcase, "failure", message=errors[0].message, type=errors[0].kind
+                )
+                failure.text = "\n".join(f.message for f in errors)
+
+            if others or not result.has_frontmatter:
+                output = ElementTree.SubElement(testcase, "system-out")
+                lines = [
+                    f"{_level_name(f.level).upper()} - {f.message}" for f in others
+                ]
+
+                if not result.has_frontmatter:
+                    lines.append(f"WARNING - No Frontmatter Found for {result.path}")
+
+                output.text = "\n".join(lines)
+
+        ElementTree.indent(testsuites)
+        return '<?xml version="1.0" encoding="utf-8"?>\n' + ElementTree.tostring(
+            testsuites, encoding="unicode"
+        )
+
+    def write(self, report_format: str, path: pathlib.Path):
+        writers: dict[str, typing.Callable[[], str]] = {
+            "json": self.to_json,
+            "jsonl": self.to_jsonl,
+            "sarif": self.to_sarif,
+            "junit": self.to_junit,
+        }
+        path.write_text(writers[report_format](), encoding="utf-8")
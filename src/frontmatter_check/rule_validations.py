@@ -5,16 +5,221 @@ The FrontmatterValidator is the object responsible for checking a passed in fron
 import logging
 import dataclasses
 import datetime
+import functools
+import itertools
+import operator
+import re
+import time
+import typing
 from typing import Any
 
-from .logger import logger, memory_handler
+from .logger import logger
 
 _frontmatter_metadata = dict[str, Any]
 
+_TYPE_MAP = {
+    "str": str,
+    "int": int,
+    "bool": bool,
+    "list": list,
+    "dict": dict,
+    "datetime": (datetime.date, datetime.datetime),
+}
 
-@dataclasses.dataclass
+_MISSING = object()
+
+
+def _casefold_keys(frontmatter_metadata: _frontmatter_metadata) -> dict:
+    return {
+        key.casefold() if isinstance(key, str) else key: value
+        for key, value in frontmatter_metadata.items()
+    }
+
+
+# A dotted part of a field path, like `authors[0]` in `authors[0].name`
+_PATH_PART = re.compile(r"([^.\[\]]+)((?:\[-?[0-9]+\])*)")
+_PATH_INDEX = re.compile(r"\[(-?[0-9]+)\]")
+
+
+@functools.cache
+def parse_field_path(field_name: str) -> tuple[str | int, ...] | None:
+    """
+    The keys and list indexes of a nested field name like `seo.description`
+    or `authors[0].name`, or None when `field_name` is a plain key
+    """
+    if "." not in field_name and "[" not in field_name:
+        return None
+
+    path = []
+
+    for part in field_name.split("."):
+        if not (match := _PATH_PART.fullmatch(part)):
+            return None
+
+        path.append(match[1])
+        path.extend(int(index) for index in _PATH_INDEX.findall(match[2]))
+
+    return tuple(path)
+
+
+def _step(container: Any, segment: str | int, casefold: bool) -> Any:
+    """The value at `segment` of a mapping or list, or `_MISSING`"""
+    if isinstance(container, dict):
+        if casefold and isinstance(segment, str):
+            container = _casefold_keys(container)
+        return container.get(segment, _MISSING)
+
+    if (
+        isinstance(segment, int)
+        and isinstance(container, list)
+        and -len(container) <= segment < len(container)
+    ):
+        return container[segment]
+
+    return _MISSING
+
+
+def _parse_bound(bound: Any, field_name: str) -> Any:
+    """A `minimum` or `maximum` as a number or date, parsing ISO dates"""
+    if bound is None or (
+        isinstance(bound, (int, float, datetime.date)) and not isinstance(bound, bool)
+    ):
+        return bound
+
+    if isinstance(bound, str):
+        try:
+            if len(bound) == 10:
+                return datetime.date.fromisoformat(bound)
+            return datetime.datetime.fromisoformat(bound)
+        except ValueError:
+            pass
+
+    raise ValueError(
+        f"The bounds of {field_name} must be numbers or ISO dates, got {bound!r}"
+    )
+
+
+def _comparable(value: Any, bound: Any) -> tuple[Any, Any]:
+    """
+    `value` and `bound` as dates when one is a date and the other a datetime,
+    which don't compare
+    """
+    if (
+        isinstance(value, datetime.date)
+        and isinstance(bound, datetime.date)
+        and isinstance(value, datetime.datetime) != isinstance(bound, datetime.datetime)
+    ):
+        return (
+            value.date() if isinstance(value, datetime.datetime) else value,
+            bound.date() if isinstance(bound, datetime.datetime) else bound,
+        )
+
+    return value, bound
+
+
+def _is_in_range(value: Any, minimum: Any, maximum: Any) -> bool:
+    """Whether `value` is within the bounds that are set, including them"""
+    if isinstance(value, bool):
+        return False
+
+    try:
+        if minimum is not None:
+            value_at, bound = _comparable(value, minimum)
+            if value_at < bound:
+                return False
+        if maximum is not None:
+            value_at, bound = _comparable(value, maximum)
+            if value_at > bound:
+                return False
+    except TypeError:
+        return False
+
+    return True
+
+
+class _EnumMembers(frozenset):
+    """
+    The allowed values of an enum, stored with whether each one is a bool.
+
+    True == 1, so a plain frozenset would let `true` through an enum of `[1]`
+    and keep only one of `[1, true]`.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, values: typing.Iterable) -> "_EnumMembers":
+        return cls((type(value) is bool, value) for value in values)
+
+    def __contains__(self, value: Any) -> bool:
+        return super().__contains__((type(value) is bool, value))
+
+    def values(self) -> list:
+        return [value for _, value in self]
+
+
+def _is_one_of(value: Any, enum: _EnumMembers) -> bool:
+    try:
+        return value in enum
+    except TypeError:
+        # Lists and mappings can't be in a frozenset
+        return False
+
+
+def _has_length(value: Any, minimum: int | None, maximum: int | None) -> bool:
+    try:
+        length = len(value)
+    except TypeError:
+        return False
+
+    return (minimum is None or length >= minimum) and (
+        maximum is None or length <= maximum
+    )
+
+
+class _PathNode:
+    """A node of the tree of field paths a `CompiledRuleset` looks up"""
+
+    __slots__ = ("children", "slots")
+
+    def __init__(self):
+        # Keyed by (segment, casefold), so case sensitive paths get their own branch
+        self.children: dict[tuple[str | int, bool], _PathNode] = {}
+        # The indexes of the paths that end here, in the looked up values
+        self.slots: list[int] = []
+
+    def walk(self, container: Any, casefolded: dict | None, values: list):
+        """
+        Sets the value of every path below this node in `values`, looking up
+        each shared prefix once. `casefolded` is `container` with casefolded
+        keys, when it is already known.
+        """
+        for (segment, casefold), child in self.children.items():
+            if isinstance(container, dict):
+                if casefold:
+                    if casefolded is None:
+                        casefolded = _casefold_keys(container)
+                    value = casefolded.get(segment, _MISSING)
+                else:
+                    value = container.get(segment, _MISSING)
+            else:
+                value = _step(container, segment, casefold)
+
+            for slot in child.slots:
+                values[slot] = value
+
+            if child.children and isinstance(value, (dict, list)):
+                child.walk(value, None, values)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class ValidationRule:
-    """A Single Validation Rule Configuration"""
+    """
+    A Single Validation Rule Configuration
+
+    Rules are frozen, so a `CompiledRuleset` stays valid for as long as its
+    rules are the same objects. Use `dataclasses.replace` to change one.
+    """
 
     field_name: str
     case_sensitivity: bool = False
@@ -24,6 +229,56 @@ class ValidationRule:
     missing_field_logging_level: int = logging.ERROR
     null_value_logging_level: int = logging.ERROR
     invalid_type_logging_level: int = logging.ERROR
+    # Constraints on a value that isn't null and has the right type. They are
+    # compiled when the rule is made: the regex, the allowed values as
+    # `_EnumMembers` and the bounds parsed into numbers or dates
+    regex: str | re.Pattern | None = None
+    enum: typing.Collection | None = None
+    minimum: Any = None
+    maximum: Any = None
+    min_length: int | None = None
+    max_length: int | None = None
+    invalid_value_logging_level: int = logging.ERROR
+
+    def __post_init__(self):
+        if isinstance(self.regex, str):
+            try:
+                object.__setattr__(self, "regex", re.compile(self.regex))
+            except re.error as e:
+                raise ValueError(f"Invalid regex for {self.field_name}: {e}")
+        elif self.regex is not None and not isinstance(self.regex, re.Pattern):
+            raise ValueError(f"The regex of {self.field_name} must be a string")
+
+        if isinstance(self.enum, str):
+            raise ValueError(f"The enum of {self.field_name} must be a list of values")
+        if self.enum is not None and not isinstance(self.enum, _EnumMembers):
+            try:
+                object.__setattr__(self, "enum", _EnumMembers.of(self.enum))
+            except TypeError:
+                raise ValueError(
+                    f"The enum of {self.field_name} can't have lists or mappings"
+                )
+
+        for bound in ("minimum", "maximum"):
+            object.__setattr__(
+                self, bound, _parse_bound(getattr(self, bound), self.field_name)
+            )
+
+        for bound in ("min_length", "max_length"):
+            length = getattr(self, bound)
+            # bool is an int, but `max_length: true` is a mistake in the config
+            if length is not None and (
+                isinstance(length, bool) or not isinstance(length, int) or length < 0
+            ):
+                raise ValueError(
+                    f"The {bound} of {self.field_name} must be a whole number "
+                    "of 0 or more"
+                )
+
+    def __reduce__(self):
+        # Unpickles through __init__, which is several times faster than the
+        # dataclass default for frozen, slotted classes
+        return (type(self), tuple(getattr(self, name) for name in self.__slots__))
 
     @property
     def _checkable_field_name(self):
@@ -31,21 +286,36 @@ class ValidationRule:
             return self.field_name.casefold()
         return self.field_name
 
+    @property
+    def _path(self) -> tuple[str | int, ...] | None:
+        """The keys and indexes of a nested field name, see `parse_field_path`"""
+        return parse_field_path(self._checkable_field_name)
+
     def _checkable_metadata(self, frontmatter_metadata: dict) -> dict:
         if not self.case_sensitivity:
-            return {
-                x.casefold(): y
-                for x, y in frontmatter_metadata.items()
-                if not self.case_sensitivity
-            }
+            return _casefold_keys(frontmatter_metadata)
         return frontmatter_metadata
 
+    def _value(self, frontmatter_metadata: dict) -> Any:
+        """
+        The value of the field, or `_MISSING`. A key with the whole field name
+        wins over a nested field, so `seo.title` can still be a plain key.
+        """
+        metadata = self._checkable_metadata(frontmatter_metadata)
+        value = metadata.get(self._checkable_field_name, _MISSING)
+
+        if value is _MISSING and (path := self._path) is not None:
+            value = metadata.get(path[0], _MISSING)
+
+            for segment in path[1:]:
+                value = _step(value, segment, not self.case_sensitivity)
+
+        return value
+
     def has_field(self, frontmatter_metadata: _frontmatter_metadata):
         """Checks that the frontmatter_matadata has the field"""
 
-        if self._checkable_field_name not in self._checkable_metadata(
-            frontmatter_metadata
-        ):
+        if self._value(frontmatter_metadata) is _MISSING:
             fail_message = f"Missing field: '{self.field_name}'"
             logger.log(
                 self.missing_field_logging_level,
@@ -58,12 +328,9 @@ class ValidationRule:
     def null_value(self, frontmatter_metadata: _frontmatter_metadata):
         """Checks that field value is not None"""
 
-        if (
-            self._checkable_metadata(frontmatter_metadata).get(
-                self._checkable_field_name
-            )
-            is None
-        ):
+        value = self._value(frontmatter_metadata)
+
+        if value is None or value is _MISSING:
             fail_message = f"{self.field_name} Value is 'Null'"
             logger.log(self.null_value_logging_level, fail_message)
             return False
@@ -76,23 +343,12 @@ class ValidationRule:
         if not self.type:
             return True
 
-        value = self._checkable_metadata(frontmatter_metadata).get(
-            self._checkable_field_name
-        )
+        value = self._value(frontmatter_metadata)
 
-        if value is None:
+        if value is None or value is _MISSING:
             return True
 
-        type_map = {
-            "str": str,
-            "int": int,
-            "bool": bool,
-            "list": list,
-            "dict": dict,
-            "datetime": (datetime.date, datetime.datetime),
-        }
-
-        expected_type = type_map.get(self.type.lower())
+        expected_type = _TYPE_MAP.get(self.type.lower())
 
         if expected_type and not isinstance(value, expected_type):
             fail_message = f"{self.field_name} Value is not of type '{self.type}'"
@@ -101,32 +357,472 @@ class ValidationRule:
 
         return True
 
+    def _value_check(self) -> typing.Callable[[Any], bool] | None:
+        """
+        A function that says whether a value meets the constraints of the
+        rule, or None when it has none
+        """
+        checks = []
+
+        if self.regex is not None:
+            search = self.regex.search
+            checks.append(
+                lambda value: isinstance(value, str) and search(value) is not None
+            )
+        if self.enum is not None:
+            checks.append(functools.partial(_is_one_of, enum=self.enum))
+        if self.minimum is not None or self.maximum is not None:
+            checks.append(
+                functools.partial(
+                    _is_in_range, minimum=self.minimum, maximum=self.maximum
+                )
+            )
+        if self.min_length is not None or self.max_length is not None:
+            checks.append(
+                functools.partial(
+                    _has_length, minimum=self.min_length, maximum=self.max_length
+                )
+            )
+
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda value: all(check(value) for check in checks)
+
+    def _constraint_text(self) -> str:
+        """What the constraints of the rule ask of a value"""
+        parts = []
+
+        if self.regex is not None:
+            parts.append(f"match {self.regex.pattern!r}")
+        if self.enum is not None:
+            parts.append(
+                f"be one of {', '.join(sorted(map(repr, self.enum.values())))}"
+            )
+        if self.minimum is not None:
+            parts.append(f"be at least {self.minimum}")
+        if self.maximum is not None:
+            parts.append(f"be at most {self.maximum}")
+        if self.min_length is not None:
+            parts.append(f"have a length of at least {self.min_length}")
+        if self.max_length is not None:
+            parts.append(f"have a length of at most {self.max_length}")
+
+        return " and ".join(parts)
+
+    def validate_value(self, frontmatter_metadata: _frontmatter_metadata):
+        """Checks that the field value meets the constraints of the rule"""
+
+        if (value_check := self._value_check()) is None:
+            return True
+
+        value = self._value(frontmatter_metadata)
+
+        if value is None or value is _MISSING:
+            return True
+
+        if not value_check(value):
+            fail_message = f"{self.field_name} Value must {self._constraint_text()}"
+            logger.log(self.invalid_value_logging_level, fail_message)
+            return False
+
+        return True
+
     def check(self, frontmatter_metadata: _frontmatter_metadata):
         if not self.has_field(frontmatter_metadata):
             return
-        if self.null_value(frontmatter_metadata):
-            self.validate_type(frontmatter_metadata)
+        if self.null_value(frontmatter_metadata) and self.validate_type(
+            frontmatter_metadata
+        ):
+            self.validate_value(frontmatter_metadata)
 
 
 rules = list[ValidationRule]
 
 
-@dataclasses.dataclass
+# The `RuleFailure.kind`s, in the order `Diagnostic.kind` numbers them
+FAILURE_KINDS = ("missing", "null", "invalid_type", "invalid_value")
+
+
+class RuleFailure(typing.NamedTuple):
+    """
+    A single failed check of a `ValidationRule`
+
+    A `CompiledRuleset` builds the failures of each rule once, so every file
+    that fails a rule the same way shares the same `RuleFailure`.
+    """
+
+    field_name: str
+    # one of `FAILURE_KINDS`
+    kind: str
+    level: int
+    message: str
+    # the name of the `PatternRuleset` the rule belongs to, when there is one
+    ruleset: str | None = None
+
+
+class Diagnostic(typing.NamedTuple):
+    """A `RuleFailure` as small ints, for keeping or sending many of them"""
+
+    # The index of the file among the files it is kept with
+    file_id: int
+    # The index of the rule in `FrontmatterPatternMatchCheck.rule_failures`
+    rule_index: int
+    # The index of the failure's kind in `FAILURE_KINDS`
+    kind: int
+
+
+class CompiledRuleset:
+    """
+    A list of `ValidationRule`s prepared for checking many files.
+
+    Field names are casefolded and types are resolved once, so checking a file
+    only needs one pass over its metadata and a single lookup per rule. Nested
+    field paths are looked up in one walk of the metadata, see `_PathNode`.
+    """
+
+    def __init__(self, rules: rules, ruleset: str | None = None):
+        self.rules = list(rules)
+        self.ruleset = ruleset
+        self._casefold = any(not rule.case_sensitivity for rule in self.rules)
+        # The (missing, null, invalid_type, invalid_value) failures of each
+        # rule, built once and shared between files
+        value_checks = [rule._value_check() for rule in self.rules]
+        self.failures = [
+            (
+                RuleFailure(
+                    rule.field_name,
+                    "missing",
+                    rule.missing_field_logging_level,
+                    f"Missing field: '{rule.field_name}'",
+                    ruleset,
+                ),
+                RuleFailure(
+                    rule.field_name,
+                    "null",
+                    rule.null_value_logging_level,
+                    f"{rule.field_name} Value is 'Null'",
+                    ruleset,
+                ),
+                RuleFailure(
+                    rule.field_name,
+                    "invalid_type",
+                    rule.invalid_type_logging_level,
+                    f"{rule.field_name} Value is not of type '{rule.type}'",
+                    ruleset,
+                ),
+                RuleFailure(
+                    rule.field_name,
+                    "invalid_value",
+                    rule.invalid_value_logging_level,
+                    f"{rule.field_name} Value must {rule._constraint_text()}"
+                    if value_check is not None
+                    else f"{rule.field_name} Value is not allowed",
+                    ruleset,
+                ),
+            )
+            for rule, value_check in zip(self.rules, value_checks)
+        ]
+        # The nested field paths of every rule share a tree, so a file's
+        # metadata is walked once however many rules look inside it
+        self._paths: _PathNode | None = None
+        self._path_count = 0
+        path_slots = []
+
+        for rule in self.rules:
+            if (path := rule._path) is None:
+                path_slots.append(None)
+                continue
+
+            if self._paths is None:
+                self._paths = _PathNode()
+
+            node = self._paths
+            for segment in path:
+                key = segment, isinstance(segment, str) and not rule.case_sensitivity
+                node = node.children.setdefault(key, _PathNode())
+
+            node.slots.append(self._path_count)
+            path_slots.append(self._path_count)
+            self._path_count += 1
+
+        self._checks = [
+            (
+                rule._checkable_field_name,
+                not rule.case_sensitivity,
+                _TYPE_MAP.get(rule.type.lower()) if rule.type else None,
+                value_check,
+                rule_failures,
+                path_slot,
+            )
+            for rule, value_check, rule_failures, path_slot in zip(
+                self.rules, value_checks, self.failures, path_slots
+            )
+        ]
+
+    def is_compiled_from(self, rules: rules, ruleset: str | None = None) -> bool:
+        """Whether this was compiled from the same rule objects, which can't change"""
+        return (
+            ruleset == self.ruleset
+            and len(rules) == len(self.rules)
+            and all(map(operator.is_, rules, self.rules))
+        )
+
+    def _path_values(
+        self, frontmatter_metadata: _frontmatter_metadata, casefolded: dict | None
+    ) -> list | None:
+        """The value of each nested field path, or `_MISSING`"""
+        if self._paths is None:
+            return None
+
+        values = [_MISSING] * self._path_count
+        self._paths.walk(frontmatter_metadata, casefolded, values)
+        return values
+
+    def evaluate(
+        self, frontmatter_metadata: _frontmatter_metadata, stop_at_error: bool = False
+    ) -> list[RuleFailure]:
+        """
+        Returns the failed checks without logging them.
+
+        With `stop_at_error` the rules after the first ERROR failure are not
+        checked, since the file fails either way.
+        """
+        failures = []
+        casefolded_metadata = (
+            _casefold_keys(frontmatter_metadata) if self._casefold else None
+        )
+
+        path_values = self._path_values(frontmatter_metadata, casefolded_metadata)
+
+        for (
+            field_name,
+            casefold,
+            expected_type,
+            value_check,
+            rule_failures,
+            path_slot,
+        ) in self._checks:
+            metadata = casefolded_metadata if casefold else frontmatter_metadata
+            value = metadata.get(field_name, _MISSING)
+
+            if value is _MISSING and path_slot is not None:
+                value = path_values[path_slot]
+
+            if value is _MISSING:
+                failure = rule_failures[0]
+            elif value is None:
+                failure = rule_failures[1]
+            elif expected_type and not isinstance(value, expected_type):
+                failure = rule_failures[2]
+            elif value_check is not None and not value_check(value):
+                failure = rule_failures[3]
+            else:
+                continue
+
+            failures.append(failure)
+
+            if stop_at_error and failure.level == logging.ERROR:
+                break
+
+        return failures
+
+    def evaluate_timed(
+        self,
+        frontmatter_metadata: _frontmatter_metadata,
+        rule_timings: dict,
+        stop_at_error: bool = False,
+    ) -> list[RuleFailure]:
+        """Like `evaluate`, adding the nanoseconds each rule took to `rule_timings`"""
+        failures = []
+        casefolded_metadata = (
+            _casefold_keys(frontmatter_metadata) if self._casefold else None
+        )
+
+        path_values = self._path_values(frontmatter_metadata, casefolded_metadata)
+
+        for rule, check in zip(self.rules, self._checks):
+            (
+                field_name,
+                casefold,
+                expected_type,
+                value_check,
+                rule_failures,
+                path_slot,
+            ) = check
+            start = time.perf_counter_ns()
+            metadata = casefolded_metadata if casefold else frontmatter_metadata
+            value = metadata.get(field_name, _MISSING)
+
+            if value is _MISSING and path_slot is not None:
+                value = path_values[path_slot]
+
+            if value is _MISSING:
+                failure = rule_failures[0]
+            elif value is None:
+                failure = rule_failures[1]
+            elif expected_type and not isinstance(value, expected_type):
+                failure = rule_failures[2]
+            elif value_check is not None and not value_check(value):
+                failure = rule_failures[3]
+            else:
+                failure = None
+
+            if failure is not None:
+                failures.append(failure)
+
+            rule_timings[rule.field_name] = (
+                rule_timings.get(rule.field_name, 0) + time.perf_counter_ns() - start
+            )
+
+            if stop_at_error and failure is not None and failure.level == logging.ERROR:
+                break
+
+        return failures
+
+    def evaluate_columns(
+        self,
+        documents: typing.Sequence[_frontmatter_metadata],
+        casefolded: typing.Sequence[dict] | None = None,
+    ) -> list[tuple[list[int], list[int], list[int], list[int]]]:
+        """
+        Checks the metadata of many documents one rule at a time.
+
+        Returns, for each rule, the indexes of the documents missing its field,
+        with a null value, with a value of the wrong type and with a value that
+        doesn't meet its constraints. `casefolded` can pass in the documents
+        with casefolded keys when they are already known.
+        """
+        if self._casefold and casefolded is None:
+            casefolded = [_casefold_keys(metadata) for metadata in documents]
+
+        columns = []
+        # Looked up the first time a rule has a nested field path
+        path_values = None
+
+        for (
+            field_name,
+            casefold,
+            expected_type,
+            value_check,
+            _,
+            path_slot,
+        ) in self._checks:
+            values = list(
+                map(
+                    dict.get,
+                    casefolded if casefold else documents,
+                    itertools.repeat(field_name),
+                    itertools.repeat(_MISSING),
+                )
+            )
+
+            if path_slot is not None:
+                if path_values is None:
+                    path_values = list(
+                        map(
+                            self._path_values,
+                            documents,
+                            casefolded or itertools.repeat(None),
+                        )
+                    )
+
+                values = [
+                    path_values[i][path_slot] if value is _MISSING else value
+                    for i, value in enumerate(values)
+                ]
+
+            missing = list(
+                itertools.compress(
+                    itertools.count(),
+                    map(operator.is_, values, itertools.repeat(_MISSING)),
+                )
+            )
+            null = list(
+                itertools.compress(
+                    itertools.count(), map(operator.is_, values, itertools.repeat(None))
+                )
+            )
+            invalid_type = []
+
+            if expected_type:
+                wrong_type = itertools.compress(
+                    itertools.count(),
+                    map(
+                        operator.not_,
+                        map(isinstance, values, itertools.repeat(expected_type)),
+                    ),
+                )
+                invalid_type = [
+                    i
+                    for i in wrong_type
+                    if values[i] is not None and values[i] is not _MISSING
+                ]
+
+            invalid_value = []
+
+            if value_check is not None:
+                invalid_value = [
+                    i
+                    for i, value in enumerate(values)
+                    if value is not None
+                    and value is not _MISSING
+                    and (not expected_type or isinstance(value, expected_type))
+                    and not value_check(value)
+                ]
+
+            columns.append((missing, null, invalid_type, invalid_value))
+
+        return columns
+
+    def validates(self, frontmatter_metadata: _frontmatter_metadata) -> bool:
+        """Checks every rule, logging failures. Returns False if any failure is an ERROR"""
+        _validates = True
+
+        for failure in self.evaluate(frontmatter_metadata):
+            logger.log(failure.level, failure.message)
+            if failure.level == logging.ERROR:
+                _validates = False
+
+        return _validates
+
+
+@dataclasses.dataclass(slots=True)
 class RulesetValidator:
     """Base object for the validator"""
 
     rules: rules
+    _compiled: CompiledRuleset | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-    def validates(self, frontmatter_metadata: _frontmatter_metadata) -> bool:
-        """Iterates through the rules checking a frontmatter post for each value"""
-        # clear the memory_handler buffer
+    def compile(self, ruleset: str | None = None) -> CompiledRuleset:
+        """
+        Returns the `CompiledRuleset` for the current rules, with `ruleset` as
+        the name in their failures
+        """
+        if self._compiled is None or not self._compiled.is_compiled_from(
+            self.rules, ruleset
+        ):
+            self._compiled = CompiledRuleset(self.rules, ruleset)
 
-        for rule in self.rules:
-            rule.check(frontmatter_metadata)
+        return self._compiled
 
-        errors = [
-            record
-            for record in memory_handler.buffer
-            if record.levelno == logging.ERROR
-        ]
-        return not errors
+    def evaluate(
+        self, frontmatter_metadata: _frontmatter_metadata, stop_at_error: bool = False
+    ) -> list[RuleFailure]:
+        """Returns the failed checks without logging them"""
+        return self.compile().evaluate(frontmatter_metadata, stop_at_error)
+
+    def evaluate_columns(
+        self,
+        documents: typing.Sequence[_frontmatter_metadata],
+        casefolded: typing.Sequence[dict] | None = None,
+    ) -> list[tuple[list[int], list[int], list[int], list[int]]]:
+        """Checks many documents one rule at a time, see `CompiledRuleset.evaluate_columns`"""
+        return self.compile().evaluate_columns(documents, casefolded)
+
+    def validates(self, frontmatter_metadata: _frontmatter_metadata) -> bool:
+        """Iterates through the rules checking a frontmatter post for each value"""
+        return self.compile().validates(frontmatter_metadata)
@@ -0,0 +1,211 @@
+"""
+A long-running server that keeps the config loaded between checks.
+
+`frontmatter-check serve` listens on a Unix socket in the cache directory and
+checks files for the `check` command (see `client.py`), so editors and
+pre-commit hooks don't pay for parsing the config on every run.
+"""
+
+import json
+import os
+import pathlib
+import signal
+import socket
+import socketserver
+import sys
+import typing
+
+from .client import PROTOCOL_VERSION
+from .logger import logger
+from .parallel import check_file
+from .pattern_check import FrontmatterPatternMatchCheck, ValidationResult
+from .shards import select_shard
+from .walker import select_files
+
+
+def _encode_result(result: ValidationResult) -> dict:
+    return {
+        "path": str(result.path),
+        "failures": result.failures,
+        "has_frontmatter": result.has_frontmatter,
+        "skipped": result.skipped,
+        "error": result.error,
+    }
+
+
+class _MemoryCache:
+    """
+    Results of unchanged files, kept in memory until the config changes.
+
+    Entries are keyed by the path as given. A server only checks files for its
+    own working directory, so that path fixes the rulesets that match.
+    """
+
+    def __init__(self):
+        self.entries: dict[pathlib.Path, tuple[int, int, ValidationResult]] = {}
+
+    def get(
+        self, target_file: pathlib.Path, rulesets: typing.Sequence[int] = ()
+    ) -> ValidationResult | None:
+        if (entry := self.entries.get(target_file)) is None:
+            return None
+
+        try:
+            stat = os.stat(target_file)
+        except OSError:
+            return None
+
+        if (stat.st_mtime_ns, stat.st_size) != entry[:2]:
+            return None
+
+        return entry[2]
+
+    def put(
+        self,
+        result: ValidationResult,
+        stat: os.stat_result,
+        rulesets: typing.Sequence[int] = (),
+    ):
+        self.entries[result.path] = (stat.st_mtime_ns, stat.st_size, result)
+
+
+class CheckServer:
+    """Checks files for clients, reloading the config when it changes"""
+
+    def __init__(self, config_file: pathlib.Path):
+        self.config_file = pathlib.Path(config_file).resolve()
+        self.cwd = os.getcwd()
+        self._config_stat = None
+        self.pattern_check: FrontmatterPatternMatchCheck | None = None
+        self.cache = _MemoryCache()
+
+    def reload(self):
+        """Loads the config again if it changed since it was last loaded"""
+        stat = os.stat(self.config_file)
+        config_stat = (stat.st_mtime_ns, stat.st_size)
+
+        if config_stat == self._config_stat:
+            return
+
+        self.pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(
+            self.config_file
+        )
+        self.cache = _MemoryCache()
+        self._config_stat = config_stat
+        logger.info("Loaded %s", self.config_file)
+
+    def _refusal(self, request: dict) -> str | None:
+        if request.get("version") != PROTOCOL_VERSION:
+            return "unsupported protocol version"
+        if request.get("cwd") != self.cwd:
+            return f"the server runs in {self.cwd}"
+        if request.get("config_file") != str(self.config_file):
+            return f"the server checks {self.config_file}"
+
+        try:
+            self.reload()
+        except (OSError, ValueError, KeyError) as e:
+            return f"could not load the config: {e}"
+
+        return None
+
+    def handle(self, request: dict, output: typing.BinaryIO):
+        def send(message: dict):
+            output.write(json.dumps(message).encode() + b"\n")
+
+        if (reason := self._refusal(request)) is not None:
+            send({"ok": False, "reason": reason})
+            return
+
+        try:
+            files_to_check = select_files(
+                [pathlib.Path(target) for target in request["targets"]],
+                request["file_pattern"],
+                exclude=self.pattern_check.exclude,
+                could_match_below=self.pattern_check.pattern_index.could_match_below,
+                use_gitignore=request["gitignore"],
+                changed_since=request["changed_since"],
+                staged=request["staged"],
+            )
+        except ValueError as e:
+            send({"ok": False, "reason": str(e)})
+            return
+
+        if request["shard"] is not None:
+            files_to_check = select_shard(
+                files_to_check,
+                tuple(request["shard"]),
+                by_size=request["shard_by_size"],
+            )
+
+        send({"ok": True})
+        cache = self.cache if request["cache"] else None
+        fail_fast = request.get("fail_fast", False)
+        self.pattern_check.stop_at_error = fail_fast
+
+        for target_file in files_to_check:
+            result = check_file(self.pattern_check, target_file, cache)
+            send(_encode_result(result))
+
+            if fail_fast and not result.validates:
+                break
+
+        send({"done": True})
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+
+        try:
+            self.server.check_server.handle(request, self.wfile)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading, like `--fail-fast` after a failure
+            pass
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    def __init__(self, path: pathlib.Path, check_server: CheckServer):
+        self.check_server = check_server
+        super().__init__(str(path), _RequestHandler)
+
+
+def _remove_stale_socket(path: pathlib.Path):
+    """Removes the socket of a server that is no longer running"""
+    if not path.exists():
+        return
+
+    with socket.socket(socket.AF_UNIX) as client:
+        try:
+            client.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+
+    raise ValueError(f"A server is already listening on {path}")
+
+
+def make_server(config_file: pathlib.Path, path: pathlib.Path) -> _UnixServer:
+    """Loads the config and binds the socket at `path`"""
+    check_server = CheckServer(config_file)
+    check_server.reload()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _remove_stale_socket(path)
+    return _UnixServer(path, check_server)
+
+
+def serve(config_file: pathlib.Path, path: pathlib.Path):
+    """Serves checks until interrupted, removing the socket on the way out"""
+    server = make_server(config_file, path)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
@@ -0,0 +1,93 @@
+"""
+Splits the files of a check between CI runners.
+
+`--shard INDEX/COUNT` checks one of COUNT slices of the files, numbered from 1.
+A file's slice comes from a hash of its path, so every runner agrees on the
+slices without talking to the others, and a file stays in the same slice as
+files are added and removed.
+
+`--shard-by-size` deals the files out largest first to whichever slice has the
+fewest bytes so far, so the slices take about as long to check. Every runner
+has to see the same files and sizes for that, which it does when they all
+check the same commit.
+"""
+
+import hashlib
+import os
+import pathlib
+import typing
+
+Shard = tuple[int, int]
+
+
+def parse_shard(value: str) -> Shard:
+    """Splits an `INDEX/COUNT` value of `--shard`"""
+    index, separator, count = value.partition("/")
+
+    try:
+        shard = int(index), int(count)
+    except ValueError:
+        shard = None
+
+    if not separator or shard is None or not 1 <= shard[0] <= shard[1]:
+        raise ValueError(
+            f"Expected --shard INDEX/COUNT with 1 <= INDEX <= COUNT, got {value!r}"
+        )
+
+    return shard
+
+
+def path_hash(path: pathlib.Path) -> int:
+    """A hash of `path` that is the same in every process and on every machine"""
+    digest = hashlib.blake2b(path.as_posix().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _size(path: pathlib.Path) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _by_size(paths: typing.Iterable[pathlib.Path], shard: Shard) -> list[pathlib.Path]:
+    index, count = shard
+    loads = [0] * count
+    paths = list(paths)
+    sizes = [_size(path) for path in paths]
+    # Ties are broken by the path, so the order the files were found in doesn't matter
+    order = sorted(
+        range(len(paths)),
+        key=lambda i: (-sizes[i], path_hash(paths[i]), paths[i].as_posix()),
+    )
+    selected = []
+
+    for i in order:
+        lightest = loads.index(min(loads))
+        loads[lightest] += sizes[i]
+
+        if lightest == index - 1:
+            selected.append(i)
+
+    # Checked in the order they were found, like the files of an unsharded run
+    return [paths[i] for i in sorted(selected)]
+
+
+def select_shard(
+    paths: typing.Iterable[pathlib.Path], shard: Shard, by_size: bool = False
+) -> typing.Iterable[pathlib.Path]:
+    """
+    The `paths` in `shard`.
+
+    Files are still yielded lazily as they are found unless `by_size` is set,
+    which needs every file before it can deal them out.
+    """
+    index, count = shard
+
+    if count == 1:
+        return paths
+
+    if by_size:
+        return _by_size(paths, shard)
+
+    return (path for path in paths if path_hash(path) % count == index - 1)
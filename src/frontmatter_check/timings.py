@@ -0,0 +1,184 @@
+"""
+Optional timers for each stage of a check, reported with `--timings`.
+
+Timing is off unless `enable` is called. While it is off, the instrumented code
+only checks that `current` is None, so it costs nothing.
+
+Each checked file gets a `FileTimings` that is returned on its
+`ValidationResult`, so files checked in worker processes are timed too. The
+`Report` adds them up in the main process.
+"""
+
+import collections
+import contextlib
+import dataclasses
+import json
+import time
+import typing
+
+STAGES = ("walk", "match", "read", "parse", "validate")
+DEFAULT_TOP = 10
+
+_enabled = False
+# The timings of the file being checked in this process
+current: "FileTimings | None" = None
+
+
+def enable(enabled: bool = True):
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@dataclasses.dataclass
+class FileTimings:
+    """Nanoseconds spent checking one file"""
+
+    total: int = 0
+    stages: dict[str, int] = dataclasses.field(default_factory=dict)
+    # keyed by the name of the `PatternRuleset`
+    patterns: dict[str | None, int] = dataclasses.field(default_factory=dict)
+    # keyed by the name of the `PatternRuleset` and the rule's field name
+    rules: dict[tuple[str | None, str], int] = dataclasses.field(default_factory=dict)
+
+    def add(self, stage: str, elapsed: int):
+        self.stages[stage] = self.stages.get(stage, 0) + elapsed
+
+
+@contextlib.contextmanager
+def timing_file() -> typing.Iterator[FileTimings]:
+    """Makes a new `FileTimings` the `current` one while checking a file"""
+    global current
+    file_timings = FileTimings()
+    previous, current = current, file_timings
+    start = time.perf_counter_ns()
+
+    try:
+        yield file_timings
+    finally:
+        file_timings.total = time.perf_counter_ns() - start
+        current = previous
+
+
+def _percentile(ordered: list[int], percent: float) -> int:
+    # nearest-rank, so the result is always one of the values
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[int(index)]
+
+
+def _stage_summary(elapsed: list[int]) -> dict[str, float]:
+    ordered = sorted(elapsed)
+    return {
+        "count": len(ordered),
+        "total_ms": sum(ordered) / 1e6,
+        "mean_us": sum(ordered) / len(ordered) / 1e3,
+        "p50_us": _percentile(ordered, 50) / 1e3,
+        "p90_us": _percentile(ordered, 90) / 1e3,
+        "p99_us": _percentile(ordered, 99) / 1e3,
+        "max_us": ordered[-1] / 1e3,
+    }
+
+
+class Report:
+    """Adds up the timings of every file in a run"""
+
+    def __init__(self):
+        self.start = time.perf_counter_ns()
+        self.stages: dict[str, list[int]] = collections.defaultdict(list)
+        self.files: list[tuple[int, str]] = []
+        self.patterns: collections.Counter = collections.Counter()
+        self.rules: collections.Counter = collections.Counter()
+
+    def timed_walk(self, paths: typing.Iterable) -> typing.Iterator:
+        """Yields from `paths`, timing how long each one took to find"""
+        iterator = iter(paths)
+
+        while True:
+            start = time.perf_counter_ns()
+
+            try:
+                path = next(iterator)
+            except StopIteration:
+                return
+
+            self.stages["walk"].append(time.perf_counter_ns() - start)
+            yield path
+
+    def add(self, file_timings: FileTimings | None, path):
+        if file_timings is None:
+            return
+
+        self.files.append((file_timings.total, str(path)))
+
+        for stage, elapsed in file_timings.stages.items():
+            self.stages[stage].append(elapsed)
+
+        self.patterns.update(file_timings.patterns)
+        self.rules.update(file_timings.rules)
+
+    def to_dict(self, top: int = DEFAULT_TOP) -> dict:
+        return {
+            "wall_ms": (time.perf_counter_ns() - self.start) / 1e6,
+            "files": len(self.files),
+            "stages": {
+                stage: _stage_summary(self.stages[stage])
+                for stage in STAGES
+                if self.stages[stage]
+            },
+            "slowest_files": [
+                {"path": path, "ms": elapsed / 1e6}
+                for elapsed, path in sorted(self.files, reverse=True)[:top]
+            ],
+            "patterns": [
+                {"name": name, "total_ms": elapsed / 1e6}
+                for name, elapsed in self.patterns.most_common(top)
+            ],
+            "rules": [
+                {"pattern": name, "field_name": field_name, "total_ms": elapsed / 1e6}
+                for (name, field_name), elapsed in self.rules.most_common(top)
+            ],
+        }
+
+    def to_json(self, top: int = DEFAULT_TOP) -> str:
+        return json.dumps(self.to_dict(top), indent=2)
+
+    def format_table(self, top: int = DEFAULT_TOP) -> str:
+        report = self.to_dict(top)
+        lines = [
+            f"Checked {report['files']} file(s) in {report['wall_ms']:.1f} ms",
+            "",
+            f"{'stage':<10}{'total ms':>10}{'mean us':>10}{'p50 us':>10}"
+            f"{'p90 us':>10}{'p99 us':>10}{'max us':>10}",
+        ]
+
+        for stage, summary in report["stages"].items():
+            lines.append(
+                f"{stage:<10}{summary['total_ms']:>10.1f}{summary['mean_us']:>10.1f}"
+                f"{summary['p50_us']:>10.1f}{summary['p90_us']:>10.1f}"
+                f"{summary['p99_us']:>10.1f}{summary['max_us']:>10.1f}"
+            )
+
+        sections = [
+            ("Slowest files", [(f["path"], f["ms"]) for f in report["slowest_files"]]),
+            (
+                "Slowest patterns",
+                [(p["name"], p["total_ms"]) for p in report["patterns"]],
+            ),
+            (
+                "Slowest rules",
+                [
+                    (f"{r['pattern']}: {r['field_name']}", r["total_ms"])
+                    for r in report["rules"]
+                ],
+            ),
+        ]
+
+        for title, rows in sections:
+            if rows:
+                lines.extend(["", f"{title} (ms)"])
+                lines.extend(f"{elapsed:>10.3f}  {name}" for name, elapsed in rows)
+
+        return "\n".join(lines)
@@ -0,0 +1,383 @@
+"""
+Finds the files to check in a single, lazy pass over each directory.
+
+Directories are read with `os.scandir` and files are yielded as they are found.
+A directory is only entered when one of the `--file-pattern`s (or the config's
+`pattern`s) could match something inside it and it isn't excluded by a
+`.gitignore` file or the config's `exclude` list.
+"""
+
+import fnmatch
+import os
+import pathlib
+import re
+import typing
+
+from .git_changes import changed_files
+
+_ALWAYS_SKIPPED = {".git"}
+
+
+def _translate_ignore_pattern(pattern: str) -> str:
+    """Translate a gitignore glob (without `!` or a trailing `/`) into a regex"""
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    regex = []
+    i = 0
+
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and (end := pattern.find("]", i + 2)) != -1:
+            char_class = pattern[i + 1 : end].replace("\\", "\\\\")
+            if char_class.startswith("!"):
+                char_class = "^" + char_class[1:]
+            regex.append(f"[{char_class}]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            regex.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+
+    prefix = "" if anchored else "(?:.*/)?"
+    return f"{prefix}{''.join(regex)}"
+
+
+class IgnoreRules:
+    """
+    Rules in the `.gitignore` format.
+
+    Patterns are matched against paths relative to the directory the rules
+    belong to. As with git, the last matching pattern wins.
+    """
+
+    def __init__(self, lines: typing.Iterable[str]):
+        self.rules = []
+
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+
+            directory_only = line.endswith("/")
+            line = line.rstrip("/")
+
+            if line:
+                self.rules.append(
+                    (
+                        re.compile(_translate_ignore_pattern(line)),
+                        negated,
+                        directory_only,
+                    )
+                )
+
+    @classmethod
+    def from_file(cls, ignore_file: pathlib.Path) -> "IgnoreRules | None":
+        try:
+            with open(ignore_file, mode="rt", encoding="utf-8") as f:
+                return cls(f)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def match(self, relative_path: str, is_dir: bool) -> bool | None:
+        """True if ignored, False if re-included and None if no rule matches"""
+        ignored = None
+
+        for regex, negated, directory_only in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if regex.fullmatch(relative_path):
+                ignored = not negated
+
+        return ignored
+
+
+# (the parts of the directory the rules are relative to, the rules)
+_IgnoreChain = tuple[tuple[tuple[str, ...], IgnoreRules], ...]
+
+
+def _is_ignored(chain: _IgnoreChain, parts: tuple[str, ...], is_dir: bool) -> bool:
+    ignored = False
+
+    for base, rules in chain:
+        if parts[: len(base)] != base:
+            continue
+        matched = rules.match("/".join(parts[len(base) :]), is_dir)
+        if matched is not None:
+            ignored = matched
+
+    return ignored
+
+
+def _glob_match(parts: tuple[str, ...], pattern_parts: tuple[str, ...]) -> bool:
+    """Whether `parts` matches a pattern the same way `pathlib.Path.glob` would"""
+    if not pattern_parts:
+        return not parts
+
+    head, rest = pattern_parts[0], pattern_parts[1:]
+
+    if head == "**":
+        return any(_glob_match(parts[i:], rest) for i in range(len(parts) + 1))
+
+    return (
+        bool(parts)
+        and fnmatch.fnmatchcase(parts[0], head)
+        and _glob_match(parts[1:], rest)
+    )
+
+
+def _could_match_below(parts: tuple[str, ...], pattern_parts: tuple[str, ...]):
+    """Whether a file inside the directory `parts` could match the pattern"""
+    if not parts:
+        return bool(pattern_parts)
+    if not pattern_parts:
+        return False
+
+    head = pattern_parts[0]
+
+    if head == "**":
+        return True
+
+    return fnmatch.fnmatchcase(parts[0], head) and _could_match_below(
+        parts[1:], pattern_parts[1:]
+    )
+
+
+def _repository_ignore_chain(directory: pathlib.Path) -> _IgnoreChain:
+    """The `.gitignore` files from the repository root down to `directory`"""
+    directory = directory.resolve()
+    ancestors = [directory, *directory.parents]
+
+    for top, ancestor in enumerate(ancestors):
+        if (ancestor / ".git").exists():
+            break
+    else:
+        return ()
+
+    chain = []
+
+    for ancestor in reversed(ancestors[: top + 1]):
+        if rules := IgnoreRules.from_file(ancestor / ".gitignore"):
+            chain.append((ancestor.parts, rules))
+
+    return tuple(chain)
+
+
+def walk(
+    root: pathlib.Path,
+    file_patterns: typing.Sequence[str],
+    exclude: IgnoreRules | None = None,
+    could_match_below: typing.Callable[[pathlib.Path], bool] | None = None,
+    use_gitignore: bool = True,
+) -> typing.Iterator[pathlib.Path]:
+    """
+    Lazily yield the files below `root` matching any of `file_patterns`.
+
+    `file_patterns` are relative to `root`, as with `pathlib.Path.glob`.
+    `exclude` rules are relative to the current working directory. When
+    given, directories that `could_match_below` rejects are not entered.
+    """
+
+    pattern_parts = [tuple(pattern.split("/")) for pattern in file_patterns if pattern]
+    chain: _IgnoreChain = ()
+
+    if exclude is not None:
+        chain += ((pathlib.Path.cwd().parts, exclude),)
+    if use_gitignore:
+        chain += _repository_ignore_chain(root)
+
+    stack = [(root, root.resolve().parts, (), chain)]
+
+    while stack:
+        directory, absolute_parts, relative_parts, chain = stack.pop()
+
+        if use_gitignore and relative_parts:
+            if rules := IgnoreRules.from_file(directory / ".gitignore"):
+                chain += ((absolute_parts, rules),)
+
+        try:
+            with os.scandir(directory) as scanned:
+                entries = sorted(scanned, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirectories = []
+
+        for entry in entries:
+            parts = relative_parts + (entry.name,)
+            entry_absolute_parts = absolute_parts + (entry.name,)
+
+            try:
+                # Don't follow directory symlinks, which could loop forever
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir and entry.name in _ALWAYS_SKIPPED:
+                continue
+
+            if not is_dir and not entry.is_file():
+                continue
+
+            if _is_ignored(chain, entry_absolute_parts, is_dir):
+                continue
+
+            path = directory / entry.name
+
+            if is_dir:
+                if any(_could_match_below(parts, p) for p in pattern_parts) and (
+                    could_match_below is None or could_match_below(path)
+                ):
+                    subdirectories.append((path, entry_absolute_parts, parts, chain))
+            elif any(_glob_match(parts, p) for p in pattern_parts):
+                yield path
+
+        stack.extend(reversed(subdirectories))
+
+
+def iter_files(
+    target_files: typing.Iterable[pathlib.Path],
+    file_patterns: typing.Sequence[str],
+    exclude: typing.Sequence[str] = (),
+    could_match_below: typing.Callable[[pathlib.Path], bool] | None = None,
+    use_gitignore: bool = True,
+) -> typing.Iterator[pathlib.Path]:
+    """
+    Yield the files to check for the files and directories given on the command line.
+
+    Files are yielded once, in the order they were given, even when directories
+    overlap. Files passed directly are always checked unless they match an
+    `exclude` pattern.
+    """
+
+    exclude_rules = IgnoreRules(exclude) if exclude else None
+    exclude_chain = ((pathlib.Path.cwd().parts, exclude_rules),) if exclude else ()
+    targets = [
+        (target_file, target_file.resolve(), target_file.is_dir())
+        for target_file in target_files
+    ]
+    directories = {resolved for _, resolved, is_dir in targets if is_dir}
+    explicit_files = {resolved for _, resolved, is_dir in targets if not is_dir}
+    # Whether the walk of one directory can reach files of another. The walks
+    # can't just be skipped, as a pattern like `*.md` doesn't enter directories
+    overlapping = any(
+        parent in directories
+        for directory in directories
+        for parent in directory.parents
+    )
+    done = set()
+    walked = set()
+
+    for target_file, resolved, is_dir in targets:
+        if resolved in done:
+            continue
+        done.add(resolved)
+
+        if not is_dir:
+            if not _is_ignored(exclude_chain, resolved.parts, is_dir=False):
+                yield target_file
+            continue
+
+        for path in walk(
+            target_file,
+            file_patterns,
+            exclude=exclude_rules,
+            could_match_below=could_match_below,
+            use_gitignore=use_gitignore,
+        ):
+            if explicit_files or overlapping:
+                resolved_path = path.resolve()
+                if resolved_path in explicit_files or resolved_path in walked:
+                    continue
+                if overlapping:
+                    walked.add(resolved_path)
+            yield path
+
+
+def filter_files(
+    paths: typing.Iterable[pathlib.Path],
+    file_patterns: typing.Sequence[str],
+    within: typing.Sequence[pathlib.Path] = (),
+    exclude: typing.Sequence[str] = (),
+) -> typing.Iterator[pathlib.Path]:
+    """
+    Yield the `paths` (like the changed files in a git repository) worth checking.
+
+    A path has to match one of the `file_patterns` from the right, as with
+    `pathlib.PurePath.match`, be inside one of the `within` files or
+    directories when any are given, and not match an `exclude` pattern.
+    """
+
+    exclude_chain = (
+        ((pathlib.Path.cwd().parts, IgnoreRules(exclude)),) if exclude else ()
+    )
+    within = [target.resolve() for target in within]
+
+    for path in paths:
+        if not any(path.match(pattern) for pattern in file_patterns):
+            continue
+
+        resolved = path.resolve()
+
+        if within and not any(
+            resolved == target or resolved.is_relative_to(target) for target in within
+        ):
+            continue
+
+        if _is_ignored(exclude_chain, resolved.parts, is_dir=False):
+            continue
+
+        yield path
+
+
+def select_files(
+    target_files: typing.Sequence[pathlib.Path],
+    file_patterns: typing.Sequence[str],
+    exclude: typing.Sequence[str] = (),
+    could_match_below: typing.Callable[[pathlib.Path], bool] | None = None,
+    use_gitignore: bool = True,
+    changed_since: str | None = None,
+    staged: bool = False,
+) -> typing.Iterator[pathlib.Path]:
+    """
+    The files a `check` looks at: the files changed in git when `changed_since`
+    or `staged` is given, otherwise the files in `target_files`.
+
+    Raises a ValueError when git can't list the changed files.
+    """
+
+    if changed_since or staged:
+        return filter_files(
+            changed_files(since=changed_since, staged=staged),
+            file_patterns,
+            within=target_files,
+            exclude=exclude,
+        )
+
+    return iter_files(
+        target_files,
+        file_patterns,
+        exclude=exclude,
+        could_match_below=could_match_below,
+        use_gitignore=use_gitignore,
+    )
@@ -0,0 +1,340 @@
+"""
+Watches files and checks them again when their content changes.
+
+`frontmatter-check watch` checks every file once and then only the files that
+changed. Changes are read from inotify on Linux, and found by comparing the
+files' mtimes every few seconds elsewhere. Changes that arrive close together
+are checked as one batch.
+
+When the config file changes, only the files whose matching patterns changed
+are checked again.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import pathlib
+import select
+import struct
+import sys
+import time
+import typing
+
+from .logger import logger
+from .parallel import check_file
+from .pattern_check import FrontmatterPatternMatchCheck, ValidationResult
+from .walker import select_files
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 0.2
+
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+# struct inotify_event, followed by `len` bytes of name
+_EVENT = struct.Struct("iIII")
+
+_ChangedPaths = set[pathlib.Path] | None
+
+
+class InotifySource:
+    """Changes in watched directories, reported by Linux's inotify"""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "Could not start inotify")
+
+        self.directories: dict[int, pathlib.Path] = {}
+
+    @staticmethod
+    def available() -> bool:
+        return sys.platform.startswith("linux") and bool(ctypes.util.find_library("c"))
+
+    def add_directory(self, directory: pathlib.Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Could not watch {directory}")
+
+        self.directories[wd] = directory
+
+    def wait(self, timeout: float | None) -> _ChangedPaths:
+        """
+        The paths that changed within `timeout` seconds, or None when events
+        were lost and everything should be checked again.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+
+        if not ready:
+            return set()
+
+        data = b""
+
+        while True:
+            try:
+                data += os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+        changed = set()
+        offset = 0
+
+        while offset < len(data):
+            wd, mask, _, name_length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+
+            if mask & _IN_Q_OVERFLOW:
+                return None
+
+            if mask & _IN_IGNORED:
+                self.directories.pop(wd, None)
+            elif (directory := self.directories.get(wd)) is not None and name:
+                changed.add(directory / os.fsdecode(name))
+
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingSource:
+    """Changes found by comparing the mtime and size of files every `interval` seconds"""
+
+    def __init__(
+        self,
+        list_files: typing.Callable[[], typing.Iterable[pathlib.Path]],
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        self.list_files = list_files
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> dict[pathlib.Path, tuple[int, int]]:
+        snapshot = {}
+
+        for path in self.list_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    def wait(self, timeout: float | None) -> _ChangedPaths:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = (
+                self.interval if deadline is None else deadline - time.monotonic()
+            )
+            time.sleep(max(0.0, min(self.interval, remaining)))
+
+            snapshot = self._snapshot()
+            changed = {
+                path
+                for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def _digest(path: pathlib.Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class Watcher:
+    """Checks the files in `target_files` again as they change"""
+
+    def __init__(
+        self,
+        config_file: pathlib.Path,
+        target_files: typing.Sequence[pathlib.Path],
+        file_patterns: typing.Sequence[str],
+        use_gitignore: bool = True,
+    ):
+        self.config_file = pathlib.Path(config_file)
+        self.target_files = list(target_files)
+        self.file_patterns = list(file_patterns)
+        self.use_gitignore = use_gitignore
+        self.pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(
+            self.config_file
+        )
+        # The content hash of each file when it was last checked
+        self.digests: dict[pathlib.Path, str | None] = {}
+
+    def select(self) -> list[pathlib.Path]:
+        return list(
+            select_files(
+                self.target_files,
+                self.file_patterns,
+                exclude=self.pattern_check.exclude,
+                could_match_below=self.pattern_check.pattern_index.could_match_below,
+                use_gitignore=self.use_gitignore,
+            )
+        )
+
+    def _check(self, path: pathlib.Path) -> ValidationResult:
+        self.digests[path] = _digest(path)
+        return check_file(self.pattern_check, path)
+
+    def scan(self) -> list[ValidationResult]:
+        """Checks every file"""
+        self.digests = {}
+        return [self._check(path) for path in self.select()]
+
+    def _reload_config(self) -> list[ValidationResult]:
+        try:
+            pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(
+                self.config_file
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.error("Could not reload %s: %s" % (self.config_file, e))
+            return []
+
+        old_pattern_check, self.pattern_check = self.pattern_check, pattern_check
+        known = list(self.digests)
+        results = self._update_file_list()
+
+        for path in known:
+            if path in self.digests and old_pattern_check.pattern_index.match(
+                path
+            ) != pattern_check.pattern_index.match(path):
+                results.append(self._check(path))
+
+        return results
+
+    def _update_file_list(self) -> list[ValidationResult]:
+        """Checks new files and forgets the ones that are gone"""
+        paths = self.select()
+        selected = set(paths)
+
+        for path in self.digests.keys() - selected:
+            del self.digests[path]
+
+        return [self._check(path) for path in paths if path not in self.digests]
+
+    def handle(self, changed: _ChangedPaths) -> list[ValidationResult]:
+        """Checks the files in a batch of changes again if their content changed"""
+        if changed is None:
+            # Some changes were missed, so compare everything
+            return self._update_file_list() + self.handle(set(self.digests))
+
+        config_file = self.config_file.resolve()
+        results = []
+        files_changed = False
+
+        for path in changed:
+            if path.resolve() == config_file:
+                results.extend(self._reload_config())
+            elif path in self.digests:
+                if not path.exists():
+                    files_changed = True
+                elif _digest(path) != self.digests[path]:
+                    results.append(self._check(path))
+            elif path.is_dir() or self.pattern_check.matches(path):
+                files_changed = True
+
+        if files_changed:
+            results.extend(self._update_file_list())
+
+        return results
+
+    def _watch_tree(self, source: InotifySource, directory: pathlib.Path):
+        source.add_directory(directory)
+
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = [
+                    directory / entry.name
+                    for entry in entries
+                    if entry.is_dir(follow_symlinks=False) and entry.name != ".git"
+                ]
+        except OSError:
+            return
+
+        for subdirectory in subdirectories:
+            if self.pattern_check.pattern_index.could_match_below(subdirectory):
+                self._watch_tree(source, subdirectory)
+
+    def open_source(
+        self, poll: bool = False, interval: float = DEFAULT_INTERVAL
+    ) -> InotifySource | PollingSource:
+        """Starts watching with inotify when possible, polling otherwise"""
+        if not poll and InotifySource.available():
+            try:
+                source = InotifySource()
+            except OSError as e:
+                logger.debug("Falling back to polling: %s" % e)
+            else:
+                try:
+                    source.add_directory(self.config_file.parent)
+                    for target in self.target_files:
+                        if target.is_dir():
+                            self._watch_tree(source, target)
+                        else:
+                            source.add_directory(target.parent)
+                    return source
+                except OSError as e:
+                    # Usually too many directories for fs.inotify.max_user_watches
+                    logger.warning("Falling back to polling: %s" % e)
+                    source.close()
+
+        return PollingSource(lambda: [self.config_file, *self.select()], interval)
+
+    def run(
+        self,
+        report: typing.Callable[[ValidationResult], None],
+        poll: bool = False,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ):
+        """Reports the first check of every file and then every check after a change"""
+        for result in self.scan():
+            report(result)
+
+        source = self.open_source(poll=poll, interval=interval)
+
+        try:
+            while True:
+                changed = source.wait(None)
+
+                # Wait for a quiet moment so a save that touches several files,
+                # or the same file several times, is checked once
+                while changed:
+                    more = source.wait(debounce)
+                    if not more:
+                        changed = None if more is None else changed
+                        break
+                    changed |= more
+
+                if isinstance(source, InotifySource) and changed:
+                    watched = set(source.directories.values())
+                    for path in changed:
+                        if path.is_dir() and path not in watched:
+                            self._watch_tree(source, path)
+
+                for result in self.handle(changed):
+                    report(result)
+        finally:
+            source.close()
@@ -1,4 +1,16 @@
 import pytest
+from typer.testing import CliRunner
+
+from frontmatter_check.cli import app
+from frontmatter_check.logger import logger
+
+CONFIG = """
+patterns:
+  - name: posts
+    pattern: "**/*.md"
+    rules:
+      - field_name: title
+"""
 
 
 @pytest.fixture(scope="session")
@@ -22,3 +34,51 @@ def example_file(fake_dir, example_frontmatter):
     sample_filepath = fake_dir / "sample_file.md"
     sample_filepath.write_text(example_frontmatter)
     return sample_filepath
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    """Keep the caches and signing key of test runs out of the user's home"""
+    monkeypatch.setenv("FRONTMATTER_CHECK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user-cache"))
+
+
+@pytest.fixture
+def log_caplog(caplog, monkeypatch):
+    """Records logged to the FrontmatterCheck logger, which doesn't propagate"""
+    monkeypatch.setattr(logger, "propagate", False)
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.fixture
+def config_text():
+    """The config in `config_file`. Modules that need other rules override it"""
+    return CONFIG
+
+
+@pytest.fixture
+def config_file(tmp_path, config_text):
+    config = tmp_path / "config.yaml"
+    config.write_text(config_text)
+    return config
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch, config_file):
+    """`tmp_path` as the working directory, with `config.yaml` and a `posts` directory"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "posts").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def check_cli(project):
+    """Runs `frontmatter-check posts --config-file config.yaml` with more arguments"""
+    runner = CliRunner()
+
+    def check(*args):
+        return runner.invoke(app, ["posts", "--config-file", "config.yaml", *args])
+
+    return check
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+import pytest
+
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+
+
+@pytest.fixture
+def pattern_check():
+    return FrontmatterPatternMatchCheck(
+        {
+            "name": "posts",
+            "pattern": "**/*.md",
+            "rules": [{"field_name": "title"}, {"field_name": "author"}],
+        }
+    )
+
+
+@pytest.fixture
+def posts(tmp_path):
+    paths = []
+
+    for i in range(20):
+        post = tmp_path / f"{i}.md"
+        post.write_text(
+            "---\ntitle: A\nauthor: me\n---\n" if i % 2 else "---\ntitle: A\n---\n"
+        )
+        paths.append(post)
+
+    return paths
+
+
+def test_avalidates_matches_evaluate(pattern_check, posts):
+    result = asyncio.run(pattern_check.avalidates(posts[0]))
+
+    assert result == pattern_check.evaluate(posts[0])
+    assert not result.validates
+    assert [(f.field_name, f.kind, f.level) for f in result.failures] == [
+        ("author", "missing", logging.ERROR)
+    ]
+
+
+def test_avalidates_skips_unmatched_files(pattern_check, tmp_path):
+    result = asyncio.run(pattern_check.avalidates(tmp_path / "missing.txt"))
+
+    assert result.skipped
+    assert result.validates
+
+
+def test_validate_many_yields_every_result(caplog, pattern_check, posts):
+    caplog.set_level(logging.DEBUG, logger="FrontmatterCheck")
+
+    async def collect():
+        return [
+            result
+            async for result in pattern_check.validate_many(posts, max_concurrency=3)
+        ]
+
+    results = asyncio.run(collect())
+
+    assert sorted(result.path for result in results) == sorted(posts)
+    assert {result.path.name: result.validates for result in results} == {
+        post.name: bool(i % 2) for i, post in enumerate(posts)
+    }
+    # Results are returned, nothing is logged
+    assert caplog.records == []
+
+
+def test_validate_many_reports_unreadable_files(pattern_check, posts, tmp_path):
+    undecodable = tmp_path / "latin-1.md"
+    undecodable.write_bytes("---\ntitle: Caf\xe9\n---\n".encode("latin-1"))
+    malformed = tmp_path / "malformed.md"
+    malformed.write_text("---\ntitle: [unclosed\n---\n")
+    files = [*posts[:5], undecodable, tmp_path / "deleted.md", malformed, *posts[5:]]
+
+    async def collect():
+        return [
+            result
+            async for result in pattern_check.validate_many(files, max_concurrency=2)
+        ]
+
+    results = {result.path: result for result in asyncio.run(collect())}
+
+    assert sorted(results) == sorted(files)
+    assert results[undecodable].error is not None
+    assert results[tmp_path / "deleted.md"].error is not None
+    assert results[malformed].error is not None
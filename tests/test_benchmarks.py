@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from benchmarks.suite import Scenario, build_corpus, find_regressions, main
+from frontmatter_check.parsers import parse_flat
+
+
+def _results(**metrics):
+    return {"version": 1, "scenarios": {"1k-small-few": metrics}}
+
+
+def test_find_regressions_respects_metric_direction():
+    baseline = _results(throughput=1000, read=100, peak_memory=100)
+    current = _results(throughput=850, read=105, peak_memory=80)
+
+    regressions = find_regressions(baseline, current, threshold=0.1)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("1k-small-few throughput")
+
+
+@pytest.mark.parametrize("read, exit_code", [(105, 0), (150, 1)])
+def test_compare_exit_code(tmp_path, read, exit_code):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(_results(read=100)))
+    current.write_text(json.dumps(_results(read=read)))
+
+    assert main(["compare", str(baseline), str(current)]) == exit_code
+
+
+def test_build_corpus(tmp_path):
+    build_corpus(Scenario(40, "small", "many"), tmp_path)
+
+    assert len(list(tmp_path.glob("content/**/*.md"))) == 40
+    assert (tmp_path / "config.yaml").exists()
+
+
+def test_flat_corpus_has_flat_headers(tmp_path):
+    build_corpus(Scenario(10, "flat", "few"), tmp_path)
+
+    for path in tmp_path.glob("content/**/*.md"):
+        parse_flat(path.read_text().split("---")[1])
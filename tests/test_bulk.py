@@ -0,0 +1,123 @@
+import builtins
+import datetime
+import logging
+import pathlib
+
+import pytest
+
+from frontmatter_check.bulk import bit_indexes
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+
+
+@pytest.fixture
+def pattern_check():
+    return FrontmatterPatternMatchCheck(
+        {
+            "name": "posts",
+            "pattern": "posts/*.md",
+            "rules": [
+                {"field_name": "Title"},
+                {"field_name": "date", "type": "datetime"},
+                {"field_name": "author", "level": "warning"},
+            ],
+        },
+        {
+            "name": "everything",
+            "pattern": "**/*.md",
+            "rules": [{"field_name": "layout", "type": "str"}],
+        },
+    )
+
+
+TEXTS = [
+    "---\ntitle: A\ndate: 2024-01-01\nauthor: me\nlayout: post\n---\n",
+    "---\nTITLE: B\ndate: soon\nlayout: 3\n---\n",
+    "---\ntitle:\ndate:\nauthor: me\n---\n",
+    "---\nlayout: page\n---\n",
+    "No frontmatter",
+]
+
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    documents = []
+
+    for directory in ("posts", "pages", "images"):
+        (tmp_path / directory).mkdir()
+
+        for i, text in enumerate(TEXTS):
+            suffix = ".png" if directory == "images" else ".md"
+            path = pathlib.Path(directory) / f"{i}{suffix}"
+            path.write_text(text)
+            documents.append((path, text))
+
+    return documents
+
+
+def test_results_match_checking_the_files(pattern_check, documents):
+    report = pattern_check.evaluate_documents(documents)
+
+    assert report.results() == [pattern_check.evaluate(path) for path, _ in documents]
+
+
+def test_metadata_is_checked_like_text(pattern_check, documents):
+    from frontmatter_check.reader import parse_metadata
+
+    from_text = pattern_check.evaluate_documents(documents)
+    from_metadata = pattern_check.evaluate_documents(
+        (path, parse_metadata(text)) for path, text in documents
+    )
+
+    assert from_metadata == from_text
+
+
+def test_failures_are_bitsets_of_documents(pattern_check):
+    report = pattern_check.evaluate_documents(
+        [
+            ("posts/a.md", {"title": "A", "date": datetime.date(2024, 1, 1)}),
+            ("posts/b.md", {"date": "soon", "author": None}),
+            ("posts/c.md", {}),
+            ("c.txt", {}),
+        ]
+    )
+
+    assert [
+        (failures[0].field_name, failures[0].ruleset) for failures in report.rules
+    ] == [
+        ("Title", "posts"),
+        ("date", "posts"),
+        ("author", "posts"),
+        ("layout", "everything"),
+    ]
+    assert report.failures == [
+        (0b0010, 0, 0, 0),
+        (0, 0, 0b0010, 0),
+        (0b0001, 0b0010, 0, 0),
+        (0b0011, 0, 0, 0),
+    ]
+    assert report.no_frontmatter == 0b0100
+    assert report.skipped == 0b1000
+    assert report.failed == 0b0011
+    assert report.failed_paths() == [
+        pathlib.Path("posts/a.md"),
+        pathlib.Path("posts/b.md"),
+    ]
+    assert [failure.level for failure in report.rules[2]] == [logging.WARNING] * 4
+
+
+def test_documents_are_not_read_from_disk(pattern_check, mocker):
+    spy = mocker.spy(builtins, "open")
+
+    report = pattern_check.evaluate_documents(
+        (f"posts/{i}.md", TEXTS[i % len(TEXTS)]) for i in range(1000)
+    )
+
+    spy.assert_not_called()
+    assert len(report.paths) == 1000
+
+
+def test_bit_indexes():
+    assert list(bit_indexes(0)) == []
+    assert list(bit_indexes(0b1010_0001)) == [0, 5, 7]
+    assert list(bit_indexes(1 << 5000)) == [5000]
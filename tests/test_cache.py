@@ -0,0 +1,211 @@
+import os
+import pathlib
+import pickle
+
+import pytest
+
+from frontmatter_check import cache, pattern_check as pattern_check_module
+from frontmatter_check.cache import ResultCache, config_fingerprint, load_config
+from frontmatter_check.parallel import check_file
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+
+
+@pytest.fixture
+def result_cache(tmp_path, config_file):
+    return ResultCache.for_config(config_file, directory=tmp_path / "cache")
+
+
+@pytest.fixture
+def pattern_check(config_file):
+    return FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+
+
+@pytest.fixture
+def post(tmp_path):
+    post = tmp_path / "post.md"
+    post.write_text("---\nauthor: me\n---\n")
+    return post
+
+
+def test_cache_replays_result_without_parsing(
+    mocker, pattern_check, result_cache, post
+):
+    first = check_file(pattern_check, post, cache=result_cache)
+    evaluate = mocker.spy(pattern_check, "evaluate")
+    second = check_file(pattern_check, post, cache=result_cache)
+
+    evaluate.assert_not_called()
+    assert second.validates is first.validates is False
+    assert [f.message for f in second.failures] == ["Missing field: 'title'"]
+
+
+def test_cache_uses_content_hash_when_mtime_changes(pattern_check, result_cache, post):
+    check_file(pattern_check, post, cache=result_cache)
+    stat = os.stat(post)
+    os.utime(post, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+    assert result_cache.get(post, [0]) is not None
+
+
+def test_cache_misses_when_content_changes(pattern_check, result_cache, post):
+    check_file(pattern_check, post, cache=result_cache)
+    post.write_text("---\ntitle: now it has a title\n---\n")
+
+    assert result_cache.get(post, [0]) is None
+    assert check_file(pattern_check, post, cache=result_cache).validates
+
+
+def test_cache_is_keyed_by_the_rulesets_the_path_matches(
+    tmp_path, monkeypatch, config_file
+):
+    config_file.write_text(
+        "patterns:\n"
+        "  - name: posts\n    pattern: posts/*.md\n"
+        "    rules:\n      - field_name: title\n"
+        "  - name: pages\n    pattern: '*.md'\n"
+        "    rules:\n      - field_name: author\n"
+    )
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+    result_cache = ResultCache.for_config(config_file, directory=tmp_path / "cache")
+    (tmp_path / "posts").mkdir()
+    (tmp_path / "posts" / "a.md").write_text("---\nauthor: me\n---\n")
+    monkeypatch.chdir(tmp_path)
+
+    assert not check_file(
+        pattern_check, pathlib.Path("posts/a.md"), cache=result_cache
+    ).validates
+
+    # From inside posts/ the same file only matches `*.md`
+    monkeypatch.chdir(tmp_path / "posts")
+
+    assert check_file(pattern_check, pathlib.Path("a.md"), cache=result_cache).validates
+
+
+def test_config_changes_fingerprint(config_file, config_text):
+    fingerprint = config_fingerprint(config_file)
+    config_file.write_text(config_text.replace("title", "author"))
+
+    assert config_fingerprint(config_file) != fingerprint
+
+
+def test_prune_evicts_least_recently_used(tmp_path, pattern_check, result_cache):
+    posts = []
+
+    for i in range(10):
+        post = tmp_path / f"{i}.md"
+        post.write_text("---\ntitle: post\n---\n")
+        check_file(pattern_check, post, cache=result_cache)
+        posts.append(post)
+
+    entry_size = os.path.getsize(result_cache._entry_path(posts[0], [0]))
+    result_cache.max_size = entry_size * 5
+    result_cache.prune()
+
+    remaining = list(result_cache.directory.glob("*.json"))
+    assert 0 < len(remaining) <= 5
+
+
+def test_results_cut_short_are_not_cached(pattern_check, result_cache, post):
+    pattern_check.stop_at_error = True
+    check_file(pattern_check, post, cache=result_cache)
+
+    assert result_cache.get(post, [0]) is None
+
+
+@pytest.fixture
+def from_yaml_config(mocker):
+    return mocker.spy(FrontmatterPatternMatchCheck, "from_yaml_config")
+
+
+def test_config_is_loaded_from_the_cache(tmp_path, config_file, post, from_yaml_config):
+    first = load_config(config_file, tmp_path / "cache")
+    second = load_config(config_file, tmp_path / "cache")
+
+    assert from_yaml_config.call_count == 1
+    assert second is not first
+    # Unpickling doesn't load python-frontmatter, it waits for the first file
+    assert second._handlers is None
+    assert second.evaluate(post) == first.evaluate(post)
+
+
+def test_changed_config_is_loaded_again(
+    tmp_path, config_file, config_text, post, from_yaml_config
+):
+    load_config(config_file, tmp_path / "cache")
+    config_file.write_text(config_text.replace("title", "author"))
+
+    assert load_config(config_file, tmp_path / "cache").evaluate(post).validates
+    assert from_yaml_config.call_count == 2
+    # The stale entry was replaced rather than kept next to the new one
+    assert len(list((tmp_path / "cache").glob("config-*.pickle"))) == 1
+
+
+def test_config_from_another_version_is_loaded_again(
+    tmp_path, monkeypatch, config_file, from_yaml_config
+):
+    load_config(config_file, tmp_path / "cache")
+    monkeypatch.setattr(cache, "_CONFIG_VERSION", cache._CONFIG_VERSION + 1)
+    load_config(config_file, tmp_path / "cache")
+
+    assert from_yaml_config.call_count == 2
+
+
+def test_unreadable_config_entry_is_rebuilt(tmp_path, config_file, from_yaml_config):
+    load_config(config_file, tmp_path / "cache")
+    (entry,) = (tmp_path / "cache").glob("config-*.pickle")
+    entry.write_bytes(entry.read_bytes()[:-20])
+
+    assert load_config(config_file, tmp_path / "cache").pattern_sets
+    assert from_yaml_config.call_count == 2
+    assert load_config(config_file, tmp_path / "cache").pattern_sets
+    assert from_yaml_config.call_count == 2
+
+
+class _Planted:
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (open, (str(self.marker), "w"))
+
+
+def test_unsigned_config_entry_is_not_unpickled(
+    tmp_path, config_file, from_yaml_config
+):
+    load_config(config_file, tmp_path / "cache")
+    (entry,) = (tmp_path / "cache").glob("config-*.pickle")
+    # Same key as the real entry, but signed with a key that isn't the user's
+    signed = entry.read_bytes()[32:96] + pickle.dumps(_Planted(tmp_path / "pwned"))
+    entry.write_bytes(cache._signature(b"\0" * 32, signed) + signed)
+
+    assert load_config(config_file, tmp_path / "cache").pattern_sets
+    assert from_yaml_config.call_count == 2
+    assert not (tmp_path / "pwned").exists()
+
+
+def test_signing_key_is_private_to_the_user(tmp_path, config_file):
+    load_config(config_file, tmp_path / "cache")
+    key_file = cache.user_cache_dir() / "config.key"
+
+    assert key_file.stat().st_mode & 0o777 == 0o600
+    assert cache._signing_key() == key_file.read_bytes()
+
+
+def test_cached_config_sets_the_logging_level(
+    tmp_path, monkeypatch, config_file, config_text
+):
+    config_file.write_text("settings:\n  level: warning\n" + config_text)
+    load_config(config_file, tmp_path / "cache")
+    monkeypatch.setattr(pattern_check_module, "FRONTMATTER_CHECK_LOGGING_LEVEL", None)
+
+    load_config(config_file, tmp_path / "cache")
+
+    assert pattern_check_module.FRONTMATTER_CHECK_LOGGING_LEVEL == "warning"
+
+
+def test_cache_defaults_to_a_user_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache.sys, "platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+
+    assert cache.user_cache_dir() == tmp_path / "xdg" / "frontmatter-check"
+    assert not cache.CACHE_DIR.resolve().is_relative_to(os.getcwd())
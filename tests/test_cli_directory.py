@@ -25,3 +25,35 @@ patterns:
     assert "Checking File" in result.stdout
     assert "a.md" in result.stdout
     assert "b.md" in result.stdout
+
+
+def test_unmatched_files_are_skipped_without_parsing(tmp_path, mocker):
+    (tmp_path / "posts").mkdir()
+    (tmp_path / "posts" / "a.md").write_text("---\ntitle: A\n---\n")
+    (tmp_path / "notes.md").write_text("---\nnot: valid: yaml\n---\n")
+
+    config = tmp_path / "config.yaml"
+    config.write_text("""
+patterns:
+  - name: posts
+    pattern: "*/posts/*.md"
+    rules:
+      - field_name: title
+""")
+    read_metadata = mocker.patch(
+        "frontmatter_check.pattern_check.read_metadata",
+        return_value={"title": "A"},
+    )
+
+    result = runner.invoke(
+        app,
+        [str(tmp_path / "posts"), str(tmp_path / "notes.md")]
+        + ["--config-file", str(config), "--no-cache"],
+    )
+
+    assert result.exit_code == 0
+    read_metadata.assert_called_once_with(
+        tmp_path / "posts" / "a.md", max_header_size=mocker.ANY, handlers=mocker.ANY
+    )
+    assert "notes.md" not in result.stdout
+    assert "Skipped 1 file(s) that no pattern matches" in result.stdout
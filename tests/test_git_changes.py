@@ -0,0 +1,78 @@
+import pathlib
+import shutil
+import subprocess
+
+import pytest
+from typer.testing import CliRunner
+
+from frontmatter_check.cli import app
+from frontmatter_check.git_changes import changed_files
+
+runner = CliRunner()
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def _git(*args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _git("init", "-q", "-b", "main")
+    pathlib.Path("config.yaml").write_text(
+        'patterns:\n  - name: all\n    pattern: "**/*.md"\n'
+        "    rules:\n      - field_name: title\n"
+    )
+    pathlib.Path("docs").mkdir()
+    pathlib.Path("docs/old.md").write_text("---\nauthor: me\n---\n")
+    pathlib.Path("docs/renamed.md").write_text("---\ntitle: renamed\n---\n")
+    _git("add", ".")
+    _git("commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def test_changed_since_revision(repo):
+    pathlib.Path("docs/new.md").write_text("---\ntitle: new\n---\n")
+    _git("add", "docs/new.md")
+    _git("mv", "docs/renamed.md", "docs/moved.md")
+    _git("commit", "-q", "-m", "change")
+    pathlib.Path("docs/old.md").unlink()
+
+    assert sorted(changed_files(since="HEAD~1")) == [
+        pathlib.Path("docs/moved.md"),
+        pathlib.Path("docs/new.md"),
+    ]
+
+
+def test_staged_only(repo):
+    pathlib.Path("docs/staged.md").write_text("---\ntitle: staged\n---\n")
+    pathlib.Path("docs/unstaged.md").write_text("---\ntitle: unstaged\n---\n")
+    _git("add", "docs/staged.md")
+
+    assert changed_files(staged=True) == [pathlib.Path("docs/staged.md")]
+
+
+def test_unknown_revision_raises(repo):
+    with pytest.raises(ValueError, match="git diff failed"):
+        changed_files(since="not-a-revision")
+
+
+def test_cli_checks_only_changed_files(repo):
+    pathlib.Path("docs/new.md").write_text("---\ntitle: new\n---\n")
+    pathlib.Path("docs/new.txt").write_text("not markdown\n")
+    _git("add", ".")
+
+    result = runner.invoke(
+        app, ["--staged", "--config-file", "config.yaml", "--file-pattern", "*.md"]
+    )
+
+    assert result.exit_code == 0
+    assert "Checking File: docs/new.md" in result.stdout
+    assert "old.md" not in result.stdout
+    assert "new.txt" not in result.stdout
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest
+
+# Dependencies that are only needed once a check actually runs
+HEAVY_MODULES = {
+    "asyncio",
+    "concurrent.futures",
+    "frontmatter",
+    "importlib.metadata",
+    "rich",
+    "yaml",
+}
+# Generous, so a slow machine doesn't fail it, but below the ~550ms the
+# CLI took to import when everything was loaded up front
+BUDGET_US = 400_000
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """The cumulative import time in microseconds of each module `module` imports"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.mark.parametrize("module", ["frontmatter_check", "frontmatter_check.cli"])
+def test_heavy_dependencies_are_imported_on_first_use(module):
+    imported = _import_times(module).keys()
+
+    assert HEAVY_MODULES.isdisjoint(imported)
+
+
+def test_package_import_does_not_load_the_cli():
+    imported = _import_times("frontmatter_check").keys()
+
+    assert "typer" not in imported
+    assert "frontmatter_check.pattern_check" not in imported
+
+
+def test_cli_import_time_is_within_budget():
+    times = _import_times("frontmatter_check.cli")
+
+    assert times["frontmatter_check.cli"] < BUDGET_US
@@ -3,8 +3,6 @@ import logging
 import pytest
 import sys
 
-from frontmatter_check.logger import memory_handler
-
 
 @pytest.fixture(scope="module")
 def _test_logger():
@@ -41,11 +39,6 @@ def test_logging_setup(_test_logger, caplog):
         assert "info message" not in stdout_output
         assert "error message" not in stdout_output
 
-        # Verify memory handler only captures errors and are formatted correctly
-        memory_records = [r for r in memory_handler.buffer]
-        assert len(memory_records) == 1
-        assert memory_records[0].levelname == "ERROR"
-
         # Assert that only WARNING and ERROR are recorded
         assert len(caplog.records) == 2
         assert [r.levelname for r in caplog.records] == ["WARNING", "ERROR"]
@@ -0,0 +1,110 @@
+import logging
+import pathlib
+
+import pytest
+
+from frontmatter_check.parallel import check_file, check_paths, resolve_jobs
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+
+
+@pytest.fixture
+def posts(project):
+    paths = []
+
+    for i in range(12):
+        post = project / "posts" / f"{i:02}.md"
+        # every third post is missing its title
+        post.write_text(
+            "---\nauthor: me\n---\n" if i % 3 == 0 else "---\ntitle: A\n---\n"
+        )
+        paths.append(post)
+
+    return paths
+
+
+def test_check_file_returns_failures(config_file, posts):
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+    result = check_file(pattern_check, posts[0])
+
+    assert result.validates is False
+    assert [(f.level, f.message) for f in result.failures] == [
+        (logging.ERROR, "Missing field: 'title'")
+    ]
+
+
+def test_check_file_does_not_depend_on_previous_failures(config_file, posts):
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+
+    assert not check_file(pattern_check, posts[0]).validates
+    assert check_file(pattern_check, posts[1]).validates
+
+
+def test_check_file_reports_files_it_cannot_read(config_file, posts):
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+    posts[0].write_text("---\ntitle: [unclosed\n---\n")
+
+    assert check_file(pattern_check, posts[0]).error is not None
+    assert check_file(pattern_check, posts[0].with_name("deleted.md")).error
+
+
+def test_parallel_results_match_serial_order(config_file, posts):
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+    serial = list(check_paths(pattern_check, config_file, posts, jobs=1))
+    parallel = list(check_paths(pattern_check, config_file, posts, jobs=2))
+
+    assert [r.path for r in parallel] == posts
+    assert [r.validates for r in parallel] == [r.validates for r in serial]
+    assert [r.failures for r in parallel] == [r.failures for r in serial]
+
+
+@pytest.mark.parametrize(
+    "jobs, file_count, expected",
+    [(3, 1, 3), (0, 1, 1), (0, 0, 1)],
+)
+def test_resolve_jobs(jobs, file_count, expected):
+    assert resolve_jobs(jobs, file_count) == expected
+
+
+def test_cli_jobs_output_matches_serial_run(check_cli, posts):
+    serial = check_cli("--jobs", "1")
+    parallel = check_cli("--jobs", "2")
+
+    assert parallel.stdout == serial.stdout
+    assert parallel.stdout.count("Checking File: ") == len(posts)
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_fail_fast_stops_at_the_first_failing_file(check_cli, posts, jobs):
+    result = check_cli("--no-cache", "--fail-fast", "--jobs", jobs)
+
+    assert result.exit_code == 1
+    # posts/00.md is missing its title
+    assert result.stdout.count("Checking File: ") == 1
+
+
+def test_stop_at_error_skips_the_remaining_patterns(tmp_path, posts):
+    pattern_check = FrontmatterPatternMatchCheck(
+        *(
+            {"name": name, "pattern": "**/*.md", "rules": [{"field_name": "title"}]}
+            for name in ("first", "second")
+        )
+    )
+
+    assert len(check_file(pattern_check, posts[0]).failures) == 2
+
+    pattern_check.stop_at_error = True
+
+    assert [f.ruleset for f in check_file(pattern_check, posts[0]).failures] == [
+        "first"
+    ]
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_malformed_header_does_not_end_the_run(check_cli, posts, jobs):
+    posts[1].write_text("---\ntitle: [unclosed\n---\n")
+
+    result = check_cli("--no-cache", "--jobs", jobs, "--report", "json=report.json")
+
+    assert result.exit_code == 1
+    assert result.stdout.count("Checking File: ") == len(posts)
+    assert pathlib.Path("report.json").exists()
@@ -0,0 +1,99 @@
+import datetime
+
+import pytest
+import yaml
+
+from frontmatter_check.parsers import NotFlat, handlers, parse_flat
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+from frontmatter_check.reader import read_metadata
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "title: Hello\nauthor: Somebody",
+        "# a comment\n\ntitle: Hello",
+        "date: 2024-01-02\ncount: 5\nplus: +5\nzero: 0",
+        "draft: yes\npublished: Off\nflag: TRUE",
+        "empty:\ntilde: ~\nnothing: null",
+        "url: https://example.com/a:b\nquote: it's",
+        "single: 'a # b'\ndouble: \"a: b\"",
+        "loose_date: 2024-1-2\nnot_a_float: 10e3\nnan: NaN",
+        "dotted.key-name: value   ",
+    ],
+)
+def test_parse_flat_matches_yaml(header):
+    metadata = parse_flat(header)
+
+    assert metadata == yaml.safe_load(header)
+    assert [type(value) for value in metadata.values()] == [
+        type(value) for value in yaml.safe_load(header).values()
+    ]
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "tags: [a, b]",
+        "tags:\n  - a\n  - b",
+        "author:\n  name: Somebody",
+        "title: Hello # a comment",
+        "summary: >\n  folded",
+        "ratio: 1.5",
+        "octal: 012",
+        "time: 1:30",
+        "negative: -5",
+        "published: 2024-01-02 10:00:00",
+        'escaped: "a\\tb"',
+        "doubled: 'it''s'",
+        "true: x",
+        "'quoted key': x",
+        "anchor: &a value",
+    ],
+)
+def test_parse_flat_refuses_other_yaml(header):
+    with pytest.raises(NotFlat):
+        parse_flat(header)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "---\ntitle: Hello\ndate: 2024-01-02\n---\nBody",
+        "---\ntitle: Hello\ntags: [a, b]\nauthor:\n  name: Somebody\n---\n",
+        '{\n"title": "JSON",\n"draft": true\n}\nBody',
+    ],
+)
+def test_flat_handlers_read_the_same_metadata(tmp_path, text):
+    path = tmp_path / "post.md"
+    path.write_text(text)
+
+    assert read_metadata(path, handlers=handlers("flat")) == read_metadata(path)
+
+
+def test_parser_is_read_from_the_config_settings(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "settings:\n  parser: flat\n"
+        "patterns:\n"
+        "  - name: Posts\n"
+        "    pattern: '**/*.md'\n"
+        "    rules:\n"
+        "      - field_name: date\n"
+        "        type: datetime\n"
+    )
+    post = tmp_path / "post.md"
+    post.write_text("---\ndate: 2024-01-02\n---\n")
+
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+
+    assert pattern_check.parser == "flat"
+    assert read_metadata(post, handlers=pattern_check.handlers) == {
+        "date": datetime.date(2024, 1, 2)
+    }
+    assert pattern_check.evaluate(post).validates
+
+
+def test_unknown_parser_is_refused():
+    with pytest.raises(ValueError, match="Unknown parser"):
+        FrontmatterPatternMatchCheck(parser="toml-only")
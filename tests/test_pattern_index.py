@@ -0,0 +1,63 @@
+import dataclasses
+import pathlib
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+from frontmatter_check.pattern_index import PatternIndex, pattern_matches
+
+
+@dataclasses.dataclass
+class _Pattern:
+    pattern: str
+
+
+segments = st.sampled_from(
+    ["docs", "blog", "a.md", "b.txt", ".md", "README", "x", "draft.md"]
+)
+pattern_segments = st.one_of(
+    segments,
+    st.sampled_from(["*", "**", "*.md", "*.txt", "?.md", "[ab].md", "d*", "*x*"]),
+)
+patterns = st.lists(pattern_segments, min_size=1, max_size=4).map("/".join)
+paths = st.lists(segments, min_size=1, max_size=5).map(
+    lambda parts: pathlib.Path(*parts)
+)
+
+
+@given(
+    patterns=st.lists(patterns, min_size=1, max_size=20),
+    absolute=st.booleans(),
+    path=paths,
+)
+def test_index_matches_naive_matcher(patterns, absolute, path):
+    items = [_Pattern(pattern) for pattern in patterns]
+
+    if absolute:
+        items = [_Pattern("/" + item.pattern) for item in items]
+        path = pathlib.Path("/") / path
+
+    expected = [item for item in items if pattern_matches(item.pattern, path)]
+
+    assert PatternIndex(items).match(path) == expected
+
+
+def test_index_keeps_pattern_order():
+    items = [_Pattern("docs/*.md"), _Pattern("*.md"), _Pattern("docs/a.md")]
+    index = PatternIndex(items)
+
+    assert index.match(pathlib.Path("docs/a.md")) == items
+    assert index.match(pathlib.Path("docs/b.txt")) == []
+
+
+def test_pattern_check_uses_index():
+    pattern_check = FrontmatterPatternMatchCheck(
+        {"name": "Docs", "pattern": "docs/*.md", "rules": []},
+        {"name": "Blog", "pattern": "blog/*.md", "rules": []},
+    )
+
+    assert [
+        pattern.name
+        for pattern in pattern_check.pattern_index.match(pathlib.Path("blog/a.md"))
+    ] == ["Blog"]
@@ -0,0 +1,109 @@
+import frontmatter
+import pytest
+
+from frontmatter_check import reader
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+from frontmatter_check.reader import parse_metadata, read_metadata, read_metadata_bytes
+
+HEADERS = [
+    "---\ntitle: Hello\ntags: [a, b]\n---\n\nBody",
+    "\n\n---\ntitle: Leading blank lines\n---\n",
+    "----   \ntitle: Longer delimiters\n---\nBody\n---\n",
+    '{\n"title": "JSON",\n"draft": true\n}\nBody',
+    "---\n- not\n- a dict\n---\n",
+    "---\ntitle: Never closed\n",
+    "---\ntitle: Closed at the end\n---",
+    "---\r\ntitle: Windows line endings\r\n---\r\n",
+    "---\rtitle: Old Mac line endings\r---\rBody\r",
+    "---\ntitle: Ünïcödé\n---\n" + "Body\n" * 1000,
+    "---\n" + "field: value\n" * 1000 + "---\n",
+    "No frontmatter here",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", HEADERS)
+def test_read_metadata_matches_frontmatter_load(tmp_path, text):
+    path = tmp_path / "post.md"
+    path.write_text(text, newline="")
+
+    assert read_metadata(path) == frontmatter.load(str(path)).metadata
+
+
+@pytest.mark.parametrize("first_read_size", [reader.FIRST_READ_SIZE, 8])
+@pytest.mark.parametrize("max_header_size", [reader.DEFAULT_MAX_HEADER_SIZE, 40])
+@pytest.mark.parametrize("text", HEADERS)
+def test_read_metadata_bytes_matches_read_metadata(
+    tmp_path, monkeypatch, text, max_header_size, first_read_size
+):
+    # A small first read makes longer headers go through the mapped file
+    monkeypatch.setattr(reader, "FIRST_READ_SIZE", first_read_size)
+    path = tmp_path / "post.md"
+    path.write_text(text, newline="")
+
+    assert read_metadata_bytes(path, max_header_size=max_header_size) == read_metadata(
+        path, max_header_size=max_header_size
+    )
+
+
+@pytest.mark.parametrize("max_header_size", [reader.DEFAULT_MAX_HEADER_SIZE, 40])
+@pytest.mark.parametrize("text", HEADERS)
+def test_parse_metadata_matches_read_metadata(tmp_path, text, max_header_size):
+    path = tmp_path / "post.md"
+    path.write_text(text, newline="")
+
+    assert parse_metadata(text, max_header_size=max_header_size) == read_metadata(
+        path, max_header_size=max_header_size
+    )
+
+
+def test_read_metadata_bytes_reads_cr_line_endings(tmp_path):
+    path = tmp_path / "post.md"
+    path.write_bytes(b"---\rauthor: me\r---\rbody\r")
+
+    assert read_metadata_bytes(path) == {"author": "me"}
+
+
+def test_read_metadata_does_not_read_the_body(tmp_path):
+    path = tmp_path / "post.md"
+    # The end of the body isn't valid utf-8, so reading all of it would raise
+    path.write_bytes(b"---\ntitle: Hello\n---\n" + b"Body\n" * 10_000 + b"\xff\xfe")
+
+    with pytest.raises(UnicodeDecodeError):
+        frontmatter.load(str(path))
+
+    assert read_metadata(path) == {"title": "Hello"}
+
+
+def test_read_metadata_stops_at_max_header_size(tmp_path):
+    path = tmp_path / "post.md"
+    path.write_text("---\n" + "title: Hello\n" * 100)
+
+    assert read_metadata(path, max_header_size=100) == {}
+
+
+def test_reader_is_read_from_the_config_settings(tmp_path, mocker):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "settings:\n  reader: bytes\n"
+        "patterns:\n"
+        "  - name: Posts\n"
+        "    pattern: '**/*.md'\n"
+        "    rules:\n"
+        "      - field_name: title\n"
+    )
+    post = tmp_path / "post.md"
+    post.write_text("---\ntitle: Hello\n---\n")
+    read_bytes = mocker.patch(
+        "frontmatter_check.pattern_check.read_metadata_bytes",
+        wraps=read_metadata_bytes,
+    )
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+
+    assert pattern_check.evaluate(post).validates
+    read_bytes.assert_called_once()
+
+
+def test_unknown_reader_is_refused():
+    with pytest.raises(ValueError, match="Unknown reader"):
+        FrontmatterPatternMatchCheck(reader="aio")
@@ -0,0 +1,122 @@
+import functools
+import json
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+
+from frontmatter_check.reports import parse_report_option
+
+
+@pytest.fixture
+def config_text():
+    return """
+patterns:
+  - name: posts
+    pattern: "**/*.md"
+    rules:
+      - field_name: title
+      - field_name: author
+        level: warning
+"""
+
+
+@pytest.fixture
+def project(project):
+    posts = project / "posts"
+    # The failing file comes first, so the exit code can't come from the last file
+    (posts / "a_bad.md").write_text("---\nauthor: me\n---\n")
+    (posts / "b_warning.md").write_text("---\ntitle: B\n---\n")
+    (posts / "c_good.md").write_text("---\ntitle: C\nauthor: me\n---\n")
+    (posts / "notes.txt").write_text("not checked")
+    return project
+
+
+@pytest.fixture
+def check(project, check_cli):
+    return functools.partial(check_cli, "--file-pattern", "*", "--no-cache")
+
+
+def test_exit_code_covers_every_file(check):
+    result = check()
+
+    assert result.exit_code == 1
+    assert result.stdout.count("Checking File: ") == 3
+
+
+def test_quiet_only_prints_files_with_failures(check):
+    result = check("--quiet")
+
+    assert result.exit_code == 1
+    assert "a_bad.md" in result.stdout
+    assert "b_warning.md" in result.stdout
+    assert "c_good.md" not in result.stdout
+    assert "Skipped" not in result.stdout
+
+
+def test_json_report(project, check):
+    assert check("--report", "json=report.json").exit_code == 1
+
+    report = json.loads((project / "report.json").read_text())
+
+    assert report["summary"] == {"checked": 3, "failed": 1, "errors": 0, "skipped": 1}
+    assert [(f["path"], f["validates"]) for f in report["files"]] == [
+        ("posts/a_bad.md", False),
+        ("posts/b_warning.md", True),
+        ("posts/c_good.md", True),
+    ]
+    assert report["files"][0]["failures"] == [
+        {
+            "field_name": "title",
+            "kind": "missing",
+            "level": "error",
+            "message": "Missing field: 'title'",
+            "ruleset": "posts",
+        }
+    ]
+
+
+def test_reports_in_every_format(project, check):
+    check(
+        "--report",
+        "jsonl=report.jsonl",
+        "--report",
+        "sarif=report.sarif",
+        "--report",
+        "junit=report.xml",
+    )
+
+    lines = (project / "report.jsonl").read_text().splitlines()
+    assert [json.loads(line)["path"] for line in lines] == [
+        "posts/a_bad.md",
+        "posts/b_warning.md",
+        "posts/c_good.md",
+    ]
+
+    sarif = json.loads((project / "report.sarif").read_text())
+    assert [
+        (r["ruleId"], r["level"], r["locations"][0]["physicalLocation"])
+        for r in sarif["runs"][0]["results"]
+    ] == [
+        ("missing", "error", {"artifactLocation": {"uri": "posts/a_bad.md"}}),
+        ("missing", "warning", {"artifactLocation": {"uri": "posts/b_warning.md"}}),
+    ]
+
+    testsuite = ElementTree.parse(project / "report.xml").getroot()[0]
+    assert testsuite.get("tests") == "3"
+    assert testsuite.get("failures") == "1"
+    assert [case.find("failure") is not None for case in testsuite] == [
+        True,
+        False,
+        False,
+    ]
+    assert testsuite[1].find("system-out").text == "WARNING - Missing field: 'author'"
+
+
+@pytest.mark.parametrize("value", ["json", "xml=report.xml", "json="])
+def test_invalid_report_option(value):
+    with pytest.raises(ValueError):
+        parse_report_option(value)
+
+
+def test_invalid_report_option_exits_with_usage_error(check):
+    assert check("--report", "report.json").exit_code == 2
@@ -1,12 +1,24 @@
 """Tests all the classes and functions in src/frontmatter_check/frontmatter_validator"""
 
+import dataclasses
 import logging
+import pathlib
+import pickle
 
+import pytest
 from hypothesis import given, settings, HealthCheck
 from hypothesis import strategies as st
 
-from frontmatter_check.rule_validations import ValidationRule, RulesetValidator
-from frontmatter_check.logger import memory_handler
+from frontmatter_check.pattern_check import (
+    FrontmatterPatternMatchCheck,
+    ValidationResult,
+)
+from frontmatter_check.rule_validations import (
+    Diagnostic,
+    RulesetValidator,
+    ValidationRule,
+    parse_field_path,
+)
 
 logger = logging.getLogger("FrontmatterCheck")
 logger.propagate = True
@@ -165,18 +177,12 @@ def test_validates_no_errors(caplog, ruleset_data):
 
     validator = RulesetValidator(rules=rules)
 
-    # Clear any existing logs
-    caplog.clear()
-    memory_handler.buffer.clear()
-
     result = validator.validates(metadata)
     assert result is True
 
-    # Check that no ERROR level logs were created
-    error_logs = [
-        record for record in memory_handler.buffer if record.levelno == logging.ERROR
-    ]
-    assert len(error_logs) == 0
+    # Check that no ERROR level failures were found
+    errors = [f for f in validator.evaluate(metadata) if f.level == logging.ERROR]
+    assert len(errors) == 0
 
 
 def test_validates_with_missing_fields():
@@ -185,16 +191,11 @@ def test_validates_with_missing_fields():
     # Empty the metadata to ensure missing fields
     validator = RulesetValidator(rules=[ValidationRule(field_name="name")])
 
-    # Clear any existing logs and set proper level
-    memory_handler.buffer.clear()
-
     result = validator.validates({})
     assert not result
 
-    # Check that ERROR level logs were created for each missing field
-    assert "Missing field: 'name'" in [
-        record.getMessage() for record in memory_handler.buffer
-    ]
+    # Check that ERROR level failures were found for each missing field
+    assert "Missing field: 'name'" in [f.message for f in validator.evaluate({})]
 
 
 def test_validationrule_case_sensitivity():
@@ -219,19 +220,12 @@ def test_validates_success(caplog, ruleset_data):
 
     validator = RulesetValidator(rules=rules)
 
-    # Clear any existing logs and set proper level
-    caplog.set_level(logging.INFO, logger="frontmatter_check")
-    caplog.clear()
-    memory_handler.buffer.clear()
-
     result = validator.validates(metadata)
     assert result is True
 
-    # Check that no ERROR level logs were created
-    error_logs = [
-        record for record in memory_handler.buffer if record.levelno == logging.ERROR
-    ]
-    assert len(error_logs) == 0  # No errors should be present
+    # Check that no ERROR level failures were found
+    errors = [f for f in validator.evaluate(metadata) if f.level == logging.ERROR]
+    assert len(errors) == 0  # No errors should be present
 
 
 def test_validates_with_null_values():
@@ -240,15 +234,10 @@ def test_validates_with_null_values():
     metadata = {"name": None}
     validator = RulesetValidator(rules=[ValidationRule(field_name="name")])
 
-    # Clear any existing logs and set proper level
-    memory_handler.buffer.clear()
-
     assert not validator.validates(metadata)
 
-    error_logs = [
-        record for record in memory_handler.buffer if record.levelno == logging.ERROR
-    ]
-    assert len(error_logs) == 1  # One error per rule
+    errors = [f for f in validator.evaluate(metadata) if f.level == logging.ERROR]
+    assert len(errors) == 1  # One error per rule
 
 
 def test_validates_mixed_errors():
@@ -266,12 +255,266 @@ def test_validates_mixed_errors():
 
     # Clear half the fields and set the other half to None
     metadata.clear()
-    memory_handler.buffer.clear()
     result = validator.validates(metadata)
     assert result is False
 
-    # Check that ERROR level logs were created appropriately
-    error_logs = [
-        record for record in memory_handler.buffer if record.levelno == logging.ERROR
+    # Check that ERROR level failures were found appropriately
+    errors = [f for f in validator.evaluate(metadata) if f.level == logging.ERROR]
+    assert len(errors) == len(rules)  # One error per rule
+
+
+# ---------------------------------
+# Test the CompiledRuleset
+# ---------------------------------
+
+
+@given(
+    ruleset_data=generate_ruleset_data(),
+    case_sensitivity=st.booleans(),
+    rule_type=st.sampled_from([None, "str", "int", "unknown"]),
+)
+def test_compiled_ruleset_matches_rule_checks(
+    caplog, ruleset_data, case_sensitivity, rule_type
+):
+    """The compiled rules log the same messages as calling `check` for each rule"""
+    rules, metadata = ruleset_data
+
+    rules = [
+        dataclasses.replace(rule, case_sensitivity=case_sensitivity, type=rule_type)
+        for rule in rules
     ]
-    assert len(error_logs) == len(rules)  # One error per rule
+
+    caplog.set_level(logging.INFO, logger="FrontmatterCheck")
+    caplog.clear()
+
+    for rule in rules:
+        rule.check(metadata)
+
+    expected = caplog.record_tuples
+    caplog.clear()
+
+    result = RulesetValidator(rules).validates(metadata)
+
+    assert caplog.record_tuples == expected
+    assert result == (not any(level == logging.ERROR for _, level, _ in expected))
+
+
+def test_compiled_ruleset_is_rebuilt_when_rules_change():
+    validator = RulesetValidator(rules=[ValidationRule(field_name="name")])
+    compiled = validator.compile()
+
+    assert validator.compile() is compiled
+
+    validator.rules.append(ValidationRule(field_name="title"))
+
+    assert validator.compile() is not compiled
+    assert not validator.validates({"name": "Miles"})
+
+
+def test_compiled_ruleset_allows_non_string_keys():
+    validator = RulesetValidator(rules=[ValidationRule(field_name="name")])
+
+    assert validator.validates({2025: "year", "Name": "Miles"})
+
+
+def test_evaluate_stops_at_the_first_error():
+    validator = RulesetValidator(
+        [
+            ValidationRule(
+                field_name="draft", missing_field_logging_level=logging.INFO
+            ),
+            ValidationRule(field_name="title"),
+            ValidationRule(field_name="description"),
+        ]
+    )
+
+    failures = validator.evaluate({}, stop_at_error=True)
+
+    assert [f.field_name for f in failures] == ["draft", "title"]
+    assert len(validator.evaluate({})) == 3
+
+
+def test_compiled_ruleset_is_rebuilt_when_a_rule_is_replaced():
+    validator = RulesetValidator(rules=[ValidationRule(field_name="name")])
+    compiled = validator.compile()
+
+    validator.rules[0] = dataclasses.replace(validator.rules[0], type="int")
+
+    assert validator.compile() is not compiled
+    assert not validator.validates({"name": "Miles"})
+
+
+@pytest.mark.parametrize(
+    "field_name, path",
+    [
+        ("title", None),
+        ("seo.description", ("seo", "description")),
+        ("authors[0].name", ("authors", 0, "name")),
+        ("authors[-1]", ("authors", -1)),
+        ("matrix[0][1]", ("matrix", 0, 1)),
+        ("seo..description", None),
+        ("authors[first]", None),
+    ],
+)
+def test_parse_field_path(field_name, path):
+    assert parse_field_path(field_name) == path
+
+
+NESTED_METADATA = {
+    "SEO": {"Description": "About", "image": None},
+    "authors": [{"name": "Miles"}, {"Name": 4}],
+    "seo.title": "A plain key",
+}
+
+
+@pytest.mark.parametrize(
+    "field_name, kinds",
+    [
+        ("seo.description", []),
+        ("seo.image", ["null"]),
+        ("seo.keywords", ["missing"]),
+        ("seo.title", []),
+        ("authors[0].name", []),
+        ("authors[-1].name", ["invalid_type"]),
+        ("authors[2].name", ["missing"]),
+        ("authors.name", ["missing"]),
+        ("seo.description.text", ["missing"]),
+    ],
+)
+def test_nested_field_paths(field_name, kinds):
+    validator = RulesetValidator([ValidationRule(field_name=field_name, type="str")])
+
+    assert [f.kind for f in validator.evaluate(NESTED_METADATA)] == kinds
+
+
+def test_nested_field_paths_are_case_sensitive_at_every_level():
+    validator = RulesetValidator(
+        [
+            ValidationRule(field_name="SEO.description", case_sensitivity=True),
+            ValidationRule(field_name="SEO.Description", case_sensitivity=True),
+        ]
+    )
+
+    assert [f.field_name for f in validator.evaluate(NESTED_METADATA)] == [
+        "SEO.description"
+    ]
+
+
+@given(
+    case_sensitivity=st.booleans(),
+    rule_type=st.sampled_from([None, "str", "int", "dict"]),
+    field_names=st.lists(
+        st.sampled_from(
+            [
+                "seo",
+                "SEO.Description",
+                "seo.image",
+                "seo.title",
+                "authors[0].name",
+                "authors[1].NAME",
+                "authors[-3]",
+                "seo.description[0]",
+            ]
+        ),
+        min_size=1,
+    ),
+)
+def test_nested_field_paths_match_rule_checks(
+    caplog, case_sensitivity, rule_type, field_names
+):
+    """Looking up paths through the shared tree logs the same as `check`"""
+    rules = [
+        ValidationRule(
+            field_name=field_name, case_sensitivity=case_sensitivity, type=rule_type
+        )
+        for field_name in field_names
+    ]
+
+    caplog.set_level(logging.INFO, logger="FrontmatterCheck")
+    caplog.clear()
+
+    for rule in rules:
+        rule.check(NESTED_METADATA)
+
+    expected = caplog.record_tuples
+    caplog.clear()
+    validator = RulesetValidator(rules)
+    validator.validates(NESTED_METADATA)
+
+    assert caplog.record_tuples == expected
+
+    columns = validator.evaluate_columns([NESTED_METADATA, {}])
+    failures = validator.evaluate(NESTED_METADATA)
+
+    assert [
+        failure
+        for rule_failures, column in zip(validator.compile().failures, columns)
+        for failure, failing in zip(rule_failures, column)
+        if 0 in failing
+    ] == failures
+
+
+def test_rules_are_frozen_and_slotted():
+    rule = ValidationRule(field_name="title")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        rule.type = "str"
+
+    assert not hasattr(rule, "__dict__")
+    assert pickle.loads(pickle.dumps(rule)) == rule
+
+
+def test_failures_are_shared_between_files():
+    validator = RulesetValidator(rules=[ValidationRule(field_name="title")])
+
+    first, second = validator.evaluate({}), validator.evaluate({"Other": 1})
+
+    assert first == second
+    assert first[0] is second[0]
+
+
+# ---------------------------------
+# Test the Diagnostic records
+# ---------------------------------
+
+
+@pytest.fixture
+def pattern_check():
+    return FrontmatterPatternMatchCheck(
+        {
+            "name": "posts",
+            "pattern": "*.md",
+            "rules": [{"field_name": "title"}, {"field_name": "date"}],
+        },
+        {"name": "all", "pattern": "*", "rules": [{"field_name": "layout"}]},
+    )
+
+
+def test_diagnostics_round_trip(pattern_check, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pathlib.Path("post.md").write_text("---\ndate:\n---\n")
+    result = pattern_check.evaluate(pathlib.Path("post.md"))
+
+    diagnostics = pattern_check.diagnostics(result, file_id=7)
+
+    assert diagnostics == [
+        Diagnostic(7, 0, 0),
+        Diagnostic(7, 1, 1),
+        Diagnostic(7, 2, 0),
+    ]
+    assert [pattern_check.failure(d) for d in diagnostics] == result.failures
+    assert [f.ruleset for f in result.failures] == ["posts", "posts", "all"]
+
+
+def test_diagnostics_refuse_failures_of_other_rules(pattern_check):
+    other = RulesetValidator([ValidationRule(field_name="author")]).evaluate({})
+
+    with pytest.raises(ValueError):
+        pattern_check.diagnostics(ValidationResult(pathlib.Path("a.md"), other))
+
+
+def test_results_pickle_without_a_dict():
+    result = ValidationResult(pathlib.Path("a.md"))
+
+    assert not hasattr(result, "__dict__")
+    assert pickle.loads(pickle.dumps(result)) == result
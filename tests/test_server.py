@@ -0,0 +1,108 @@
+import functools
+import os
+import pathlib
+import socket
+import threading
+
+import pytest
+from typer.testing import CliRunner
+
+from frontmatter_check import cli
+from frontmatter_check.cli import app
+from frontmatter_check.client import socket_path
+from frontmatter_check.server import make_server
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="needs unix sockets"
+)
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def project(project):
+    pathlib.Path("posts/a_good.md").write_text("---\ntitle: A\nauthor: me\n---\n")
+    pathlib.Path("posts/b_bad.md").write_text("---\nauthor: me\n---\n")
+    return project
+
+
+@pytest.fixture
+def check(project, check_cli):
+    return functools.partial(check_cli, "--file-pattern", "*.md")
+
+
+@pytest.fixture
+def server(project):
+    path = socket_path(pathlib.Path(os.environ["FRONTMATTER_CHECK_CACHE_DIR"]))
+    unix_server = make_server(pathlib.Path("config.yaml"), path)
+    thread = threading.Thread(target=unix_server.serve_forever, daemon=True)
+    thread.start()
+    yield unix_server
+    unix_server.shutdown()
+    unix_server.server_close()
+    path.unlink()
+
+
+def test_server_output_matches_in_process(server, check, mocker):
+    local = check("--no-server")
+    from_yaml_config = mocker.spy(cli.FrontmatterPatternMatchCheck, "from_yaml_config")
+    served = check()
+
+    # The client never loaded the config itself
+    from_yaml_config.assert_not_called()
+    assert served.exit_code == local.exit_code == 1
+    assert served.stdout == local.stdout
+
+
+def test_server_reloads_changed_config(server, check, config_text):
+    assert check().exit_code == 1
+
+    pathlib.Path("config.yaml").write_text(config_text.replace("title", "author"))
+
+    assert check().exit_code == 0
+
+
+def test_server_keeps_results_of_unchanged_files(server, check, mocker):
+    check()
+    evaluate = mocker.spy(server.check_server.pattern_check, "evaluate")
+    check()
+
+    evaluate.assert_not_called()
+
+
+def test_falls_back_without_server(check, mocker):
+    from_yaml_config = mocker.spy(cli.FrontmatterPatternMatchCheck, "from_yaml_config")
+
+    result = check()
+
+    assert result.exit_code == 1
+    from_yaml_config.assert_called_once()
+
+
+def test_server_refuses_other_configs(server, config_text):
+    pathlib.Path("other.yaml").write_text(config_text.replace("title", "author"))
+
+    result = runner.invoke(
+        app, ["posts", "--config-file", "other.yaml", "--file-pattern", "*.md"]
+    )
+
+    assert result.exit_code == 0
+
+
+def test_server_stops_at_the_first_failure_with_fail_fast(server, check):
+    pathlib.Path("posts/c_bad.md").write_text("---\nauthor: me\n---\n")
+
+    result = check("--fail-fast")
+
+    assert result.exit_code == 1
+    assert "c_bad.md" not in result.stdout
+    # The server is still answering checks
+    assert check().stdout.count("Checking File: ") == 3
+
+
+def test_server_checks_one_shard(server, check, mocker):
+    local = [check("--no-server", "--shard", f"{i}/2").stdout for i in (1, 2)]
+    from_yaml_config = mocker.spy(cli.FrontmatterPatternMatchCheck, "from_yaml_config")
+
+    assert [check("--shard", f"{i}/2").stdout for i in (1, 2)] == local
+    from_yaml_config.assert_not_called()
@@ -0,0 +1,116 @@
+import functools
+import json
+import pathlib
+
+import pytest
+from typer.testing import CliRunner
+
+from frontmatter_check.cli import merge_app
+from frontmatter_check.shards import parse_shard, path_hash, select_shard
+
+runner = CliRunner()
+
+
+@pytest.mark.parametrize("value, shard", [("1/1", (1, 1)), ("2/4", (2, 4))])
+def test_parse_shard(value, shard):
+    assert parse_shard(value) == shard
+
+
+@pytest.mark.parametrize("value", ["2", "0/2", "3/2", "a/2", "1/"])
+def test_invalid_shard(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+def test_path_hash_is_stable():
+    # Changing the hash moves files between the shards of every CI setup
+    assert path_hash(pathlib.Path("posts/a.md")) == 8782712635855139980
+
+
+@pytest.mark.parametrize("by_size", [False, True])
+def test_shards_split_the_files_between_them(tmp_path, by_size):
+    paths = []
+
+    for i in range(50):
+        path = tmp_path / f"{i}.md"
+        path.write_text("x" * i)
+        paths.append(path)
+
+    shards = [select_shard(iter(paths), (i, 3), by_size=by_size) for i in (1, 2, 3)]
+    shards = [list(shard) for shard in shards]
+
+    assert sorted(path for shard in shards for path in shard) == sorted(paths)
+    assert all(shard for shard in shards)
+    # Each shard keeps the order the files were found in
+    assert all(shard == sorted(shard, key=paths.index) for shard in shards)
+
+
+def test_shards_by_size_are_balanced(tmp_path):
+    paths = []
+
+    for i, size in enumerate([1000, 10, 10, 10, 10, 10, 10, 10, 900, 100]):
+        path = tmp_path / f"{i}.md"
+        path.write_text("x" * size)
+        paths.append(path)
+
+    sizes = [
+        sum(path.stat().st_size for path in select_shard(paths, (i, 2), by_size=True))
+        for i in (1, 2)
+    ]
+
+    assert sorted(sizes) == [1030, 1040]
+
+
+@pytest.fixture
+def project(project):
+    for i in range(20):
+        title = "" if i % 7 == 0 else f"title: {i}\n"
+        (project / "posts" / f"{i:02}.md").write_text(f"---\n{title}author: me\n---\n")
+
+    return project
+
+
+@pytest.fixture
+def check(project, check_cli):
+    return functools.partial(check_cli, "--no-cache", "--no-server")
+
+
+def test_merged_shards_match_an_unsharded_run(project, check):
+    check("--report", "json=all.json")
+    exit_codes = [
+        check("--shard", f"{i}/3", "--report", f"json=shard{i}.json").exit_code
+        for i in (1, 2, 3)
+    ]
+
+    merged = runner.invoke(
+        merge_app,
+        ["shard1.json", "shard2.json", "shard3.json", "--report", "json=merged.json"],
+    )
+
+    unsharded = json.loads((project / "all.json").read_text())
+    report = json.loads((project / "merged.json").read_text())
+
+    assert merged.exit_code == 1
+    assert max(exit_codes) == 1
+    assert report["summary"] == unsharded["summary"]
+    assert sorted(report["files"], key=lambda f: f["path"]) == unsharded["files"]
+    assert "Checked 20 file(s) in 3 report(s): 3 failed" in merged.stdout
+
+
+def test_merge_refuses_overlapping_reports(check):
+    check("--report", "json=all.json")
+
+    result = runner.invoke(merge_app, ["all.json", "all.json"])
+
+    assert result.exit_code == 2
+    assert "more than one report" in result.output
+
+
+def test_merge_of_passing_shards_passes(project, check):
+    (project / "posts" / "00.md").unlink()
+    (project / "posts" / "07.md").unlink()
+    (project / "posts" / "14.md").unlink()
+    check("--shard", "1/2", "--report", "json=shard1.json")
+    check("--shard", "2/2", "--report", "json=shard2.json")
+
+    assert runner.invoke(merge_app, ["shard1.json", "shard2.json"]).exit_code == 0
@@ -0,0 +1,75 @@
+import json
+import pstats
+
+import pytest
+
+from frontmatter_check import timings
+from frontmatter_check.parallel import check_file
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+
+
+@pytest.fixture
+def config_text():
+    return """
+patterns:
+  - name: posts
+    pattern: "**/*.md"
+    rules:
+      - field_name: title
+      - field_name: author
+"""
+
+
+@pytest.fixture
+def posts(project):
+    for i in range(5):
+        (project / "posts" / f"{i}.md").write_text("---\ntitle: A\n---\n")
+
+    return project / "posts"
+
+
+def test_results_have_no_timings_by_default(config_file, posts):
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+
+    assert check_file(pattern_check, posts / "0.md").timings is None
+
+
+def test_timed_results_match_untimed(config_file, posts):
+    pattern_check = FrontmatterPatternMatchCheck.from_yaml_config(config_file)
+    untimed = check_file(pattern_check, posts / "0.md")
+    timings.enable()
+
+    try:
+        timed = check_file(pattern_check, posts / "0.md")
+    finally:
+        timings.enable(False)
+
+    assert timed == untimed
+    assert set(timed.timings.stages) == {"match", "read", "parse", "validate"}
+    assert set(timed.timings.rules) == {("posts", "title"), ("posts", "author")}
+    assert timed.timings.total >= sum(timed.timings.stages.values())
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_timings_json(tmp_path, check_cli, posts, jobs):
+    timings_file = tmp_path / "timings.json"
+    result = check_cli(
+        "--no-cache", "--jobs", jobs, "--timings-json", str(timings_file)
+    )
+    report = json.loads(timings_file.read_text())
+
+    assert result.exit_code == 1
+    assert report["files"] == 5
+    assert list(report["stages"]) == ["walk", "match", "read", "parse", "validate"]
+    assert report["stages"]["parse"]["count"] == 5
+    assert [pattern["name"] for pattern in report["patterns"]] == ["posts"]
+    assert not timings.is_enabled()
+
+
+def test_cli_timings_table_and_profile(tmp_path, check_cli, posts):
+    profile = tmp_path / "run.prof"
+    result = check_cli("--timings", "--profile", str(profile))
+
+    assert "Checked 5 file(s)" in result.stderr
+    assert "Slowest rules (ms)" in result.stderr
+    assert pstats.Stats(str(profile)).total_calls > 0
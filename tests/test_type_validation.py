@@ -2,14 +2,6 @@ import logging
 import datetime
 import pytest
 from frontmatter_check.rule_validations import ValidationRule
-from frontmatter_check.logger import memory_handler
-
-
-@pytest.fixture(autouse=True)
-def clear_log_buffer():
-    memory_handler.buffer.clear()
-    yield
-    memory_handler.buffer.clear()
 
 
 @pytest.mark.parametrize(
@@ -37,14 +29,14 @@ def test_validate_type(expected_type, value, is_valid):
     assert rule.validate_type(metadata) == is_valid
 
 
-def test_check_logs_error_on_invalid_type():
+def test_check_logs_error_on_invalid_type(log_caplog):
     rule = ValidationRule(field_name="test_field", type="int")
     metadata = {"test_field": "not an int"}
 
     rule.check(metadata)
 
     error_logs = [
-        record for record in memory_handler.buffer if record.levelno == logging.ERROR
+        record for record in log_caplog.records if record.levelno == logging.ERROR
     ]
     assert len(error_logs) == 1
     assert "Value is not of type 'int'" in error_logs[0].getMessage()
@@ -58,7 +50,7 @@ def test_validate_type_handles_none_value():
     assert rule.validate_type(metadata) is True
 
 
-def test_check_does_not_validate_type_if_null():
+def test_check_does_not_validate_type_if_null(log_caplog):
     # If value is None and null logging level is ERROR, validate_type should not run/log
     # But check() handles the logic.
     rule = ValidationRule(field_name="test_field", type="int")
@@ -69,7 +61,7 @@ def test_check_does_not_validate_type_if_null():
     # Should log "Value is 'Null'" but NOT "Value is not of type 'int'"
     error_logs = [
         record.getMessage()
-        for record in memory_handler.buffer
+        for record in log_caplog.records
         if record.levelno == logging.ERROR
     ]
 
@@ -0,0 +1,141 @@
+import datetime
+import logging
+import pathlib
+import pickle
+import re
+
+import pytest
+
+from frontmatter_check.pattern_check import FrontmatterPatternMatchCheck
+from frontmatter_check.rule_validations import RulesetValidator, ValidationRule
+
+
+@pytest.mark.parametrize(
+    "constraints, value, is_valid",
+    [
+        ({"regex": r"^[a-z0-9-]+$"}, "a-slug-2", True),
+        ({"regex": r"^[a-z0-9-]+$"}, "Not A Slug", False),
+        ({"regex": r"^[a-z0-9-]+$"}, 12, False),
+        ({"enum": ["post", "page"]}, "post", True),
+        ({"enum": ["post", "page"]}, "draft", False),
+        ({"enum": ["post", "page"]}, ["post"], False),
+        ({"enum": [1, 2]}, True, False),
+        ({"enum": [True]}, True, True),
+        ({"enum": [True]}, 1, False),
+        ({"enum": [1, True]}, True, True),
+        ({"enum": [1, True]}, 1, True),
+        ({"enum": [1, True]}, False, False),
+        ({"minimum": 1, "maximum": 5}, 5, True),
+        ({"minimum": 1, "maximum": 5}, 0, False),
+        ({"minimum": 1}, "3", False),
+        ({"minimum": 0}, True, False),
+        ({"minimum": "2020-01-01"}, datetime.date(2024, 1, 1), True),
+        ({"maximum": "2020-01-01"}, datetime.date(2024, 1, 1), False),
+        ({"maximum": "2020-01-01"}, datetime.datetime(2020, 1, 1, 23, 0), True),
+        ({"minimum": "2020-01-01T12:00:00"}, datetime.date(2020, 1, 1), True),
+        ({"max_length": 5}, "short", True),
+        ({"max_length": 5}, "too long", False),
+        ({"min_length": 1}, [], False),
+        ({"min_length": 1}, 4, False),
+        ({"regex": "^a", "max_length": 3}, "abc", True),
+        ({"regex": "^a", "max_length": 3}, "abcd", False),
+    ],
+)
+def test_validate_value(constraints, value, is_valid):
+    rule = ValidationRule(field_name="test_field", **constraints)
+
+    assert rule.validate_value({"test_field": value}) == is_valid
+    assert RulesetValidator([rule]).validates({"test_field": value}) == is_valid
+
+
+def test_constraints_are_compiled_with_the_rule():
+    rule = ValidationRule(
+        field_name="layout",
+        regex="^p",
+        enum=["post", "page"],
+        minimum="2020-01-01",
+        maximum="2020-01-01T10:00:00",
+    )
+
+    assert isinstance(rule.regex, re.Pattern)
+    assert sorted(rule.enum.values()) == ["page", "post"]
+    assert rule.minimum == datetime.date(2020, 1, 1)
+    assert rule.maximum == datetime.datetime(2020, 1, 1, 10)
+    assert pickle.loads(pickle.dumps(rule)) == rule
+
+
+@pytest.mark.parametrize(
+    "constraints",
+    [
+        {"regex": "("},
+        {"enum": "post"},
+        {"enum": [["post"]]},
+        {"minimum": "last week"},
+        {"maximum": True},
+        {"regex": 5},
+        {"max_length": "5"},
+        {"min_length": -1},
+        {"max_length": True},
+    ],
+)
+def test_invalid_constraints_are_refused(constraints):
+    with pytest.raises(ValueError):
+        ValidationRule(field_name="test_field", **constraints)
+
+
+def test_check_logs_error_on_invalid_value(log_caplog):
+    rule = ValidationRule(field_name="title", max_length=5)
+
+    rule.check({"title": "A long title"})
+
+    error_logs = [
+        record for record in log_caplog.records if record.levelno == logging.ERROR
+    ]
+    assert len(error_logs) == 1
+    assert error_logs[0].getMessage() == "title Value must have a length of at most 5"
+
+
+def test_value_is_not_checked_when_the_type_is_wrong():
+    validator = RulesetValidator(
+        [ValidationRule(field_name="count", type="int", minimum=1)]
+    )
+
+    assert [f.kind for f in validator.evaluate({"count": "0"})] == ["invalid_type"]
+    assert [f.kind for f in validator.evaluate({"count": 0})] == ["invalid_value"]
+    assert validator.evaluate({"count": None})[0].kind == "null"
+
+
+def test_constraints_from_the_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pattern_check = FrontmatterPatternMatchCheck(
+        {
+            "name": "posts",
+            "pattern": "*.md",
+            "rules": [
+                {"field_name": "slug", "regex": "^[a-z-]+$"},
+                {"field_name": "layout", "enum": ["post", "page"], "level": "warning"},
+                {"field_name": "date", "minimum": "2020-01-01"},
+                {"field_name": "title", "max_length": 10, "is_invalid_value": "skip"},
+            ],
+        }
+    )
+    post = pathlib.Path("post.md")
+    post.write_text(
+        "---\nslug: My Post\nlayout: draft\ndate: 2019-05-01\n"
+        "title: A very long title\n---\n"
+    )
+
+    result = pattern_check.evaluate(post)
+
+    assert [(f.field_name, f.kind, f.level) for f in result.failures] == [
+        ("slug", "invalid_value", logging.ERROR),
+        ("layout", "invalid_value", logging.WARNING),
+        ("date", "invalid_value", logging.ERROR),
+        ("title", "invalid_value", logging.INFO),
+    ]
+    assert result.failures[1].message == "layout Value must be one of 'page', 'post'"
+    assert not result.validates
+
+    report = pattern_check.evaluate_documents([(post, post.read_text())])
+
+    assert report.results()[0].failures == result.failures
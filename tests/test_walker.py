@@ -0,0 +1,101 @@
+import pathlib
+
+import pytest
+
+from frontmatter_check.pattern_index import PatternIndex
+from frontmatter_check.pattern_check import PatternRuleset
+from frontmatter_check.walker import IgnoreRules, iter_files, walk
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    files = [
+        "index.md",
+        "notes.txt",
+        "docs/a.md",
+        "docs/guide/b.md",
+        "docs/_site/built.md",
+        "blog/2024/post.md",
+        "blog/2024/draft.md",
+        "node_modules/pkg/README.md",
+    ]
+    for name in files:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("---\ntitle: x\n---\n")
+
+    (tmp_path / ".git").mkdir()
+    return pathlib.Path(".")
+
+
+def _names(paths):
+    return sorted(path.as_posix() for path in paths)
+
+
+@pytest.mark.parametrize(
+    "file_patterns",
+    [["*.md", "*.txt"], ["**/*.md"], ["docs/*.md"], ["**/*.md", "*.md", "blog/**"]],
+)
+def test_walk_matches_glob_without_duplicates(tree, file_patterns):
+    expected = {
+        path
+        for pattern in file_patterns
+        for path in tree.glob(pattern)
+        if path.is_file() and ".git" not in path.parts
+    }
+    walked = list(walk(tree, file_patterns, use_gitignore=False))
+
+    assert len(walked) == len(set(walked))
+    assert _names(walked) == _names(expected)
+
+
+def test_walk_honors_gitignore(tree):
+    pathlib.Path(".gitignore").write_text("node_modules/\n*.md\n!blog/**/*.md\n")
+    pathlib.Path("blog/.gitignore").write_text("draft.md\n")
+
+    assert _names(walk(tree, ["**/*.md"])) == ["blog/2024/post.md"]
+
+
+def test_walk_excludes_and_prunes(tree, mocker):
+    index = PatternIndex([PatternRuleset("docs", "docs/**/*.md", rules=None)])
+    could_match_below = mocker.spy(index, "could_match_below")
+
+    walked = walk(
+        tree,
+        ["**/*.md"],
+        exclude=IgnoreRules(["_site/"]),
+        could_match_below=index.could_match_below,
+        use_gitignore=False,
+    )
+
+    assert _names(walked) == ["docs/a.md", "docs/guide/b.md", "index.md"]
+    entered = {call.args[0].as_posix() for call in could_match_below.call_args_list}
+    # node_modules is rejected without being read
+    assert "node_modules" in entered
+    assert "node_modules/pkg" not in entered
+
+
+def test_iter_files_overlapping_targets(tree):
+    files = list(
+        iter_files(
+            [
+                pathlib.Path("docs/a.md"),
+                pathlib.Path("docs"),
+                pathlib.Path("docs/guide"),
+            ],
+            ["**/*.md"],
+            exclude=["_site"],
+        )
+    )
+
+    assert _names(files) == ["docs/a.md", "docs/guide/b.md"]
+    assert len(files) == 2
+    assert files[0] == pathlib.Path("docs/a.md")
+
+
+def test_iter_files_nested_target_outside_the_patterns(tree):
+    files = iter_files([pathlib.Path("docs"), pathlib.Path("docs/guide")], ["*.md"])
+
+    # `*.md` doesn't reach docs/guide from docs, so it's walked on its own
+    assert _names(files) == ["docs/a.md", "docs/guide/b.md"]
@@ -0,0 +1,107 @@
+import os
+import pathlib
+
+import pytest
+
+from frontmatter_check.watch import InotifySource, PollingSource, Watcher
+
+
+@pytest.fixture
+def config_text():
+    return """
+patterns:
+  - name: docs
+    pattern: "docs/*.md"
+    rules:
+      - field_name: title
+  - name: blog
+    pattern: "blog/*.md"
+    rules:
+      - field_name: title
+"""
+
+
+@pytest.fixture
+def watcher(project):
+    for directory in ("docs", "blog"):
+        pathlib.Path(directory).mkdir()
+        pathlib.Path(directory, "a.md").write_text("---\ntitle: A\n---\n")
+
+    watcher = Watcher(pathlib.Path("config.yaml"), [pathlib.Path(".")], ["**/*.md"])
+    watcher.scan()
+    return watcher
+
+
+def _paths(results):
+    return sorted(result.path.as_posix() for result in results)
+
+
+def test_only_files_with_new_content_are_checked(watcher):
+    docs, blog = pathlib.Path("docs/a.md"), pathlib.Path("blog/a.md")
+    docs.write_text("---\nauthor: me\n---\n")
+    os.utime(blog)
+
+    results = watcher.handle({docs, blog})
+
+    assert _paths(results) == ["docs/a.md"]
+    assert not results[0].validates
+
+
+def test_new_and_deleted_files(watcher):
+    new = pathlib.Path("blog/b.md")
+    new.write_text("---\ntitle: B\n---\n")
+    pathlib.Path("docs/a.md").unlink()
+
+    results = watcher.handle({new, pathlib.Path("docs/a.md")})
+
+    assert _paths(results) == ["blog/b.md"]
+    assert sorted(path.as_posix() for path in watcher.digests) == [
+        "blog/a.md",
+        "blog/b.md",
+    ]
+
+
+def test_config_change_rechecks_files_of_changed_patterns(watcher, config_text):
+    pathlib.Path("config.yaml").write_text(
+        config_text.replace(
+            '"blog/*.md"\n    rules:\n      - field_name: title',
+            '"blog/*.md"\n    rules:\n      - field_name: author',
+        )
+    )
+
+    results = watcher.handle({pathlib.Path("config.yaml")})
+
+    assert _paths(results) == ["blog/a.md"]
+    assert not results[0].validates
+
+
+def test_missed_events_recheck_changed_files(watcher):
+    pathlib.Path("blog/a.md").write_text("---\nauthor: me\n---\n")
+
+    assert _paths(watcher.handle(None)) == ["blog/a.md"]
+
+
+def test_polling_source_reports_changes(tmp_path):
+    post = tmp_path / "post.md"
+    post.write_text("one")
+    source = PollingSource(lambda: [post], interval=0.01)
+
+    assert source.wait(0.01) == set()
+
+    post.write_text("three")
+
+    assert source.wait(1) == {post}
+
+
+@pytest.mark.skipif(not InotifySource.available(), reason="needs inotify")
+def test_inotify_source_reports_changes(tmp_path):
+    source = InotifySource()
+    source.add_directory(tmp_path)
+
+    try:
+        (tmp_path / "post.md").write_text("---\ntitle: A\n---\n")
+
+        assert source.wait(5) == {tmp_path / "post.md"}
+        assert source.wait(0) == set()
+    finally:
+        source.close()